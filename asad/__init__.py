@@ -3,8 +3,26 @@ ASAD: Adaptive Software Analysis and Debugging
 An adaptive multi-agent system for automatic code debugging using LLMs.
 """
 
-from .pipeline import adaptive_debugger
-from .config import get_llm_provider
+from .pipeline import adaptive_debugger, adaptive_debugger_async, resume, resume_async
+from .batch import adaptive_debug_batch
+from .checkpoint import list_runs
+from .project import debug_project, debug_project_async
+from .config import get_llm_provider, load_env
+from .metrics import collect_metrics, export_prometheus, get_metrics
 
 __version__ = "0.1.0"
-__all__ = ["adaptive_debugger", "get_llm_provider"]
+__all__ = [
+    "adaptive_debugger",
+    "adaptive_debugger_async",
+    "resume",
+    "resume_async",
+    "list_runs",
+    "adaptive_debug_batch",
+    "debug_project",
+    "debug_project_async",
+    "get_llm_provider",
+    "load_env",
+    "collect_metrics",
+    "export_prometheus",
+    "get_metrics",
+]
@@ -0,0 +1,172 @@
+"""
+Warm sandbox worker process for execution-based validation.
+
+Run as a standalone script (it imports nothing from asad, so it starts
+fast). Requests arrive as JSON lines on stdin and results are written as
+JSON lines on stdout. On POSIX each candidate runs in a child forked from
+this already-warm interpreter, with CPU, memory and file-size limits and a
+scratch working directory; elsewhere it runs inline and the parent enforces
+the wall-time limit by killing the worker.
+"""
+
+import json
+import os
+import select
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _describe_exception(exc: BaseException) -> dict:
+    frames = traceback.extract_tb(exc.__traceback__)
+    candidate = [f for f in frames if f.filename == "<candidate>"]
+    frame = candidate[-1] if candidate else None
+    lineno = getattr(exc, "lineno", None) if isinstance(exc, SyntaxError) else None
+    return {
+        "type": type(exc).__name__,
+        "message": str(exc),
+        "lineno": lineno or (frame.lineno if frame else None),
+        "function": frame.name if frame else None,
+        "traceback": "".join(
+            traceback.format_list(candidate) + traceback.format_exception_only(type(exc), exc)
+        ),
+    }
+
+
+def _execute(code: str) -> dict:
+    """Compile and execute candidate code as __main__."""
+    namespace = {"__name__": "__main__", "__file__": "<candidate>", "__builtins__": __builtins__}
+    try:
+        exec(compile(code, "<candidate>", "exec"), namespace)
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            return {"ok": False, "error": _describe_exception(exc)}
+    except BaseException as exc:
+        return {"ok": False, "error": _describe_exception(exc)}
+    return {"ok": True, "error": None}
+
+
+def _apply_limits(request: dict) -> None:
+    if resource is None:
+        return
+    cpu = int(request.get("cpu_seconds") or 0)
+    if cpu:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    memory = int(request.get("memory_bytes") or 0)
+    if memory:
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    fsize = int(request.get("file_bytes") or 0)
+    if fsize:
+        resource.setrlimit(resource.RLIMIT_FSIZE, (fsize, fsize))
+
+
+def _run_forked(request: dict) -> dict:
+    timeout = float(request.get("timeout") or 5)
+    workdir = tempfile.mkdtemp(prefix="asad-sandbox-")
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        # Child: isolate, limit, execute, report, and exit without cleanup
+        try:
+            os.close(read_fd)
+            os.setsid()
+            os.chdir(workdir)
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            _apply_limits(request)
+            result = _execute(request["code"])
+        except BaseException as exc:
+            result = {"ok": False, "error": _describe_exception(exc)}
+        try:
+            payload = json.dumps(result).encode("utf-8")
+            while payload:
+                payload = payload[os.write(write_fd, payload):]
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    chunks, timed_out = [], False
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            ready, _, _ = select.select([read_fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(read_fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(read_fd)
+        if timed_out:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except OSError:
+                os.kill(pid, signal.SIGKILL)
+        _, status = os.waitpid(pid, 0)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if timed_out:
+        return {"ok": False, "timed_out": True, "error": {
+            "type": "TimeoutError",
+            "message": f"Execution exceeded {timeout:g}s wall-time limit",
+            "lineno": None, "function": None, "traceback": "",
+        }}
+    if chunks:
+        return json.loads(b"".join(chunks).decode("utf-8"))
+
+    # The child died before reporting (CPU/memory limit or a crash)
+    sig = os.WTERMSIG(status) if os.WIFSIGNALED(status) else None
+    name = signal.Signals(sig).name if sig else f"exit status {os.WEXITSTATUS(status)}"
+    return {"ok": False, "error": {
+        "type": "ResourceLimitExceeded" if sig in (signal.SIGXCPU, signal.SIGKILL) else "Crash",
+        "message": f"Process terminated by {name}",
+        "lineno": None, "function": None, "traceback": "",
+    }}
+
+
+def _run_inline(request: dict) -> dict:
+    workdir = tempfile.mkdtemp(prefix="asad-sandbox-")
+    previous = os.getcwd()
+    stdout, stderr = sys.stdout, sys.stderr
+    try:
+        os.chdir(workdir)
+        sys.stdout = sys.stderr = open(os.devnull, "w")
+        return _execute(request["code"])
+    finally:
+        sys.stdout.close()
+        sys.stdout, sys.stderr = stdout, stderr
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main() -> None:
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+    run = _run_forked if hasattr(os, "fork") else _run_inline
+    protocol.write(json.dumps({"ready": True}) + "\n")
+    protocol.flush()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        result = run(json.loads(line))
+        protocol.write(json.dumps(result) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,33 @@
 """Specialized agents for code analysis, execution, and review."""
 
-from .analysis import analyze_problem, new_iteration_analyze_problem
-from .management import generate_agents
-from .execution import execute_agent, retry_execute_agent
-from .review import task_review, validate_solution
+from .analysis import (
+    analyze_problem,
+    analyze_problem_async,
+    new_iteration_analyze_problem,
+    new_iteration_analyze_problem_async,
+)
+from .management import generate_agents, generate_agents_async
+from .execution import (
+    execute_agent,
+    execute_agent_async,
+    retry_execute_agent,
+    retry_execute_agent_async,
+)
+from .review import task_review, task_review_async, validate_solution, validate_solution_async
 
 __all__ = [
     "analyze_problem",
+    "analyze_problem_async",
     "new_iteration_analyze_problem",
+    "new_iteration_analyze_problem_async",
     "generate_agents",
+    "generate_agents_async",
     "execute_agent",
+    "execute_agent_async",
     "retry_execute_agent",
+    "retry_execute_agent_async",
     "task_review",
+    "task_review_async",
     "validate_solution",
+    "validate_solution_async",
 ]
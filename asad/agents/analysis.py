@@ -2,14 +2,25 @@
 Agents responsible for problem analysis and complexity assessment.
 """
 
+import asyncio
+import difflib
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-from ..llm import call_llm
+from ..config import get_chunking_config, get_reanalysis_mode, get_slicing_config
+from ..llm import call_llm, call_llm_async, is_json_response
 from ..parsing import safe_json_parse
+from ..parsing.chunking import CodeChunk, chunk_module
+from ..parsing.slicing import slice_code
+from ..runtime import run_sync
 
+# Bugs spread over more chunks than this make the task COMPLEX
+MAX_SIMPLE_CHUNKS = 1
 
-def analyze_problem(code: str) -> Dict[str, Any]:
+PROJECT_CONTEXT_LABEL = "Read-only context from other modules (do not report bugs in it):"
+
+
+def analyze_problem(code: str, context: Optional[str] = None) -> Dict[str, Any]:
     """
     Analyze buggy code to assess complexity and identify execution-blocking bugs.
     
@@ -18,13 +29,106 @@ def analyze_problem(code: str) -> Dict[str, Any]:
     2. Locates all critical bugs with type/location/explanation
     3. Generates a step-by-step repair plan
     
+    Modules of at least ASAD_CHUNK_MIN_LINES lines are split at function and
+    class boundaries and the chunks are analyzed concurrently (see
+    merge_chunk_analyses()), so latency stays flat as modules grow.
+    
     Args:
         code: Buggy Python source code
+        context: Optional read-only code the module depends on (e.g.
+            signatures from other modules of a project)
     
     Returns:
         Analysis report with complexity, bugs list, and repair plan
     """
-    prompt = f"""
+    chunks = _analysis_chunks(code)
+    if chunks is not None:
+        return run_sync(_analyze_chunks_async(chunks, context))
+    result = call_llm(_analysis_prompt(code, context), stage="analysis", accept=is_json_response)
+    return _parse_analysis(result, "analysis")
+
+
+async def analyze_problem_async(code: str, context: Optional[str] = None) -> Dict[str, Any]:
+    """Async variant of analyze_problem()."""
+    chunks = _analysis_chunks(code)
+    if chunks is not None:
+        return await _analyze_chunks_async(chunks, context)
+    result = await call_llm_async(_analysis_prompt(code, context), stage="analysis", accept=is_json_response)
+    return _parse_analysis(result, "analysis")
+
+
+def _analysis_chunks(code: str) -> Optional[List[CodeChunk]]:
+    config = get_chunking_config()
+    if not config["enabled"] or len(code.splitlines()) < config["min_lines"]:
+        return None
+    return chunk_module(code, config["chunk_lines"])
+
+
+async def _analyze_chunks_async(chunks: List[CodeChunk], context: Optional[str] = None) -> Dict[str, Any]:
+    print(f"\n[Analysis] Analyzing {len(chunks)} chunks concurrently")
+    results = await asyncio.gather(*(
+        call_llm_async(_analysis_prompt(chunk.prompt_input(), context), stage="analysis", accept=is_json_response)
+        for chunk in chunks
+    ))
+    return merge_chunk_analyses(chunks, [_parse_analysis(result, "analysis") for result in results])
+
+
+def merge_chunk_analyses(chunks: List[CodeChunk], reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce per-chunk analysis reports to one report for the whole module.
+    
+    Bug locations are shifted to module line numbers and duplicates (e.g. a
+    shared global reported by several chunks) are dropped. The task is
+    COMPLEX if any chunk is, or if bugs are spread over several chunks.
+    
+    Args:
+        chunks: Chunks in module order
+        reports: Analysis report of each chunk
+    
+    Returns:
+        Analysis report with complexity, bugs list, and repair plan
+    """
+    bugs: List[Dict[str, Any]] = []
+    seen = set()
+    plans = []
+    complex_chunk = False
+    buggy_chunks = 0
+    for chunk, report in zip(chunks, reports):
+        chunk_bugs = [bug for bug in report.get("bugs") or [] if isinstance(bug, dict)]
+        if not chunk_bugs:
+            continue
+        buggy_chunks += 1
+        complex_chunk = complex_chunk or report.get("complexity") == "COMPLEX"
+        for bug in chunk_bugs:
+            bug = {**bug, "location": chunk.shift_location(str(bug.get("location", "")))}
+            key = (str(bug.get("type", "")).strip().lower(), " ".join(bug["location"].lower().split()))
+            if key not in seen:
+                seen.add(key)
+                bugs.append(bug)
+        plan = report.get("plan")
+        if plan and plan != "No plan generated":
+            plans.append(f"Lines {chunk.start}-{chunk.end}: {plan}")
+
+    complex_task = complex_chunk or buggy_chunks > MAX_SIMPLE_CHUNKS
+    return {
+        "complexity": "COMPLEX" if complex_task else "SIMPLE",
+        "bugs": bugs,
+        "plan": "\n".join(plans) or "No plan generated",
+    }
+
+
+def _parse_analysis(result: str, stage: str) -> Dict[str, Any]:
+    return safe_json_parse(
+        result,
+        stage=stage,
+        fallback={"complexity": "SIMPLE", "bugs": [], "plan": "No plan generated"}
+    )
+
+
+def _analysis_prompt(code: str, context: Optional[str] = None) -> str:
+    if context:
+        code = f"{code}\n\n    {PROJECT_CONTEXT_LABEL}\n{context}"
+    return f"""
 Role: You are the Main Analysis Agent. Your responsibility
 is to perform a systematic static analysis of the given
 code and identify defects that prevent correct execution.
@@ -61,30 +165,70 @@ Output: Return a JSON object with the following schema:
 }}
 Do not write any text besides the JSON.
 """
-    result = call_llm(prompt)
-    return safe_json_parse(
-        result,
-        fallback={"complexity": "SIMPLE", "bugs": [], "plan": "No plan generated"}
-    )
 
 
 def new_iteration_analyze_problem(
     code: str,
     failure_log: Dict[str, Any],
-    previous_plan: Dict[str, Any]
+    previous_plan: Dict[str, Any],
+    previous_code: Optional[str] = None,
+    history: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Re-analyze code after a failed repair attempt to identify remaining bugs.
     
+    With ASAD_REANALYSIS=delta and previous_code given, the prompt carries a
+    diff against previous_code and only the code around the remaining bugs
+    instead of the whole module (see _delta_reanalysis_prompt).
+    
     Args:
         code: Current state of code after failed repair
         failure_log: Validation results showing remaining issues
         previous_plan: Original repair plan that failed
+        previous_code: Code the failed repair attempt started from
+        history: One-line summaries of the session's earlier iterations
     
     Returns:
         Updated analysis with remaining bugs and new repair plan
     """
-    prompt = f"""
+    prompt = _select_reanalysis_prompt(code, failure_log, previous_plan, previous_code, history)
+    result = call_llm(prompt, stage="reanalysis", accept=is_json_response)
+    return _parse_analysis(result, "reanalysis")
+
+
+async def new_iteration_analyze_problem_async(
+    code: str,
+    failure_log: Dict[str, Any],
+    previous_plan: Dict[str, Any],
+    previous_code: Optional[str] = None,
+    history: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Async variant of new_iteration_analyze_problem()."""
+    prompt = _select_reanalysis_prompt(code, failure_log, previous_plan, previous_code, history)
+    result = await call_llm_async(prompt, stage="reanalysis", accept=is_json_response)
+    return _parse_analysis(result, "reanalysis")
+
+
+def _select_reanalysis_prompt(
+    code: str,
+    failure_log: Dict[str, Any],
+    previous_plan: Dict[str, Any],
+    previous_code: Optional[str],
+    history: Optional[List[str]]
+) -> str:
+    if get_reanalysis_mode() == "delta" and previous_code is not None:
+        prompt = _delta_reanalysis_prompt(code, failure_log, previous_plan, previous_code, history or [])
+        if prompt is not None:
+            return prompt
+    return _reanalysis_prompt(code, failure_log, previous_plan)
+
+
+def _reanalysis_prompt(
+    code: str,
+    failure_log: Dict[str, Any],
+    previous_plan: Dict[str, Any]
+) -> str:
+    return f"""
 Role:
     You are the Main Analysis Agent. Your responsibility is to perform a systematic review
     of the given code after a previous fix attempt has failed. Identify all remaining defects
@@ -125,8 +269,106 @@ Return a JSON object with this schema:
 }}
 Do not write any text besides the JSON.
 """
-    result = call_llm(prompt)
-    return safe_json_parse(
-        result,
-        fallback={"complexity": "SIMPLE", "bugs": [], "plan": "No plan generated"}
-    )
+
+
+# Earlier iterations beyond this many are collapsed into one line of the session summary
+MAX_HISTORY_LINES = 4
+
+
+def _bug_lines(bugs: List[Dict[str, Any]]) -> str:
+    lines = [
+        f"- {bug.get('type', 'bug')} at {bug.get('location', 'unknown location')}: {bug.get('explanation', '')}"
+        for bug in bugs
+        if isinstance(bug, dict)
+    ]
+    return "\n".join(lines) or "- (none reported)"
+
+
+def _session_summary(history: List[str]) -> str:
+    if len(history) > MAX_HISTORY_LINES:
+        skipped = len(history) - MAX_HISTORY_LINES
+        history = [f"({skipped} earlier iteration(s) omitted)"] + history[-MAX_HISTORY_LINES:]
+    return "\n".join(f"- {line}" for line in history) or "- (first retry)"
+
+
+def _delta_reanalysis_prompt(
+    code: str,
+    failure_log: Dict[str, Any],
+    previous_plan: Dict[str, Any],
+    previous_code: str,
+    history: List[str]
+) -> Optional[str]:
+    """
+    Re-analysis prompt that sends what changed instead of the whole module.
+
+    Carries a unified diff of the last repair attempt, the code around the
+    remaining and previously reported bugs, both bug lists and a compact
+    summary of the session so far.
+
+    Returns:
+        The prompt, or None when the full prompt is the better choice: the
+        bug regions cannot be sliced out of the module (small module,
+        unresolvable locations) or the diff is as long as the module itself
+    """
+    remaining = [bug for bug in failure_log.get("remaining_bugs") or [] if isinstance(bug, dict)]
+    previous_bugs = [bug for bug in previous_plan.get("bugs") or [] if isinstance(bug, dict)]
+    locations = [bug.get("location", "") for bug in remaining + previous_bugs]
+    code_slice = slice_code(code, locations, get_slicing_config()["min_lines"])
+    if code_slice is None:
+        return None
+    diff = "\n".join(difflib.unified_diff(
+        previous_code.splitlines(), code.splitlines(),
+        "previous attempt", "current code", n=2, lineterm=""
+    ))
+    if len(diff) >= len(code):
+        return None
+
+    return f"""
+Role:
+    You are the Main Analysis Agent. Your responsibility is to perform a systematic review
+    of the given code after a previous fix attempt has failed. Identify all remaining defects
+    that prevent execution and generate a precise new repair plan. Do not provide suggestions
+    or potential improvements.
+
+Input:
+    Session so far:
+{_session_summary(history)}
+    Bugs targeted by the previous repair plan:
+{_bug_lines(previous_bugs)}
+    Previous repair plan: {previous_plan.get("plan", "")}
+    Changes made by the last repair attempt (unified diff):
+{diff or "(no changes)"}
+    Failure summary: {failure_log.get("summary", "Unknown failure")}
+    Bugs still reported by the validator:
+{_bug_lines(remaining)}
+    Buggy code: {code_slice.prompt_input(editable=False)}
+
+Instructions:
+1. Assess the complexity of the remaining debugging task and classify it as SIMPLE or COMPLEX
+  using the following criteria:
+      - Number of critical bugs remaining
+      - Degree of bug isolation
+      - Clarity of control flow
+      - Presence of concurrency or resource management issues
+      - Dependencies between functions or modules
+2. Identify all remaining bugs, specifying for each:
+      - Bug type (e.g., syntax error, API misuse, logic error)
+      - Location (function name, line number range in the full module)
+      - Explanation of why it prevents correct execution
+3. Produce a step-by-step new repair plan detailing how to fix the remaining bugs.
+
+Output:
+Return a JSON object with this schema:
+{{
+  "complexity": "SIMPLE" or "COMPLEX",
+  "bugs": [
+    {{
+      "type": "string",
+      "location": "string",
+      "explanation": "string"
+    }}
+  ],
+  "plan": "string"
+}}
+Do not write any text besides the JSON.
+"""
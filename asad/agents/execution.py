@@ -2,10 +2,151 @@
 Execute specialized agent tasks to repair specific bug categories.
 """
 
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional
 
-from ..llm import call_llm
+from ..config import get_repair_format, get_slicing_config
+from ..llm import call_llm, call_llm_async
+from ..metrics import record_retry
 from ..parsing import safe_json_parse
+from ..parsing.patch import PATCH_OUTPUT_FORMAT, parse_patch_response
+from ..parsing.slicing import CodeSlice, SliceError, agent_locations, slice_code
+
+FULL_CODE_OUTPUT_FORMAT = """Output:
+Return a JSON object with all newlines and quotes escaped (e.g., \\n, \\"):
+
+{
+  "fixed_code": "string",
+  "fix_explanation": "string"
+}
+
+Do not write any text besides the JSON.
+"""
+
+
+def repair_output_format(patch: bool) -> str:
+    """Return the Output section for full-file or patch-mode repair prompts."""
+    return PATCH_OUTPUT_FORMAT if patch else FULL_CODE_OUTPUT_FORMAT
+
+
+def slice_for_prompt(code: str, locations: List[str]) -> Optional[CodeSlice]:
+    """Slice code to the given bug locations if ASAD_CONTEXT_SLICING allows it."""
+    config = get_slicing_config()
+    if not config["enabled"]:
+        return None
+    return slice_code(code, locations, min_lines=config["min_lines"])
+
+
+def _parse_fix(result: str, stage: Optional[str]) -> Optional[Dict[str, Any]]:
+    fixed = safe_json_parse(result, stage=stage)
+    if isinstance(fixed, dict) and isinstance(fixed.get("fixed_code"), str):
+        return fixed
+    return None
+
+
+def _has_fix(result: str) -> bool:
+    return _parse_fix(result, None) is not None
+
+
+def _applies(code: str) -> Callable[[str], bool]:
+    """Cache check for patch responses: the patch must apply to code."""
+    return lambda response: parse_patch_response(response, code) is not None
+
+
+def _spliced(code_slice: CodeSlice, fixed: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if fixed is None:
+        return None
+    try:
+        return {**fixed, "fixed_code": code_slice.splice(fixed["fixed_code"])}
+    except SliceError:
+        return None
+
+
+def _request_fix(
+    build_prompt: Callable[[str, bool], str],
+    code: str,
+    source: str,
+    stage: str
+) -> Optional[Dict[str, Any]]:
+    """One repair request (patch first in patch mode); None if the response is unusable."""
+    if get_repair_format() == "patch":
+        response = call_llm(build_prompt(source, True), stage=stage, accept=_applies(code))
+        fixed = parse_patch_response(response, code)
+        if fixed is not None:
+            return fixed
+        record_retry(stage, "patch_fallback")
+    return _parse_fix(call_llm(build_prompt(source, False), stage=stage, accept=_has_fix), stage)
+
+
+async def _request_fix_async(
+    build_prompt: Callable[[str, bool], str],
+    code: str,
+    source: str,
+    stage: str
+) -> Optional[Dict[str, Any]]:
+    if get_repair_format() == "patch":
+        response = await call_llm_async(build_prompt(source, True), stage=stage, accept=_applies(code))
+        fixed = parse_patch_response(response, code)
+        if fixed is not None:
+            return fixed
+        record_retry(stage, "patch_fallback")
+    return _parse_fix(await call_llm_async(build_prompt(source, False), stage=stage, accept=_has_fix), stage)
+
+
+def repair_with_llm(
+    build_prompt: Callable[[str, bool], str],
+    code: str,
+    stage: str,
+    fallback_explanation: str,
+    locations: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Run a repair prompt, preferring patch output when ASAD_REPAIR_FORMAT=patch.
+    
+    When locations are given and the module can be sliced, the prompt only
+    carries the targeted regions and their context, and the edit is spliced
+    back. A slice that cannot be spliced, or a patch that fails to apply,
+    falls back to a request with the full file.
+    
+    Args:
+        build_prompt: Builds the prompt from the code input and a patch-mode flag
+        code: Code being repaired
+        stage: Pipeline stage name for call_llm
+        fallback_explanation: Explanation used if the response cannot be parsed
+        locations: Bug locations used to slice the prompt context
+    
+    Returns:
+        Fixed code and explanation
+    """
+    code_slice = slice_for_prompt(code, locations or [])
+    if code_slice is not None:
+        fixed = _spliced(code_slice, _request_fix(
+            build_prompt, code_slice.code, code_slice.prompt_input(), stage
+        ))
+        if fixed is not None:
+            return fixed
+        record_retry(stage, "slice_fallback")
+    fixed = _request_fix(build_prompt, code, code, stage)
+    return fixed or {"fixed_code": code, "fix_explanation": fallback_explanation}
+
+
+async def repair_with_llm_async(
+    build_prompt: Callable[[str, bool], str],
+    code: str,
+    stage: str,
+    fallback_explanation: str,
+    locations: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Async variant of repair_with_llm()."""
+    code_slice = slice_for_prompt(code, locations or [])
+    if code_slice is not None:
+        fixed = _spliced(code_slice, await _request_fix_async(
+            build_prompt, code_slice.code, code_slice.prompt_input(), stage
+        ))
+        if fixed is not None:
+            return fixed
+        record_retry(stage, "slice_fallback")
+    fixed = await _request_fix_async(build_prompt, code, code, stage)
+    return fixed or {"fixed_code": code, "fix_explanation": fallback_explanation}
 
 
 def execute_agent(agent: Dict[str, Any], code: str) -> Dict[str, Any]:
@@ -19,7 +160,22 @@ def execute_agent(agent: Dict[str, Any], code: str) -> Dict[str, Any]:
     Returns:
         Fixed code and explanation of changes applied
     """
-    prompt = f"""
+    return repair_with_llm(
+        lambda source, patch: _execute_prompt(agent, source, patch),
+        code, "execution", "No fix applied", agent_locations(agent)
+    )
+
+
+async def execute_agent_async(agent: Dict[str, Any], code: str) -> Dict[str, Any]:
+    """Async variant of execute_agent()."""
+    return await repair_with_llm_async(
+        lambda source, patch: _execute_prompt(agent, source, patch),
+        code, "execution", "No fix applied", agent_locations(agent)
+    )
+
+
+def _execute_prompt(agent: Dict[str, Any], code: str, patch: bool = False) -> str:
+    return f"""
 Role:
     You are a {agent["role"]}.
     Your task is to {agent["task_description"]}.
@@ -31,21 +187,7 @@ Instructions:
 1. Fix the code to address the issues within your responsibility.
 2. Provide a clear explanation of the fix applied.
 
-Output:
-Return a JSON object with all newlines and quotes escaped (e.g., \\n, \\"):
-
-{{
-  "fixed_code": "string",
-  "fix_explanation": "string"
-}}
-
-Do not write any text besides the JSON.
-"""
-    result = call_llm(prompt)
-    return safe_json_parse(
-        result,
-        fallback={"fixed_code": code, "fix_explanation": "No fix applied"}
-    )
+{repair_output_format(patch)}"""
 
 
 def retry_execute_agent(
@@ -64,7 +206,31 @@ def retry_execute_agent(
     Returns:
         Revised fixed code and explanation
     """
-    prompt = f"""
+    return repair_with_llm(
+        lambda source, patch: _retry_prompt(agent, source, feedback, patch),
+        code, "execution", "No fix applied", agent_locations(agent)
+    )
+
+
+async def retry_execute_agent_async(
+    agent: Dict[str, Any],
+    code: str,
+    feedback: str
+) -> Dict[str, Any]:
+    """Async variant of retry_execute_agent()."""
+    return await repair_with_llm_async(
+        lambda source, patch: _retry_prompt(agent, source, feedback, patch),
+        code, "execution", "No fix applied", agent_locations(agent)
+    )
+
+
+def _retry_prompt(
+    agent: Dict[str, Any],
+    code: str,
+    feedback: str,
+    patch: bool = False
+) -> str:
+    return f"""
 Role:
     You are a {agent["role"]}.
     Your task is to {agent["task_description"]}.
@@ -78,18 +244,4 @@ Instructions:
 1. Fix the code, taking the feedback into account.
 2. Provide a clear explanation of the fix applied.
 
-Output:
-Return a JSON object with all newlines and quotes escaped (e.g., \\n, \\"):
-
-{{
-  "fixed_code": "string",
-  "fix_explanation": "string"
-}}
-
-Do not write any text besides the JSON.
-"""
-    result = call_llm(prompt)
-    return safe_json_parse(
-        result,
-        fallback={"fixed_code": code, "fix_explanation": "No fix applied"}
-    )
+{repair_output_format(patch)}"""
@@ -4,7 +4,7 @@ Agent creation and dependency management for multi-agent repair strategy.
 
 from typing import Dict, Any, List
 
-from ..llm import call_llm
+from ..llm import call_llm, call_llm_async, is_json_response
 from ..parsing import safe_json_parse
 
 
@@ -17,6 +17,9 @@ def generate_agents(bugs: List[Any], plan: str) -> Dict[str, Any]:
     2. Analyze dependencies between fixes (e.g., syntax before logic)
     3. Prioritize agents to ensure correct execution sequence
     
+    Each agent lists its depends_on agents, so together with the target
+    regions the profiles form a dependency DAG for parallel execution.
+    
     Args:
         bugs: List of identified bugs from analysis
         plan: Step-by-step repair instructions
@@ -24,7 +27,26 @@ def generate_agents(bugs: List[Any], plan: str) -> Dict[str, Any]:
     Returns:
         Agent profiles and execution order
     """
-    prompt = f"""
+    result = call_llm(_agents_prompt(bugs, plan), stage="management", accept=is_json_response)
+    return _parse_agents(result)
+
+
+async def generate_agents_async(bugs: List[Any], plan: str) -> Dict[str, Any]:
+    """Async variant of generate_agents()."""
+    result = await call_llm_async(_agents_prompt(bugs, plan), stage="management", accept=is_json_response)
+    return _parse_agents(result)
+
+
+def _parse_agents(result: str) -> Dict[str, Any]:
+    return safe_json_parse(
+        result,
+        stage="management",
+        fallback={"agents": [], "execution_order": []}
+    )
+
+
+def _agents_prompt(bugs: List[Any], plan: str) -> str:
+    return f"""
 Role:
     You are the Main Agent responsible for creating and organizing specialized agent profiles.
     Your task is twofold:
@@ -46,9 +68,12 @@ Step 1 - Agent Generation:
         - name
         - role (brief description of expertise)
         - task_description (phrased as "Your task is to..." and explicitly referencing the located errors)
+        - targets (the locations of the bugs this agent fixes, copied from the located bugs)
 
 Step 2 - Agent Prioritization:
     1. Determine dependencies between agents (e.g., syntax must be fixed before logic errors).
+       For each agent, list in depends_on only the agents whose fixes must land first;
+       agents fixing unrelated code should not depend on each other so they can run in parallel.
     2. Order the agents based on these dependencies.
 
 Output:
@@ -59,7 +84,9 @@ Return a JSON object with the following schema:
     {{
       "name": "string",
       "role": "string",
-      "task_description": "string"
+      "task_description": "string",
+      "targets": ["string"],
+      "depends_on": ["Agent_name"]
     }}
   ],
   "execution_order": ["Agent_1_name", "Agent_2_name", "..."]
@@ -67,8 +94,3 @@ Return a JSON object with the following schema:
 
 Do not write any text besides the JSON.
 """
-    result = call_llm(prompt)
-    return safe_json_parse(
-        result,
-        fallback={"agents": [], "execution_order": []}
-    )
@@ -2,10 +2,21 @@
 Agents for reviewing agent outputs and validating final solutions.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from ..llm import call_llm
-from ..parsing import safe_json_parse
+from ..config import get_validation_config
+from ..llm import call_llm_json, call_llm_json_async
+from ..parsing.slicing import agent_locations
+from ..sandbox import execute_code, execute_code_async, execution_to_validation
+from .execution import slice_for_prompt
+
+REVIEW_FALLBACK = {"decision": "REFINE", "feedback": "Review failed - retrying"}
+
+VALIDATION_FALLBACK = {
+    "status": "NOT FIXED",
+    "summary": "Validation failed due to parsing error",
+    "remaining_bugs": []
+}
 
 
 def task_review(agent: Dict[str, Any], agent_report: Dict[str, Any]) -> Dict[str, Any]:
@@ -19,14 +30,41 @@ def task_review(agent: Dict[str, Any], agent_report: Dict[str, Any]) -> Dict[str
     Returns:
         Review decision (APPROVE/REFINE) and optional feedback
     """
-    prompt = f"""
+    return call_llm_json(
+        _review_prompt(agent, agent_report), stage="review",
+        stop_when=_review_decided, fallback=dict(REVIEW_FALLBACK)
+    )
+
+
+async def task_review_async(
+    agent: Dict[str, Any],
+    agent_report: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Async variant of task_review()."""
+    return await call_llm_json_async(
+        _review_prompt(agent, agent_report), stage="review",
+        stop_when=_review_decided, fallback=dict(REVIEW_FALLBACK)
+    )
+
+
+def _review_decided(fields: Dict[str, Any]) -> bool:
+    # Feedback is only needed when the reviewer asks for a refinement
+    return fields.get("decision") == "APPROVE"
+
+
+def _review_prompt(agent: Dict[str, Any], agent_report: Dict[str, Any]) -> str:
+    fixed_code = agent_report["fixed_code"]
+    code_slice = slice_for_prompt(fixed_code, agent_locations(agent))
+    if code_slice is not None:
+        fixed_code = code_slice.prompt_input(editable=False)
+    return f"""
 Role:
 You are the Main Agent responsible for reviewing the output of a specialized debugging agent.
 Your task is to decide whether to approve or refine the agent fixes.
 
 Input:
 The agent task description: {agent["task_description"]}
-The proposed fixed code: {agent_report["fixed_code"]}
+The proposed fixed code: {fixed_code}
 The fix explanation: {agent_report["fix_explanation"]}
 
 Instructions:
@@ -42,24 +80,74 @@ Your output in JSON format:
 
 Do not write any text besides the JSON.
 """
-    result = call_llm(prompt)
-    return safe_json_parse(
-        result,
-        fallback={"decision": "REFINE", "feedback": "Review failed - retrying"}
-    )
 
 
-def validate_solution(code: str) -> Dict[str, Any]:
+def validate_solution(
+    code: str,
+    mode: Optional[str] = None,
+    semantic: Optional[bool] = None
+) -> Dict[str, Any]:
     """
     Perform final validation to determine if code is fully fixed and executable.
     
+    In "execution" mode the code is compiled and run in the sandbox pool; the
+    LLM validator is only consulted if execution passes and semantic checks
+    are requested.
+    
     Args:
         code: Repaired code to validate
+        mode: "llm" or "execution" (defaults to ASAD_VALIDATION)
+        semantic: Also ask the LLM after a passing execution
+            (defaults to ASAD_VALIDATION_SEMANTIC)
     
     Returns:
         Validation status with summary of remaining issues if any
     """
-    prompt = f"""
+    mode, semantic = _validation_mode(mode, semantic)
+    if mode == "execution":
+        validation = execution_to_validation(execute_code(code))
+        if validation["status"] != "FIXED" or not semantic:
+            return validation
+    return _complete_validation(call_llm_json(
+        _validation_prompt(code), stage="validation",
+        stop_when=_validation_decided, fallback=dict(VALIDATION_FALLBACK)
+    ))
+
+
+async def validate_solution_async(
+    code: str,
+    mode: Optional[str] = None,
+    semantic: Optional[bool] = None
+) -> Dict[str, Any]:
+    """Async variant of validate_solution()."""
+    mode, semantic = _validation_mode(mode, semantic)
+    if mode == "execution":
+        validation = execution_to_validation(await execute_code_async(code))
+        if validation["status"] != "FIXED" or not semantic:
+            return validation
+    return _complete_validation(await call_llm_json_async(
+        _validation_prompt(code), stage="validation",
+        stop_when=_validation_decided, fallback=dict(VALIDATION_FALLBACK)
+    ))
+
+
+def _validation_mode(mode: Optional[str], semantic: Optional[bool]):
+    config = get_validation_config()
+    return mode or config["mode"], config["semantic"] if semantic is None else semantic
+
+
+def _validation_decided(fields: Dict[str, Any]) -> bool:
+    # A FIXED verdict needs no summary of remaining bugs
+    return fields.get("status") == "FIXED"
+
+
+def _complete_validation(validation: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in fields skipped when a FIXED verdict ended the stream early."""
+    return {"summary": "Validation passed", "remaining_bugs": [], **validation}
+
+
+def _validation_prompt(code: str) -> str:
+    return f"""
 Role:
     You are the Master Agent responsible for final validation and closure.
     Your task is to verify whether the given code is fully fixed and executable.
@@ -90,12 +178,3 @@ Return a JSON object with this schema:
 
 Do not write any text besides the JSON.
 """
-    result = call_llm(prompt)
-    return safe_json_parse(
-        result,
-        fallback={
-            "status": "NOT FIXED",
-            "summary": "Validation failed due to parsing error",
-            "remaining_bugs": []
-        }
-    )
@@ -0,0 +1,132 @@
+"""
+Batch debugging over many snippets with bounded concurrency.
+"""
+
+import time
+import traceback
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    BrokenExecutor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Dict, Iterable, Iterator, Literal, Tuple
+
+from .llm import count_llm_calls
+from .pipeline import adaptive_debugger
+
+
+def _debug_one(index: int, code: str, max_iterations: int) -> Dict[str, Any]:
+    """Run the pipeline on one snippet, capturing failures instead of raising."""
+    start = time.perf_counter()
+    fixed_code, error, metrics = None, None, {}
+    with count_llm_calls() as counter:
+        try:
+            fixed_code, metrics = adaptive_debugger(
+                code, max_iterations=max_iterations, return_metrics=True
+            )
+        except Exception:
+            error = traceback.format_exc()
+    return {
+        "index": index,
+        "fixed_code": fixed_code,
+        "error": error,
+        "latency": time.perf_counter() - start,
+        "llm_calls": counter["calls"],
+        "cache_hits": counter["cache_hits"],
+        "metrics": metrics,
+    }
+
+
+def adaptive_debug_batch(
+    snippets: Iterable[str],
+    max_workers: int = 4,
+    executor: Literal["thread", "process"] = "thread",
+    max_iterations: int = 5,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Debug many snippets concurrently and stream results as each one finishes.
+
+    At most ``2 * max_workers`` snippets are in flight at once, so arbitrarily
+    long inputs (including generators) are consumed lazily. A snippet that
+    raises, or a worker process that dies, yields a result with ``error`` set
+    and never stops the rest of the batch.
+
+    Args:
+        snippets: Buggy source code strings
+        max_workers: Number of concurrent debugging sessions
+        executor: "thread" (sessions share one process and its connection
+            pools) or "process" (one interpreter per worker)
+        max_iterations: Maximum repair attempts per snippet
+
+    Yields:
+        Per-snippet result in completion order with index, fixed_code, error,
+        latency (seconds), llm_calls, cache_hits and metrics
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Invalid executor: {executor}. Must be one of: thread, process")
+
+    def new_pool():
+        if executor == "thread":
+            return ThreadPoolExecutor(max_workers=max_workers)
+        return ProcessPoolExecutor(max_workers=max_workers)
+
+    pool = new_pool()
+    pending: Dict[Future, Tuple[int, str, int]] = {}
+    items = enumerate(snippets)
+    exhausted = False
+
+    def submit(index: int, code: str, attempt: int) -> None:
+        nonlocal pool
+        try:
+            future = pool.submit(_debug_one, index, code, max_iterations)
+        except BrokenExecutor:
+            # A crashed worker poisons the pool; continue on a fresh one
+            pool.shutdown(wait=False)
+            pool = new_pool()
+            future = pool.submit(_debug_one, index, code, max_iterations)
+        pending[future] = (index, code, attempt)
+
+    try:
+        while True:
+            while not exhausted and len(pending) < 2 * max_workers:
+                try:
+                    index, code = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                submit(index, code, 1)
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, code, attempt = pending.pop(future)
+                try:
+                    yield future.result()
+                except BrokenExecutor as exc:
+                    # In-flight snippets die with the crashed worker; retry them
+                    # once so only the snippet that crashes twice is reported
+                    if attempt < 2:
+                        submit(index, code, attempt + 1)
+                    else:
+                        yield _error_result(index, exc)
+                except Exception as exc:
+                    yield _error_result(index, exc)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _error_result(index: int, exc: BaseException) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "fixed_code": None,
+        "error": f"{type(exc).__name__}: {exc}",
+        "latency": 0.0,
+        "llm_calls": 0,
+        "cache_hits": 0,
+        "metrics": {},
+    }
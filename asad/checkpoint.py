@@ -0,0 +1,280 @@
+"""
+Persistent checkpoints of pipeline runs, so an interrupted run can be resumed.
+
+A run records the result of every completed step (analysis, the agent
+configuration, each agent's execute and review calls, merged multi-agent
+progress, validation, re-analysis) under a hierarchical key such as
+"iteration-2/multi-agent/management". Resuming a run replays the pipeline:
+recorded steps return their saved results without calling the LLM, so only
+the steps that were in flight when the process died are repeated.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from .config import get_checkpoint_config
+
+T = TypeVar("T")
+
+# Run states: running runs can be resumed, done runs keep only their result
+RUNNING, DONE = "running", "done"
+
+
+class CheckpointStore:
+    """SQLite store of runs and the results of their completed steps."""
+
+    def __init__(self, path: str, ttl: float = 0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                code TEXT NOT NULL,
+                max_iterations INTEGER NOT NULL,
+                analysis TEXT,
+                status TEXT NOT NULL,
+                result TEXT,
+                progress TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS steps (
+                run_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (run_id, key)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def create_run(
+        self,
+        run_id: str,
+        code: str,
+        max_iterations: int,
+        analysis_report: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Register a new run with the inputs needed to resume it."""
+        now = time.time()
+        analysis = json.dumps(analysis_report) if analysis_report is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, code, max_iterations, analysis, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, code, max_iterations, analysis, RUNNING, now, now),
+            )
+            self._conn.commit()
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a run.
+
+        Returns:
+            Dict with run_id, code, max_iterations, analysis (initial report
+            or None), status, result (fixed code of a done run), progress
+            (key of the last completed step), created_at and updated_at;
+            None for unknown runs
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id, code, max_iterations, analysis, status, result, progress, created_at, updated_at "
+                "FROM runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        run = dict(zip(
+            ("run_id", "code", "max_iterations", "analysis", "status", "result", "progress", "created_at", "updated_at"),
+            row,
+        ))
+        run["analysis"] = json.loads(run["analysis"]) if run["analysis"] else None
+        return run
+
+    def load_steps(self, run_id: str) -> Dict[str, Any]:
+        """Saved step results of a run by key."""
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM steps WHERE run_id = ?", (run_id,)).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_step(self, run_id: str, key: str, value: Any) -> None:
+        """Record (or overwrite) a step result and mark it as the run's progress."""
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO steps (run_id, key, value) VALUES (?, ?, ?)",
+                (run_id, key, payload),
+            )
+            self._conn.execute(
+                "UPDATE runs SET progress = ?, updated_at = ? WHERE run_id = ?",
+                (key, time.time(), run_id),
+            )
+            self._conn.commit()
+
+    def finish(self, run_id: str, result: str) -> None:
+        """Mark a run done with its fixed code; its step results are dropped."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, result = ?, updated_at = ? WHERE run_id = ?",
+                (DONE, result, time.time(), run_id),
+            )
+            self._conn.execute("DELETE FROM steps WHERE run_id = ?", (run_id,))
+            self._conn.commit()
+
+    def list_runs(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Runs (most recently updated first) with run_id, status, progress, created_at and updated_at."""
+        query = "SELECT run_id, status, progress, created_at, updated_at FROM runs"
+        params: tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY updated_at DESC", params).fetchall()
+        return [
+            dict(zip(("run_id", "status", "progress", "created_at", "updated_at"), row))
+            for row in rows
+        ]
+
+    def prune(self) -> int:
+        """Delete runs not updated within the TTL; returns how many were removed."""
+        if not self.ttl:
+            return 0
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM steps WHERE run_id IN (SELECT run_id FROM runs WHERE updated_at < ?)",
+                (cutoff,),
+            )
+            removed = self._conn.execute("DELETE FROM runs WHERE updated_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RunCheckpoint:
+    """The saved steps of one run, consulted and extended as the pipeline proceeds."""
+
+    def __init__(self, store: CheckpointStore, run_id: str, steps: Optional[Dict[str, Any]] = None):
+        self.store = store
+        self.run_id = run_id
+        self.steps = steps if steps is not None else {}
+        self.replayed = 0
+
+    def save(self, key: str, value: Any) -> None:
+        self.steps[key] = value
+        self.store.save_step(self.run_id, key, value)
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+_active_run: contextvars.ContextVar[Optional[RunCheckpoint]] = contextvars.ContextVar(
+    "asad_active_run", default=None
+)
+_scope: contextvars.ContextVar[str] = contextvars.ContextVar("asad_checkpoint_scope", default="")
+
+
+def _reset_after_fork() -> None:
+    # SQLite connections must not be shared with a forked child
+    global _store, _store_lock
+    _store = None
+    _store_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Return the process-wide checkpoint store, creating (and pruning) it on first use."""
+    global _store
+    config = get_checkpoint_config()
+    with _store_lock:
+        if _store is None or _store.path != config["path"]:
+            _store = CheckpointStore(config["path"], ttl=config["ttl"])
+            _store.prune()
+        return _store
+
+
+def list_runs(status: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    List checkpointed runs, most recently updated first.
+
+    Args:
+        status: Only runs in this state ("running" for resumable runs, or "done")
+
+    Returns:
+        Dicts with run_id, status, progress, created_at and updated_at
+    """
+    return get_checkpoint_store().list_runs(status)
+
+
+@contextlib.contextmanager
+def activate(run: RunCheckpoint) -> Iterator[RunCheckpoint]:
+    """Record and replay steps of the current context (thread or task) in run."""
+    run_token = _active_run.set(run)
+    scope_token = _scope.set("")
+    try:
+        yield run
+    finally:
+        _scope.reset(scope_token)
+        _active_run.reset(run_token)
+
+
+async def checkpointed(key: str, compute: Callable[[], Awaitable[T]]) -> T:
+    """
+    Await compute() as a checkpointed step of the active run.
+
+    Outside a run this just awaits compute(). Inside one, a step whose key
+    was already recorded returns its saved result; otherwise the result is
+    saved once compute() finishes. Steps checkpointed inside compute() are
+    keyed under this step's key.
+
+    Args:
+        key: Step name, unique within the enclosing step
+        compute: Produces the step's JSON-serializable result
+    """
+    run = _active_run.get()
+    if run is None:
+        return await compute()
+    path = _scope.get() + key
+    if path in run.steps:
+        run.replayed += 1
+        return run.steps[path]
+    token = _scope.set(path + "/")
+    try:
+        value = await compute()
+    finally:
+        _scope.reset(token)
+    run.save(path, value)
+    return value
+
+
+def restore(key: str) -> Any:
+    """State saved with persist(key) in the active run's current step, if any."""
+    run = _active_run.get()
+    if run is None:
+        return None
+    return run.steps.get(_scope.get() + key)
+
+
+def persist(key: str, value: Any) -> None:
+    """Save (overwriting) progress state of the current step in the active run."""
+    run = _active_run.get()
+    if run is not None:
+        run.save(_scope.get() + key, value)
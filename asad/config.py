@@ -2,22 +2,39 @@
 Configuration management for API keys and LLM provider selection.
 """
 
+import hashlib
 import os
-from typing import Literal
+from typing import Any, Dict, Literal, Optional
 
-from dotenv import load_dotenv
 
-# Load environment variables early
-load_dotenv()
+def load_env(path: Optional[str] = None, override: bool = False) -> bool:
+    """
+    Load environment variables from a .env file.
 
+    Nothing is loaded at import time; applications call this once at
+    startup (main.py does) before the first LLM call.
+
+    Args:
+        path: .env file to read (default: search upward from the working directory)
+        override: Let the file replace variables that are already set
+
+    Returns:
+        True if a file was found and read
+    """
+    from dotenv import find_dotenv, load_dotenv
+
+    return load_dotenv(path or find_dotenv(usecwd=True), override=override)
+
+
+def get_llm_provider() -> str:
+    """Get the active LLM provider (any registered provider name) from environment variables."""
+    from .llm.registry import PROVIDER_CLASSES
 
-def get_llm_provider() -> Literal["together", "groq", "openai"]:
-    """Get the active LLM provider from environment variables."""
     provider = os.getenv("LLM_PROVIDER").lower() 
-    if provider not in ["together", "groq", "openai"]:
+    if provider not in PROVIDER_CLASSES:
         raise ValueError(
             f"Invalid LLM provider: {provider}. "
-            "Must be one of: together, groq, openai"
+            f"Must be one of: {', '.join(PROVIDER_CLASSES)}"
         )
     return provider
 
@@ -41,3 +58,491 @@ def get_api_key(provider: str) -> str:
         )
     
     return api_key
+
+
+def _env_list(name: str) -> list:
+    """Split a comma-separated environment variable into a list of names."""
+    value = os.getenv(name, "")
+    return [item.strip().lower() for item in value.split(",") if item.strip()]
+
+
+def get_cache_config() -> Dict[str, Any]:
+    """
+    Read response cache settings from environment variables.
+
+    Variables:
+        ASAD_CACHE: Set to 0/false/off to disable the cache entirely
+        ASAD_CACHE_DIR: Directory holding the SQLite cache file
+        ASAD_CACHE_TTL: Entry lifetime in seconds (0 disables expiry)
+        ASAD_CACHE_MAX_ENTRIES: Maximum number of cached responses
+        ASAD_CACHE_MAX_BYTES: Maximum total size of cached responses
+        ASAD_CACHE_STAGES: Only cache these stages (comma-separated)
+        ASAD_CACHE_SKIP_STAGES: Never cache these stages (comma-separated)
+
+    Returns:
+        Cache settings dictionary
+    """
+    default_dir = os.path.join(
+        os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+        "asad",
+    )
+    return {
+        "enabled": os.getenv("ASAD_CACHE", "1").lower() not in ("0", "false", "off", "no"),
+        "directory": os.getenv("ASAD_CACHE_DIR", default_dir),
+        "ttl": float(os.getenv("ASAD_CACHE_TTL", str(7 * 24 * 3600))),
+        "max_entries": int(os.getenv("ASAD_CACHE_MAX_ENTRIES", "10000")),
+        "max_bytes": int(os.getenv("ASAD_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+        "stages": _env_list("ASAD_CACHE_STAGES"),
+        "skip_stages": _env_list("ASAD_CACHE_SKIP_STAGES"),
+    }
+
+
+def get_http_config() -> Dict[str, Any]:
+    """
+    Read HTTP connection pool settings shared by all provider clients.
+
+    Variables:
+        ASAD_HTTP_MAX_CONNECTIONS: Maximum open connections per provider
+        ASAD_HTTP_MAX_KEEPALIVE: Maximum idle keep-alive connections per provider
+        ASAD_HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept open
+        ASAD_HTTP_TIMEOUT: Request timeout in seconds
+
+    Returns:
+        HTTP settings dictionary
+    """
+    return {
+        "max_connections": int(os.getenv("ASAD_HTTP_MAX_CONNECTIONS", "100")),
+        "max_keepalive_connections": int(os.getenv("ASAD_HTTP_MAX_KEEPALIVE", "20")),
+        "keepalive_expiry": float(os.getenv("ASAD_HTTP_KEEPALIVE_EXPIRY", "60")),
+        "timeout": float(os.getenv("ASAD_HTTP_TIMEOUT", "600")),
+    }
+
+
+def get_selfhosted_config() -> Dict[str, Any]:
+    """
+    Read settings for an OpenAI-compatible self-hosted server (LLM_PROVIDER=selfhosted).
+
+    Variables:
+        ASAD_SELFHOSTED_BASE_URL: Server URL including /v1 (e.g. http://localhost:8000/v1)
+        ASAD_SELFHOSTED_MODEL: Model name served by the server
+        ASAD_SELFHOSTED_API_KEY: API key, if the server requires one
+        ASAD_SELFHOSTED_TIMEOUT: Request timeout in seconds
+        ASAD_SELFHOSTED_CONCURRENCY: Maximum requests in flight
+        ASAD_SELFHOSTED_MAX_TOKENS: Completion token limit per prompt
+        ASAD_SELFHOSTED_API: chat (default, /chat/completions with the model's
+            chat template) or completions (raw /completions, no chat template;
+            for base models or servers that template completion prompts)
+        ASAD_SELFHOSTED_BATCH_SIZE: Prompts per batched request (default: 1);
+            above 1 requires ASAD_SELFHOSTED_API=completions, the only endpoint
+            that accepts a list of prompts
+        ASAD_SELFHOSTED_BATCH_WAIT_MS: How long a batch waits to fill up
+
+    Returns:
+        Self-hosted provider settings dictionary
+    """
+    config = {
+        "base_url": os.getenv("ASAD_SELFHOSTED_BASE_URL") or None,
+        "model": os.getenv("ASAD_SELFHOSTED_MODEL", ""),
+        "api_key": os.getenv("ASAD_SELFHOSTED_API_KEY") or "EMPTY",
+        "timeout": float(os.getenv("ASAD_SELFHOSTED_TIMEOUT", "600")),
+        "concurrency": int(os.getenv("ASAD_SELFHOSTED_CONCURRENCY", "8")),
+        "max_tokens": int(os.getenv("ASAD_SELFHOSTED_MAX_TOKENS", "4096")),
+        "api": os.getenv("ASAD_SELFHOSTED_API", "chat").lower(),
+        "batch_size": int(os.getenv("ASAD_SELFHOSTED_BATCH_SIZE", "1")),
+        "batch_wait": float(os.getenv("ASAD_SELFHOSTED_BATCH_WAIT_MS", "10")) / 1000,
+    }
+    if config["concurrency"] < 1 or config["batch_size"] < 1:
+        raise ValueError("ASAD_SELFHOSTED_CONCURRENCY and ASAD_SELFHOSTED_BATCH_SIZE must be at least 1")
+    if config["api"] not in ["chat", "completions"]:
+        raise ValueError(
+            f"Invalid self-hosted API: {config['api']}. "
+            f"Must be one of: chat, completions"
+        )
+    if config["batch_size"] > 1 and config["api"] != "completions":
+        raise ValueError(
+            "ASAD_SELFHOSTED_BATCH_SIZE above 1 sends prompts to /completions without the chat "
+            "template; set ASAD_SELFHOSTED_API=completions to confirm the model accepts raw prompts"
+        )
+    return config
+
+
+def get_provider_chain_config() -> Dict[str, Any]:
+    """
+    Read multi-provider routing settings (LLM_PROVIDER=multi).
+
+    Variables:
+        ASAD_PROVIDER_CHAIN: Comma-separated providers in fallback order (e.g. groq,together,openai)
+        ASAD_HEDGE_PERCENTILE: Send a hedged request to the next provider once the
+            current one is slower than this percentile of its latencies (default: 95, 0 disables)
+        ASAD_HEDGE_DELAY: Hedge delay in seconds until enough latencies are known (default: 10)
+        ASAD_BREAKER_WINDOW: Recent requests each circuit breaker looks at (default: 20)
+        ASAD_BREAKER_MIN_REQUESTS: Requests in the window before a breaker may open (default: 5)
+        ASAD_BREAKER_ERROR_RATE: Error rate that opens a breaker (default: 0.5)
+        ASAD_BREAKER_LATENCY: Median latency in seconds that opens a breaker (default: 0, off)
+        ASAD_BREAKER_COOLDOWN: Seconds an open breaker waits before a trial request (default: 30)
+
+    Returns:
+        Provider chain settings dictionary
+    """
+    chain = [name.strip().lower() for name in os.getenv("ASAD_PROVIDER_CHAIN", "").split(",") if name.strip()]
+    if not chain or "multi" in chain:
+        raise ValueError(
+            "ASAD_PROVIDER_CHAIN must list at least one provider (e.g. groq,together,openai) "
+            "to use LLM_PROVIDER=multi"
+        )
+    percentile = float(os.getenv("ASAD_HEDGE_PERCENTILE", "95"))
+    if not 0 <= percentile < 100:
+        raise ValueError(f"Invalid ASAD_HEDGE_PERCENTILE: {percentile}. Must be in [0, 100)")
+    return {
+        "chain": chain,
+        "hedge_percentile": percentile,
+        "hedge_delay": float(os.getenv("ASAD_HEDGE_DELAY", "10")),
+        "breaker_window": int(os.getenv("ASAD_BREAKER_WINDOW", "20")),
+        "breaker_min_requests": int(os.getenv("ASAD_BREAKER_MIN_REQUESTS", "5")),
+        "breaker_error_rate": float(os.getenv("ASAD_BREAKER_ERROR_RATE", "0.5")),
+        "breaker_latency": float(os.getenv("ASAD_BREAKER_LATENCY", "0")),
+        "breaker_cooldown": float(os.getenv("ASAD_BREAKER_COOLDOWN", "30")),
+    }
+
+
+def get_rate_limit_config(provider: str) -> Dict[str, Any]:
+    """
+    Read request pacing and retry settings for a provider.
+
+    Variables:
+        ASAD_<PROVIDER>_RPM: Requests per minute allowed by the provider (e.g. ASAD_GROQ_RPM)
+        ASAD_<PROVIDER>_TPM: Tokens per minute allowed by the provider
+        ASAD_RATE_BURST: Seconds of quota that may be spent at once (default: 5)
+        ASAD_RATE_COMPLETION_TOKENS: Completion tokens assumed per request (default: 512)
+        ASAD_RATE_RETRIES: Retries for rate-limited and transient errors (default: 3)
+        ASAD_RATE_BACKOFF: Base backoff in seconds, doubled per attempt (default: 1)
+        ASAD_RATE_BACKOFF_MAX: Longest backoff in seconds (default: 60)
+
+    Args:
+        provider: Provider name
+
+    Returns:
+        Rate limit settings dictionary (rpm/tpm are None when unlimited)
+    """
+    prefix = f"ASAD_{provider.upper()}_"
+    rpm = float(os.getenv(prefix + "RPM", "0"))
+    tpm = float(os.getenv(prefix + "TPM", "0"))
+    return {
+        "rpm": rpm or None,
+        "tpm": tpm or None,
+        "burst": float(os.getenv("ASAD_RATE_BURST", "5")),
+        "completion_tokens": int(os.getenv("ASAD_RATE_COMPLETION_TOKENS", "512")),
+        "max_retries": int(os.getenv("ASAD_RATE_RETRIES", "3")),
+        "backoff": float(os.getenv("ASAD_RATE_BACKOFF", "1")),
+        "backoff_max": float(os.getenv("ASAD_RATE_BACKOFF_MAX", "60")),
+    }
+
+
+def get_router_mode() -> Literal["hybrid", "static", "llm"]:
+    """
+    Get the complexity routing mode from ASAD_ROUTER.
+
+    Modes:
+        hybrid: Static AST router, LLM classification breaks ties (default)
+        static: Static AST router only
+        llm: Use the analysis agent's classification as-is
+    """
+    mode = os.getenv("ASAD_ROUTER", "hybrid").lower()
+    if mode not in ["hybrid", "static", "llm"]:
+        raise ValueError(
+            f"Invalid router mode: {mode}. "
+            "Must be one of: hybrid, static, llm"
+        )
+    return mode
+
+
+def get_reanalysis_mode() -> Literal["full", "delta"]:
+    """
+    Get the re-analysis prompt mode from ASAD_REANALYSIS.
+
+    Modes:
+        full: Resend the whole current code and previous analysis (default)
+        delta: Send a diff against the previous iteration, the code around
+            the remaining bugs, both bug lists and a compact session summary
+    """
+    mode = os.getenv("ASAD_REANALYSIS", "full").lower()
+    if mode not in ["full", "delta"]:
+        raise ValueError(
+            f"Invalid re-analysis mode: {mode}. "
+            "Must be one of: full, delta"
+        )
+    return mode
+
+
+def get_speculative_config() -> Dict[str, Any]:
+    """
+    Read speculative strategy racing settings from environment variables.
+
+    Variables:
+        ASAD_SPECULATIVE: "off" (default), "borderline" (race both strategies
+            when the static router's score is in its tie band) or "always"
+        ASAD_SPECULATIVE_MAX_CALLS: LLM requests the second-choice strategy
+            may make per iteration (default: 12)
+
+    Returns:
+        Speculation settings dictionary
+    """
+    mode = os.getenv("ASAD_SPECULATIVE", "off").lower()
+    if mode not in ["off", "borderline", "always"]:
+        raise ValueError(
+            f"Invalid speculative mode: {mode}. "
+            "Must be one of: off, borderline, always"
+        )
+    return {
+        "mode": mode,
+        "max_calls": int(os.getenv("ASAD_SPECULATIVE_MAX_CALLS", "12")),
+    }
+
+
+def get_fused_mode() -> Literal["off", "simple", "always"]:
+    """
+    Get the fused single-call repair mode from ASAD_FUSED.
+
+    Modes:
+        off: Always analyze, fix and validate in separate calls (default)
+        simple: Try one fused call first when the static router scores the code SIMPLE
+        always: Try one fused call first on every input
+    """
+    mode = os.getenv("ASAD_FUSED", "off").lower()
+    if mode not in ["off", "simple", "always"]:
+        raise ValueError(
+            f"Invalid fused mode: {mode}. "
+            "Must be one of: off, simple, always"
+        )
+    return mode
+
+
+def get_validation_config() -> Dict[str, Any]:
+    """
+    Read validation settings from environment variables.
+
+    Variables:
+        ASAD_VALIDATION: "llm" (default) asks the validator agent; "execution"
+            compiles and runs the code in a sandbox first
+        ASAD_VALIDATION_SEMANTIC: In execution mode, also consult the LLM
+            validator when execution passes (default: off)
+        ASAD_SANDBOX_WORKERS: Number of warm sandbox interpreters
+        ASAD_SANDBOX_TIMEOUT: Wall-time limit per execution in seconds
+        ASAD_SANDBOX_CPU: CPU-time limit per execution in seconds
+        ASAD_SANDBOX_MEMORY_MB: Address-space limit per execution in MiB
+
+    Returns:
+        Validation settings dictionary
+    """
+    mode = os.getenv("ASAD_VALIDATION", "llm").lower()
+    if mode not in ["llm", "execution"]:
+        raise ValueError(
+            f"Invalid validation mode: {mode}. "
+            "Must be one of: llm, execution"
+        )
+    return {
+        "mode": mode,
+        "semantic": os.getenv("ASAD_VALIDATION_SEMANTIC", "0").lower() in ("1", "true", "on", "yes"),
+        "workers": int(os.getenv("ASAD_SANDBOX_WORKERS", "2")),
+        "timeout": float(os.getenv("ASAD_SANDBOX_TIMEOUT", "5")),
+        "cpu_seconds": int(os.getenv("ASAD_SANDBOX_CPU", "5")),
+        "memory_bytes": int(os.getenv("ASAD_SANDBOX_MEMORY_MB", "2048")) * 1024 * 1024,
+    }
+
+
+def get_repair_format() -> Literal["full", "patch"]:
+    """
+    Get the repair output format from ASAD_REPAIR_FORMAT.
+
+    Formats:
+        full: Agents return the whole fixed file as JSON (default)
+        patch: Agents return search/replace hunks applied locally, with a
+            full-file retry only if the patch does not apply
+    """
+    repair_format = os.getenv("ASAD_REPAIR_FORMAT", "full").lower()
+    if repair_format not in ["full", "patch"]:
+        raise ValueError(
+            f"Invalid repair format: {repair_format}. "
+            "Must be one of: full, patch"
+        )
+    return repair_format
+
+
+def get_slicing_config() -> Dict[str, Any]:
+    """
+    Read context slicing settings for agent prompts.
+
+    Variables:
+        ASAD_CONTEXT_SLICING: Set to 0/false/off to always send the full module
+        ASAD_SLICE_MIN_LINES: Modules shorter than this are sent whole
+
+    Returns:
+        Slicing settings dictionary
+    """
+    return {
+        "enabled": os.getenv("ASAD_CONTEXT_SLICING", "1").lower() not in ("0", "false", "off", "no"),
+        "min_lines": int(os.getenv("ASAD_SLICE_MIN_LINES", "80")),
+    }
+
+
+def get_chunking_config() -> Dict[str, Any]:
+    """
+    Read map-reduce analysis settings for large modules.
+
+    Variables:
+        ASAD_CHUNKED_ANALYSIS: Set to 0/false/off to always analyze the whole module in one call
+        ASAD_CHUNK_MIN_LINES: Modules shorter than this are analyzed whole (default: 400)
+        ASAD_CHUNK_LINES: Target lines per analyzed chunk (default: 200)
+
+    Returns:
+        Chunking settings dictionary
+    """
+    return {
+        "enabled": os.getenv("ASAD_CHUNKED_ANALYSIS", "1").lower() not in ("0", "false", "off", "no"),
+        "min_lines": int(os.getenv("ASAD_CHUNK_MIN_LINES", "400")),
+        "chunk_lines": int(os.getenv("ASAD_CHUNK_LINES", "200")),
+    }
+
+
+def get_project_config(root: str) -> Dict[str, Any]:
+    """
+    Read settings for multi-file project runs.
+
+    Variables:
+        ASAD_PROJECT_INDEX: Analysis index database (default: one per project
+            root under ASAD_CACHE_DIR/projects)
+        ASAD_PROJECT_WORKERS: Modules analyzed and repaired at once (default: 4)
+        ASAD_PROJECT_EXCLUDE: Extra directory names to skip (comma-separated)
+
+    Args:
+        root: Project directory
+
+    Returns:
+        Project settings dictionary
+    """
+    digest = hashlib.sha256(os.path.abspath(root).encode("utf-8")).hexdigest()[:16]
+    default_index = os.path.join(get_cache_config()["directory"], "projects", f"{digest}.sqlite3")
+    return {
+        "index": os.getenv("ASAD_PROJECT_INDEX") or default_index,
+        "workers": int(os.getenv("ASAD_PROJECT_WORKERS", "4")),
+        "exclude": _env_list("ASAD_PROJECT_EXCLUDE"),
+    }
+
+
+def get_checkpoint_config() -> Dict[str, Any]:
+    """
+    Read pipeline checkpoint settings.
+
+    Variables:
+        ASAD_CHECKPOINTS: Set to 1/true/on to checkpoint every run (default:
+            only runs given an explicit run_id are checkpointed)
+        ASAD_CHECKPOINT_DB: Checkpoint database (default: ASAD_CACHE_DIR/checkpoints.sqlite3)
+        ASAD_CHECKPOINT_TTL: Seconds finished and abandoned runs are kept (default: 7 days)
+
+    Returns:
+        Checkpoint settings dictionary
+    """
+    return {
+        "enabled": os.getenv("ASAD_CHECKPOINTS", "0").lower() in ("1", "true", "on", "yes"),
+        "path": os.getenv("ASAD_CHECKPOINT_DB")
+        or os.path.join(get_cache_config()["directory"], "checkpoints.sqlite3"),
+        "ttl": float(os.getenv("ASAD_CHECKPOINT_TTL", str(7 * 24 * 3600))),
+    }
+
+
+def get_service_config() -> Dict[str, Any]:
+    """
+    Read settings for the HTTP debugging service (python -m asad.service).
+
+    Variables:
+        ASAD_SERVICE_HOST: Interface to listen on (default: 127.0.0.1)
+        ASAD_SERVICE_PORT: Port to listen on (default: 8080)
+        ASAD_SERVICE_WORKERS: Jobs processed at once (default: 4)
+        ASAD_SERVICE_QUEUE_SIZE: Jobs allowed to wait for a worker before
+            new submissions are rejected with 429 (default: 64)
+        ASAD_SERVICE_MAX_ITERATIONS: Default repair attempts per job (default: 5)
+        ASAD_SERVICE_JOB_TTL: Seconds finished jobs stay queryable (default: 3600)
+        ASAD_SERVICE_MAX_BODY: Largest accepted request body in bytes (default: 1 MiB)
+
+    Returns:
+        Service settings dictionary
+    """
+    config = {
+        "host": os.getenv("ASAD_SERVICE_HOST", "127.0.0.1"),
+        "port": int(os.getenv("ASAD_SERVICE_PORT", "8080")),
+        "workers": int(os.getenv("ASAD_SERVICE_WORKERS", "4")),
+        "queue_size": int(os.getenv("ASAD_SERVICE_QUEUE_SIZE", "64")),
+        "max_iterations": int(os.getenv("ASAD_SERVICE_MAX_ITERATIONS", "5")),
+        "job_ttl": float(os.getenv("ASAD_SERVICE_JOB_TTL", "3600")),
+        "max_body": int(os.getenv("ASAD_SERVICE_MAX_BODY", str(1024 * 1024))),
+    }
+    if config["workers"] < 1 or config["queue_size"] < 1:
+        raise ValueError("ASAD_SERVICE_WORKERS and ASAD_SERVICE_QUEUE_SIZE must be at least 1")
+    return config
+
+
+def get_streaming_enabled() -> bool:
+    """
+    Whether JSON-returning agents stream their responses (ASAD_STREAMING).
+
+    Streaming lets review and validation act on their decision field as soon
+    as it is generated, and cancels responses that are clearly malformed.
+    """
+    return os.getenv("ASAD_STREAMING", "0").lower() in ("1", "true", "on", "yes")
+
+
+def get_metrics_config() -> Dict[str, Any]:
+    """
+    Read metrics settings from environment variables.
+
+    Variables:
+        ASAD_METRICS: Set to 1/true/on to record process-wide metrics
+        ASAD_METRICS_FILE: Prometheus text file rewritten after every run
+
+    Returns:
+        Metrics settings dictionary
+    """
+    return {
+        "enabled": os.getenv("ASAD_METRICS", "0").lower() in ("1", "true", "on", "yes"),
+        "file": os.getenv("ASAD_METRICS_FILE") or None,
+    }
+
+
+def get_fake_provider_config() -> Dict[str, Any]:
+    """
+    Read settings for the offline fake provider (LLM_PROVIDER=fake).
+
+    Variables:
+        ASAD_FAKE_LATENCY: Mean seconds per response (default: 0)
+        ASAD_FAKE_JITTER: Uniform +/- seconds added to each response (default: 0)
+        ASAD_FAKE_SEED: Seed for the jitter and fault generator
+        ASAD_FAKE_SLOW_RATE: Fraction of responses that take ASAD_FAKE_SLOW_LATENCY instead
+        ASAD_FAKE_SLOW_LATENCY: Seconds per slow (tail) response
+        ASAD_FAKE_FAILURE_RATE: Fraction of requests that fail with ConnectionError
+        ASAD_FAKE_TOKEN_LATENCY: Extra seconds per 1000 prompt tokens, so
+            latency grows with prompt size (default: 0)
+        ASAD_FAKE_FIXES: Repair responses a snippet needs before the scripted
+            validator reports FIXED (default: 1)
+        ASAD_FAKE_RECORDING: Response cache database to replay recorded responses from
+        ASAD_FAKE_RECORDED_PROVIDER: Provider the recording was made with (default: groq)
+
+    Returns:
+        Fake provider settings dictionary
+    """
+    latency = float(os.getenv("ASAD_FAKE_LATENCY", "0"))
+    jitter = float(os.getenv("ASAD_FAKE_JITTER", "0"))
+    if latency < 0 or jitter < 0:
+        raise ValueError("ASAD_FAKE_LATENCY and ASAD_FAKE_JITTER must not be negative")
+    seed = os.getenv("ASAD_FAKE_SEED")
+    return {
+        "latency": latency,
+        "jitter": jitter,
+        "seed": int(seed) if seed else None,
+        "slow_rate": float(os.getenv("ASAD_FAKE_SLOW_RATE", "0")),
+        "slow_latency": float(os.getenv("ASAD_FAKE_SLOW_LATENCY", "0")),
+        "failure_rate": float(os.getenv("ASAD_FAKE_FAILURE_RATE", "0")),
+        "token_latency": float(os.getenv("ASAD_FAKE_TOKEN_LATENCY", "0")),
+        "fixes": int(os.getenv("ASAD_FAKE_FIXES", "1")),
+        "recording": os.getenv("ASAD_FAKE_RECORDING") or None,
+        "recorded_provider": os.getenv("ASAD_FAKE_RECORDED_PROVIDER", "groq"),
+    }
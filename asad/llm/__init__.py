@@ -1,5 +1,40 @@
 """LLM client interface for unified access to language models."""
 
-from .client import call_llm
+from .client import (
+    CallBudgetExceeded,
+    call_llm,
+    call_llm_async,
+    call_llm_json,
+    call_llm_json_async,
+    count_llm_calls,
+    is_json_response,
+    limit_llm_calls,
+    stream_llm,
+    stream_llm_async,
+)
+from .cache import ResponseCache, cache_stats, get_response_cache
+from .failover import provider_health
+from .registry import get_provider, register_provider, reset_providers
+from .scheduler import get_rate_limiter, reset_rate_limiters
 
-__all__ = ["call_llm"]
+__all__ = [
+    "CallBudgetExceeded",
+    "call_llm",
+    "call_llm_async",
+    "call_llm_json",
+    "call_llm_json_async",
+    "count_llm_calls",
+    "is_json_response",
+    "limit_llm_calls",
+    "stream_llm",
+    "stream_llm_async",
+    "ResponseCache",
+    "cache_stats",
+    "get_response_cache",
+    "provider_health",
+    "get_provider",
+    "register_provider",
+    "reset_providers",
+    "get_rate_limiter",
+    "reset_rate_limiters",
+]
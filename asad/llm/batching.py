@@ -0,0 +1,117 @@
+"""
+Client-side micro-batching of concurrent prompts.
+
+Prompts submitted from any thread or event loop are queued. A background
+thread groups them into batches and sends each batch as one request. A new
+batch is assembled only when a request slot is free, so while the server is
+busy the queue keeps filling and the next batch goes out fuller.
+"""
+
+import concurrent.futures
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+# send_batch(prompts) returns one result per prompt, in order
+SendBatch = Callable[[List[str]], List[Any]]
+
+_Item = Tuple[str, concurrent.futures.Future]
+
+
+class MicroBatcher:
+    """Group concurrently submitted prompts into batched requests."""
+
+    def __init__(
+        self,
+        send_batch: SendBatch,
+        max_batch_size: int = 8,
+        max_wait: float = 0.01,
+        max_in_flight: int = 4,
+    ):
+        self.send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Optional[_Item]]" = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_in_flight, thread_name_prefix="asad-batch"
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, prompt: str) -> concurrent.futures.Future:
+        """
+        Queue a prompt for the next batch.
+
+        Returns:
+            Future resolving to the prompt's result; await it from asyncio
+            with asyncio.wrap_future()
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="asad-batcher", daemon=True)
+                self._thread.start()
+            self._queue.put((prompt, future))
+        return future
+
+    def close(self) -> None:
+        """Stop accepting prompts; batches already sent still complete."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+            if self._thread is None:
+                self._executor.shutdown(wait=False)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                self._slots.acquire()
+                item = self._queue.get()
+                if item is None:
+                    return
+                batch, closing = self._fill([item])
+                self._executor.submit(self._dispatch, batch)
+                if closing:
+                    return
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def _fill(self, batch: List[_Item]) -> Tuple[List[_Item], bool]:
+        """Add queued prompts to batch until it is full or max_wait has passed."""
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _dispatch(self, batch: List[_Item]) -> None:
+        try:
+            # Skip prompts whose caller has given up (e.g. a cancelled task)
+            live = [(prompt, future) for prompt, future in batch if future.set_running_or_notify_cancel()]
+            if not live:
+                return
+            try:
+                results = self.send_batch([prompt for prompt, _ in live])
+                if len(results) != len(live):
+                    raise ValueError(f"Batch returned {len(results)} results for {len(live)} prompts")
+            except BaseException as exc:
+                for _, future in live:
+                    future.set_exception(exc)
+                return
+            for (_, future), result in zip(live, results):
+                future.set_result(result)
+        finally:
+            self._slots.release()
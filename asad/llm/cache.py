@@ -0,0 +1,236 @@
+"""
+Persistent, content-addressed cache for LLM responses.
+
+Responses are stored in a SQLite database keyed by a hash of the provider,
+model and prompt, so identical prompts are answered locally on repeat runs.
+Lookups only read: the LRU timestamps of hits are written in batches, so a
+cache hit on the event loop never waits for a disk write.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from ..config import get_cache_config
+
+# Hits whose LRU timestamps are buffered before they are written in one transaction
+TOUCH_BATCH = 64
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL, size limits and LRU eviction."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 0,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str) -> str:
+        """Build the content address for a provider/model/prompt triple."""
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return f"{provider}:{model}:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response and refresh its LRU timestamp.
+
+        Expired entries are left for the next set() to evict, and the
+        timestamp is buffered until TOUCH_BATCH hits or the next set().
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response text, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH:
+                self._flush_touched()
+                self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, provider: str, model: str, response: str) -> None:
+        """Store a response and evict entries beyond the configured limits."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, provider, model, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, provider, model, response, len(response.encode("utf-8")), now, now),
+            )
+            self._touched.pop(key, None)
+            self._flush_touched()
+            self._evict(now)
+            self._conn.commit()
+
+    def _flush_touched(self) -> None:
+        """Write buffered LRU timestamps (caller holds the lock and commits)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones over the limits."""
+        if self.ttl:
+            self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+            )
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        """Remove every cached response and reset the counters."""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current cache occupancy."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": count,
+            "size_bytes": total,
+            "path": self.path,
+        }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # SQLite connections must not be shared with a forked child
+    global _cache, _cache_lock
+    _cache = None
+    _cache_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Return the process-wide response cache, creating it on first use.
+
+    Returns:
+        Shared ResponseCache, or None if caching is disabled
+    """
+    global _cache
+    config = get_cache_config()
+    if not config["enabled"]:
+        return None
+    with _cache_lock:
+        path = os.path.join(config["directory"], "responses.sqlite3")
+        if _cache is None or _cache.path != path:
+            _cache = ResponseCache(
+                path,
+                ttl=config["ttl"],
+                max_entries=config["max_entries"],
+                max_bytes=config["max_bytes"],
+            )
+        return _cache
+
+
+def stage_is_cacheable(stage: Optional[str]) -> bool:
+    """
+    Decide whether responses for a pipeline stage may be cached.
+
+    ASAD_CACHE_SKIP_STAGES always wins; if ASAD_CACHE_STAGES is set, only the
+    listed stages are cached.
+
+    Args:
+        stage: Pipeline stage name (e.g. "analysis", "validation")
+
+    Returns:
+        True if the stage should use the cache
+    """
+    config = get_cache_config()
+    name = (stage or "").lower()
+    if name in config["skip_stages"]:
+        return False
+    if config["stages"]:
+        return name in config["stages"]
+    return True
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Return statistics for the shared response cache (empty if disabled)."""
+    cache = get_response_cache()
+    return cache.stats() if cache else {}
@@ -2,33 +2,437 @@
 Unified interface for calling LLMs across different providers.
 """
 
-from typing import Optional
-from .providers import TogetherProvider, GroqProvider, OpenAIProvider
-from ..config import get_llm_provider
+import contextlib
+import contextvars
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
+from .cache import ResponseCache, get_response_cache, stage_is_cacheable
+from .registry import get_provider, get_provider_class
+from .scheduler import scheduled, scheduled_async, scheduled_stream, scheduled_stream_async
+from ..config import get_llm_provider, get_streaming_enabled
+from ..metrics import llm_call_metrics, record_cache_hit, record_parse_failure
+from ..parsing import safe_json_parse
+from ..parsing.stream import IncrementalJSONParser
 
+# Decides from the fields parsed so far whether the rest of a response is needed
+StopCondition = Callable[[Dict[str, Any]], bool]
 
-def call_llm(question: str, provider: Optional[str] = None) -> str:
+# Decides whether a response is usable, and so worth caching
+ResponseCheck = Callable[[str], bool]
+
+# Early-stopped JSON objects are cached under the prompt's key plus this suffix,
+# apart from full responses, and served only to calls whose stop_when accepts them
+PARTIAL_SUFFIX = ":partial"
+
+
+def is_json_response(response: str) -> bool:
+    """Whether a response contains a parseable JSON object (see safe_json_parse())."""
+    return safe_json_parse(response) is not None
+
+
+def _cacheable(response: str, accept: Optional[ResponseCheck]) -> bool:
+    return bool(response) and (accept is None or accept(response))
+
+
+_call_counter: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "asad_call_counter", default=None
+)
+
+
+@contextlib.contextmanager
+def count_llm_calls() -> Iterator[Dict[str, int]]:
+    """
+    Count LLM calls made in the current context (thread or task).
+
+    Yields:
+        Counter dict with "calls" (provider requests) and "cache_hits"
+    """
+    counter = {"calls": 0, "cache_hits": 0}
+    token = _call_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _call_counter.reset(token)
+
+
+class CallBudgetExceeded(ValueError):
+    """Raised when a limit_llm_calls() block has used up its provider requests."""
+
+
+_call_budget: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "asad_call_budget", default=None
+)
+
+
+@contextlib.contextmanager
+def limit_llm_calls(max_calls: int) -> Iterator[Dict[str, int]]:
+    """
+    Cap provider requests made in the current context and tasks spawned from it.
+
+    Cache hits are free. The request that would exceed the cap raises
+    CallBudgetExceeded instead of being sent.
+
+    Args:
+        max_calls: Provider requests allowed
+
+    Yields:
+        Budget dict with the "remaining" request count
+    """
+    budget = {"remaining": max_calls}
+    token = _call_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _call_budget.reset(token)
+
+
+def _record_call(cache_hit: bool) -> None:
+    if not cache_hit:
+        budget = _call_budget.get()
+        if budget is not None:
+            if budget["remaining"] <= 0:
+                raise CallBudgetExceeded("LLM call budget exhausted")
+            budget["remaining"] -= 1
+    counter = _call_counter.get()
+    if counter is not None:
+        counter["cache_hits" if cache_hit else "calls"] += 1
+
+
+def _resolve_cache(
+    question: str,
+    provider: str,
+    stage: Optional[str],
+    use_cache: Optional[bool],
+) -> Tuple[Optional[ResponseCache], Optional[str]]:
+    """Return the cache and key to use for this call, or (None, None)."""
+    if use_cache is None:
+        use_cache = stage_is_cacheable(stage)
+    cache = get_response_cache() if use_cache else None
+    if cache is None:
+        return None, None
+    model = get_provider_class(provider).model
+    return cache, cache.make_key(provider, model, question)
+
+
+def call_llm(
+    question: str,
+    provider: Optional[str] = None,
+    stage: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    accept: Optional[ResponseCheck] = None,
+) -> str:
     """
     Call an LLM with the given prompt using the configured provider.
-    
+
+    Identical prompts are served from the persistent response cache when it
+    is enabled for the calling stage. Requests are paced by the provider's
+    rate limiter, and rate-limited or transient failures are retried.
+
+    Args:
+        question: Prompt to send to the LLM
+        provider: Override active provider (together/groq/openai)
+        stage: Pipeline stage issuing the call (used for cache opt-in/out)
+        use_cache: Force the cache on or off for this call
+        accept: Only cache a response this check accepts (e.g. one that
+            parses); rejected responses are returned but not cached
+
+    Returns:
+        LLM response text
+    """
+    if provider is None:
+        provider = get_llm_provider()
+
+    cache, key = _resolve_cache(question, provider, stage, use_cache)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            _record_call(cache_hit=True)
+            record_cache_hit(provider, get_provider_class(provider).model, stage)
+            return cached
+
+    _record_call(cache_hit=False)
+    model = get_provider_class(provider).model
+    with llm_call_metrics(provider, model, stage):
+        response = scheduled(provider, question, stage, lambda: get_provider(provider).generate(question))
+
+    if cache is not None and _cacheable(response, accept):
+        cache.set(key, provider, get_provider_class(provider).model, response)
+    return response
+
+
+async def call_llm_async(
+    question: str,
+    provider: Optional[str] = None,
+    stage: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    accept: Optional[ResponseCheck] = None,
+) -> str:
+    """
+    Async variant of call_llm() backed by the provider's async SDK client.
+
     Args:
         question: Prompt to send to the LLM
         provider: Override active provider (together/groq/openai)
-    
+        stage: Pipeline stage issuing the call (used for cache opt-in/out)
+        use_cache: Force the cache on or off for this call
+        accept: Only cache a response this check accepts (e.g. one that
+            parses); rejected responses are returned but not cached
+
     Returns:
         LLM response text
     """
     if provider is None:
         provider = get_llm_provider()
-    
-    provider_map = {
-        "together": TogetherProvider,
-        "groq": GroqProvider,
-        "openai": OpenAIProvider,
-    }
-    
-    if provider not in provider_map:
-        raise ValueError(f"Unsupported provider: {provider}")
-    
-    client = provider_map[provider]()
-    return client.generate(question)
+
+    cache, key = _resolve_cache(question, provider, stage, use_cache)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            _record_call(cache_hit=True)
+            record_cache_hit(provider, get_provider_class(provider).model, stage)
+            return cached
+
+    _record_call(cache_hit=False)
+    model = get_provider_class(provider).model
+    with llm_call_metrics(provider, model, stage):
+        response = await scheduled_async(
+            provider, question, stage, lambda: get_provider(provider).generate_async(question)
+        )
+
+    if cache is not None and _cacheable(response, accept):
+        cache.set(key, provider, get_provider_class(provider).model, response)
+    return response
+
+
+def stream_llm(
+    question: str,
+    provider: Optional[str] = None,
+    stage: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    accept: Optional[ResponseCheck] = None,
+) -> Iterator[str]:
+    """
+    Stream an LLM response in chunks as it is generated.
+
+    A cached response is yielded as a single chunk. Complete responses are
+    cached; closing the generator early cancels the request and caches
+    nothing.
+
+    Args:
+        question: Prompt to send to the LLM
+        provider: Override active provider (together/groq/openai)
+        stage: Pipeline stage issuing the call (used for cache opt-in/out)
+        use_cache: Force the cache on or off for this call
+        accept: Only cache a complete response this check accepts
+
+    Yields:
+        Response text chunks
+    """
+    if provider is None:
+        provider = get_llm_provider()
+
+    cache, key = _resolve_cache(question, provider, stage, use_cache)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            _record_call(cache_hit=True)
+            record_cache_hit(provider, get_provider_class(provider).model, stage)
+            yield cached
+            return
+
+    _record_call(cache_hit=False)
+    chunks = []
+    with llm_call_metrics(provider, get_provider_class(provider).model, stage):
+        for chunk in scheduled_stream(provider, question, stage, lambda: get_provider(provider).stream(question)):
+            chunks.append(chunk)
+            yield chunk
+
+    response = "".join(chunks)
+    if cache is not None and _cacheable(response, accept):
+        cache.set(key, provider, get_provider_class(provider).model, response)
+
+
+async def stream_llm_async(
+    question: str,
+    provider: Optional[str] = None,
+    stage: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    accept: Optional[ResponseCheck] = None,
+) -> AsyncIterator[str]:
+    """Async variant of stream_llm()."""
+    if provider is None:
+        provider = get_llm_provider()
+
+    cache, key = _resolve_cache(question, provider, stage, use_cache)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            _record_call(cache_hit=True)
+            record_cache_hit(provider, get_provider_class(provider).model, stage)
+            yield cached
+            return
+
+    _record_call(cache_hit=False)
+    chunks = []
+    stream = scheduled_stream_async(
+        provider, question, stage, lambda: get_provider(provider).stream_async(question)
+    )
+    with llm_call_metrics(provider, get_provider_class(provider).model, stage):
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    response = "".join(chunks)
+    if cache is not None and _cacheable(response, accept):
+        cache.set(key, provider, get_provider_class(provider).model, response)
+
+
+def _parse_stream_result(
+    parser: IncrementalJSONParser,
+    stopped: bool,
+    fallback: Any,
+    stage: Optional[str],
+) -> Any:
+    if parser.malformed:
+        if stage is not None:
+            record_parse_failure(stage)
+        return fallback
+    if stopped or parser.done:
+        return dict(parser.fields)
+    # The stream ended without closing the object
+    return safe_json_parse(parser.text, fallback=fallback, stage=stage)
+
+
+def _feed(parser: IncrementalJSONParser, chunk: str, stop_when: Optional[StopCondition]) -> bool:
+    """Feed a chunk and report whether the stream should be cancelled."""
+    completed = parser.feed(chunk)
+    if parser.malformed:
+        return True
+    # A finished object is drained instead so the full response gets cached
+    return bool(completed and not parser.done and stop_when is not None and stop_when(parser.fields))
+
+
+def _cache_partial(
+    question: str,
+    provider: str,
+    stage: Optional[str],
+    use_cache: Optional[bool],
+    fields: Dict[str, Any],
+) -> None:
+    # An early-stopped response is cached as the object parsed so far; it
+    # already passed the caller's stop_when check, so it is a usable answer
+    # to calls that would stop there too, but not a full response
+    cache, key = _resolve_cache(question, provider, stage, use_cache)
+    if cache is not None and fields:
+        cache.set(key + PARTIAL_SUFFIX, provider, get_provider_class(provider).model, json.dumps(fields))
+
+
+def _cached_partial(
+    question: str,
+    provider: str,
+    stage: Optional[str],
+    use_cache: Optional[bool],
+    stop_when: Optional[StopCondition],
+) -> Optional[Dict[str, Any]]:
+    """A cached early-stopped object that stop_when accepts, if any."""
+    if stop_when is None:
+        return None
+    cache, key = _resolve_cache(question, provider, stage, use_cache)
+    cached = cache.get(key + PARTIAL_SUFFIX) if cache is not None else None
+    if cached is None:
+        return None
+    fields = json.loads(cached)
+    if not stop_when(fields):
+        return None
+    _record_call(cache_hit=True)
+    record_cache_hit(provider, get_provider_class(provider).model, stage)
+    return fields
+
+
+def call_llm_json(
+    question: str,
+    provider: Optional[str] = None,
+    stage: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    stop_when: Optional[StopCondition] = None,
+    fallback: Any = None,
+) -> Any:
+    """
+    Call an LLM that answers with a JSON object and parse the result.
+
+    With ASAD_STREAMING enabled the response is parsed incrementally: the
+    stream is cancelled as soon as stop_when() accepts the fields received
+    so far, or as soon as the response is clearly malformed. Otherwise this
+    is call_llm() followed by safe_json_parse().
+
+    Args:
+        question: Prompt to send to the LLM
+        provider: Override active provider (together/groq/openai)
+        stage: Pipeline stage issuing the call (used for cache opt-in/out)
+        use_cache: Force the cache on or off for this call
+        stop_when: Returns True once the parsed fields are sufficient
+        fallback: Value to return if the response cannot be parsed
+
+    Returns:
+        Parsed JSON object (possibly partial if stopped early) or fallback
+    """
+    if not get_streaming_enabled():
+        response = call_llm(question, provider, stage, use_cache, accept=is_json_response)
+        return safe_json_parse(response, fallback=fallback, stage=stage)
+    if provider is None:
+        provider = get_llm_provider()
+    partial = _cached_partial(question, provider, stage, use_cache, stop_when)
+    if partial is not None:
+        return partial
+
+    parser = IncrementalJSONParser()
+    stopped = False
+    stream = stream_llm(question, provider, stage, use_cache, accept=is_json_response)
+    try:
+        for chunk in stream:
+            if _feed(parser, chunk, stop_when):
+                stopped = not parser.malformed
+                break
+    finally:
+        stream.close()
+
+    if stopped:
+        _cache_partial(question, provider, stage, use_cache, parser.fields)
+    return _parse_stream_result(parser, stopped, fallback, stage)
+
+
+async def call_llm_json_async(
+    question: str,
+    provider: Optional[str] = None,
+    stage: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    stop_when: Optional[StopCondition] = None,
+    fallback: Any = None,
+) -> Any:
+    """Async variant of call_llm_json()."""
+    if not get_streaming_enabled():
+        response = await call_llm_async(question, provider, stage, use_cache, accept=is_json_response)
+        return safe_json_parse(response, fallback=fallback, stage=stage)
+    if provider is None:
+        provider = get_llm_provider()
+    partial = _cached_partial(question, provider, stage, use_cache, stop_when)
+    if partial is not None:
+        return partial
+
+    parser = IncrementalJSONParser()
+    stopped = False
+    stream = stream_llm_async(question, provider, stage, use_cache, accept=is_json_response)
+    try:
+        async for chunk in stream:
+            if _feed(parser, chunk, stop_when):
+                stopped = not parser.malformed
+                break
+    finally:
+        await stream.aclose()
+
+    if stopped:
+        _cache_partial(question, provider, stage, use_cache, parser.fields)
+    return _parse_stream_result(parser, stopped, fallback, stage)
@@ -0,0 +1,328 @@
+"""
+Multi-provider routing with failover, hedged requests and circuit breakers.
+
+LLM_PROVIDER=multi sends each request down ASAD_PROVIDER_CHAIN in order.
+A provider that fails is skipped for the next one in the chain. A provider
+that is slower than its usual latency percentile gets a hedged request to
+the next provider, and the first answer wins. Each provider has a circuit
+breaker that takes it out of rotation while its recent error rate or
+latency is too high.
+
+Every call to a chain member goes through the scheduler under the member's
+own name, so each provider's rate limits, priority lanes, retries and 429
+pauses apply as they would with LLM_PROVIDER set to that provider. Member
+calls take the stage of the request being routed.
+"""
+
+import asyncio
+import collections
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from .providers import LLMProvider
+from .scheduler import current_stage, scheduled_async, scheduled_stream, scheduled_stream_async
+from ..config import get_provider_chain_config
+from ..metrics import record_retry
+from ..runtime import run_sync
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+    return ordered[index]
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker for one provider.
+
+    closed: requests flow. open: the provider is skipped for the cooldown.
+    half_open: one trial request decides whether to close or re-open.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_requests: int = 5,
+        error_rate: float = 0.5,
+        latency: float = 0.0,
+        cooldown: float = 30.0,
+    ):
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.latency = latency
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.requests = 0
+        self.errors = 0
+        self._outcomes: collections.deque = collections.deque(maxlen=window)
+        self._opened_at = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (claims the trial slot when half-open)."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._trial:
+                    return False
+                self._trial = True
+            return self.state != "open"
+
+    def record(self, ok: bool, latency: float) -> None:
+        """Record the outcome of a request and update the state."""
+        with self._lock:
+            self.requests += 1
+            self.errors += not ok
+            self._outcomes.append((ok, latency))
+            if self.state == "half_open":
+                self._trial = False
+                if ok:
+                    self.state = "closed"
+                    self._outcomes.clear()
+                    self._outcomes.append((ok, latency))
+                else:
+                    self._open()
+            elif self.state == "closed" and self._tripped():
+                self._open()
+
+    def abandon(self) -> None:
+        """Release the trial slot of a request that was cancelled before it finished."""
+        with self._lock:
+            self._trial = False
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Latency percentile of recent successful requests, None until min_requests are known."""
+        with self._lock:
+            latencies = [latency for ok, latency in self._outcomes if ok]
+        if len(latencies) < self.min_requests:
+            return None
+        return _percentile(latencies, percentile)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state and recent health statistics."""
+        with self._lock:
+            outcomes = list(self._outcomes)
+            state, requests, errors = self.state, self.requests, self.errors
+        latencies = [latency for ok, latency in outcomes if ok]
+        return {
+            "state": state,
+            "requests": requests,
+            "errors": errors,
+            "window_error_rate": sum(not ok for ok, _ in outcomes) / len(outcomes) if outcomes else 0.0,
+            "p50": _percentile(latencies, 50) if latencies else None,
+            "p95": _percentile(latencies, 95) if latencies else None,
+        }
+
+    def _tripped(self) -> bool:
+        if len(self._outcomes) < self.min_requests:
+            return False
+        failures = sum(not ok for ok, _ in self._outcomes)
+        if failures / len(self._outcomes) >= self.error_rate:
+            return True
+        latencies = [latency for ok, latency in self._outcomes if ok]
+        return bool(self.latency and latencies and _percentile(latencies, 50) >= self.latency)
+
+    def _open(self) -> None:
+        self.state = "open"
+        self._opened_at = time.monotonic()
+
+
+class _ChainModel:
+    """Class attribute naming every provider and model in the chain."""
+
+    def __get__(self, instance: Any, owner: type) -> str:
+        from .registry import get_provider_class
+
+        chain = get_provider_chain_config()["chain"]
+        return ",".join(f"{name}:{get_provider_class(name).model}" for name in chain)
+
+
+class MultiProvider(LLMProvider):
+    """Route requests across ASAD_PROVIDER_CHAIN with failover and hedging."""
+
+    model = _ChainModel()
+    routes = True
+
+    def __init__(self):
+        super().__init__()
+        config = get_provider_chain_config()
+        self.config = config
+        self.chain = config["chain"]
+        self.breakers = {
+            name: CircuitBreaker(
+                window=config["breaker_window"],
+                min_requests=config["breaker_min_requests"],
+                error_rate=config["breaker_error_rate"],
+                latency=config["breaker_latency"],
+                cooldown=config["breaker_cooldown"],
+            )
+            for name in self.chain
+        }
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider breaker state, request and error counts and latency percentiles."""
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
+
+    def _next(self, tried: List[str]) -> Optional[str]:
+        """Next provider in the chain whose breaker admits a request."""
+        for name in self.chain:
+            if name not in tried and self.breakers[name].allow():
+                return name
+        # Every breaker is open: trying the first provider beats failing outright
+        return None if tried else self.chain[0]
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        percentile = self.config["hedge_percentile"]
+        if not percentile:
+            return None
+        estimate = self.breakers[name].latency_percentile(percentile)
+        return self.config["hedge_delay"] if estimate is None else estimate
+
+    def generate(self, prompt: str) -> str:
+        return run_sync(self.generate_async(prompt))
+
+    async def generate_async(self, prompt: str) -> str:
+        from .registry import get_provider
+
+        stage = current_stage()
+        tried: List[str] = []
+        pending: Dict[asyncio.Future, Any] = {}
+        hedging = True
+        last_error: Optional[BaseException] = None
+
+        def launch(name: str) -> None:
+            tried.append(name)
+            provider = get_provider(name)
+            task = asyncio.ensure_future(
+                scheduled_async(name, prompt, stage, lambda: provider.generate_async(prompt))
+            )
+            pending[task] = (name, time.perf_counter())
+
+        launch(self._next(tried))
+        try:
+            while pending:
+                timeout = None
+                if hedging and len(pending) == 1:
+                    (name, started), = pending.values()
+                    delay = self._hedge_delay(name)
+                    if delay is not None:
+                        timeout = max(0.0, started + delay - time.perf_counter())
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    name = self._next(tried)
+                    hedging = name is not None
+                    if name is not None:
+                        record_retry("llm", "hedge")
+                        launch(name)
+                    continue
+
+                for task in done:
+                    name, started = pending.pop(task)
+                    elapsed = time.perf_counter() - started
+                    if task.exception() is None:
+                        self.breakers[name].record(True, elapsed)
+                        return task.result()
+                    self.breakers[name].record(False, elapsed)
+                    last_error = task.exception()
+
+                if not pending:
+                    name = self._next(tried)
+                    if name is not None:
+                        record_retry("llm", "failover")
+                        launch(name)
+            raise last_error
+        finally:
+            # Cancel the hedged request that lost (or everything, if we were cancelled)
+            for task, (name, _) in pending.items():
+                task.cancel()
+                self.breakers[name].abandon()
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Stream from the first healthy provider, failing over until a chunk arrives (no hedging)."""
+        # Read the stage now: the generator body runs outside the scheduler's call
+        return self._stream(prompt, current_stage())
+
+    def _stream(self, prompt: str, stage: Optional[str]) -> Iterator[str]:
+        from .registry import get_provider
+
+        tried: List[str] = []
+        last_error: Optional[BaseException] = None
+        while True:
+            name = self._next(tried)
+            if name is None:
+                raise last_error
+            tried.append(name)
+            started, received = time.perf_counter(), False
+            provider = get_provider(name)
+            stream = scheduled_stream(name, prompt, stage, lambda: provider.stream(prompt))
+            try:
+                for chunk in stream:
+                    received = True
+                    yield chunk
+            except Exception as exc:
+                self.breakers[name].record(False, time.perf_counter() - started)
+                if received:
+                    raise
+                last_error = exc
+                record_retry("llm", "failover")
+                continue
+            except BaseException:
+                self.breakers[name].abandon()
+                raise
+            finally:
+                stream.close()
+            self.breakers[name].record(True, time.perf_counter() - started)
+            return
+
+    def stream_async(self, prompt: str) -> AsyncIterator[str]:
+        return self._stream_async(prompt, current_stage())
+
+    async def _stream_async(self, prompt: str, stage: Optional[str]) -> AsyncIterator[str]:
+        from .registry import get_provider
+
+        tried: List[str] = []
+        last_error: Optional[BaseException] = None
+        while True:
+            name = self._next(tried)
+            if name is None:
+                raise last_error
+            tried.append(name)
+            started, received = time.perf_counter(), False
+            provider = get_provider(name)
+            stream = scheduled_stream_async(name, prompt, stage, lambda: provider.stream_async(prompt))
+            try:
+                async for chunk in stream:
+                    received = True
+                    yield chunk
+            except Exception as exc:
+                self.breakers[name].record(False, time.perf_counter() - started)
+                if received:
+                    raise
+                last_error = exc
+                record_retry("llm", "failover")
+                continue
+            except BaseException:
+                self.breakers[name].abandon()
+                raise
+            finally:
+                await stream.aclose()
+            self.breakers[name].record(True, time.perf_counter() - started)
+            return
+
+
+def provider_health() -> Dict[str, Dict[str, Any]]:
+    """
+    Health and latency statistics of each provider behind LLM_PROVIDER=multi.
+
+    Returns:
+        Mapping of provider name to state ("closed"/"open"/"half_open"),
+        requests, errors, window_error_rate and p50/p95 latency in seconds
+    """
+    from .registry import get_provider
+
+    return get_provider("multi").health()
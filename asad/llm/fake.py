@@ -0,0 +1,271 @@
+"""
+Offline LLM provider serving scripted or recorded responses.
+
+Selected with LLM_PROVIDER=fake, it answers every pipeline prompt without
+network access, with a configurable latency and jitter, so the pipeline's
+own overhead and strategies can be benchmarked reproducibly. Slow tail
+responses and failures can be injected to exercise failover.
+
+Recorded responses are replayed from a response cache database written by a
+live run (ASAD_CACHE_DIR/responses.sqlite3). Prompts missing from the
+recording, or every prompt when no recording is configured, are answered by
+the script: an ordered list of (marker, reply) rules matched against the
+prompt text.
+"""
+
+import ast
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .cache import ResponseCache
+from .providers import LLMProvider
+from ..config import get_fake_provider_config
+from ..metrics import record_usage
+from ..routing import route_complexity
+
+# Rough characters-per-token ratio used to report usage
+CHARS_PER_TOKEN = 4
+
+# Characters per streamed chunk
+STREAM_CHUNK_CHARS = 24
+
+# Appended by scripted repairs; the scripted validator counts them
+FIX_MARKER = "# asad-fake: fixed"
+
+Script = List[Tuple[str, Callable[[str], str]]]
+
+_SECTION_ENDS = (
+    "\n\nInstructions:",
+    "\n    Summary of issues:",
+    "\n    Feedback:",
+    "\n\n    Read-only context from other modules",
+)
+_SLICE_CONTEXT = "\n\n    Read-only context from the rest of the module:"
+
+
+def prompt_code(prompt: str, label: str) -> str:
+    """Extract the code embedded in a prompt after label (e.g. "Buggy code: ")."""
+    start = prompt.find(label)
+    if start < 0:
+        return ""
+    text = prompt[start + len(label):]
+    if text.startswith("excerpt of a larger module"):
+        # Sliced prompt: the editable regions sit between the note and the context
+        text = text[text.find(":\n") + 2:]
+        return text[:text.find(_SLICE_CONTEXT)] if _SLICE_CONTEXT in text else text
+    ends = [text.find(end) for end in _SECTION_ENDS if end in text]
+    return text[:min(ends)] if ends else text
+
+
+def _located_bugs(code: str) -> List[Dict[str, str]]:
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as exc:
+        return [{"type": "syntax error", "location": f"line {exc.lineno}", "explanation": str(exc.msg)}]
+    names = [
+        node.name for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    ]
+    return [
+        {"type": "logic error", "location": name, "explanation": "Scripted bug"}
+        for name in names[:3]
+    ] or [{"type": "logic error", "location": "module", "explanation": "Scripted bug"}]
+
+
+def _analysis_reply(prompt: str) -> str:
+    code = prompt_code(prompt, "Buggy code: ")
+    return json.dumps({
+        "complexity": route_complexity(code)["complexity"],
+        "bugs": _located_bugs(code),
+        "plan": "Fix each located bug in place",
+    })
+
+
+def _management_reply(prompt: str) -> str:
+    text = prompt[prompt.find("Located bugs: ") + len("Located bugs: "):]
+    try:
+        bugs = ast.literal_eval(text[:text.find("\n    Repair instructions:")].strip())
+    except (ValueError, SyntaxError):
+        bugs = []
+    agents = []
+    for index, bug in enumerate(bugs[:3] or [{}]):
+        location = bug.get("location", "module") if isinstance(bug, dict) else "module"
+        agents.append({
+            "name": f"Agent_{index + 1}",
+            "role": "Repair Specialist",
+            "task_description": f"Your task is to fix the bug in {location}.",
+            "targets": [location],
+            "depends_on": [],
+        })
+    return json.dumps({"agents": agents, "execution_order": [a["name"] for a in agents]})
+
+
+def _repair_reply(prompt: str) -> str:
+    code = prompt_code(prompt, "Buggy code: ").rstrip("\n")
+    if "<<<<<<< SEARCH" in prompt:
+        tail = "\n".join([line for line in code.splitlines() if line.strip()][-3:])
+        return "\n".join([
+            "EXPLANATION: Scripted fix",
+            "<<<<<<< SEARCH",
+            tail,
+            "=======",
+            tail,
+            FIX_MARKER,
+            ">>>>>>> REPLACE",
+        ])
+    return json.dumps({"fixed_code": f"{code}\n{FIX_MARKER}\n", "fix_explanation": "Scripted fix"})
+
+
+def _fused_reply(prompt: str, fixes: int) -> str:
+    code = prompt_code(prompt, "Buggy code: ").rstrip("\n")
+    complexity = route_complexity(code)["complexity"]
+    return json.dumps({
+        "complexity": complexity,
+        "bugs": _located_bugs(code),
+        "plan": "Fix each located bug in place",
+        "fixed_code": f"{code}\n{FIX_MARKER}\n" if complexity == "SIMPLE" else "",
+        "fix_explanation": "Scripted fix",
+        "self_check": "FIXED" if complexity == "SIMPLE" and code.count(FIX_MARKER) + 1 >= fixes else "NOT FIXED",
+    })
+
+
+def _review_reply(prompt: str) -> str:
+    return json.dumps({"decision": "APPROVE", "feedback": ""})
+
+
+def _validation_reply(prompt: str, fixes: int) -> str:
+    code = prompt_code(prompt, "Code to validate: ")
+    if code.count(FIX_MARKER) >= fixes:
+        return json.dumps({"status": "FIXED", "summary": "Scripted validation passed", "remaining_bugs": []})
+    return json.dumps({
+        "status": "NOT FIXED",
+        "summary": "Scripted validation failed",
+        "remaining_bugs": _located_bugs(code)[:1],
+    })
+
+
+def default_script(fixes: int = 1) -> Script:
+    """
+    Build the script that answers every pipeline prompt with valid output.
+
+    Analysis locates one bug per top-level definition, repairs echo the code
+    back with FIX_MARKER appended, reviews approve, and validation reports
+    FIXED once the code carries fixes markers. Fused calls repair SIMPLE
+    code and self-check against the same rule.
+
+    Args:
+        fixes: Repair responses needed before validation passes
+    """
+    return [
+        ("reviewing the output", _review_reply),
+        ("final validation", lambda prompt: _validation_reply(prompt, fixes)),
+        ("specialized agent profiles", _management_reply),
+        ("Single-Pass Repair Agent", lambda prompt: _fused_reply(prompt, fixes)),
+        ("Main Analysis Agent", _analysis_reply),
+        ("Buggy code:", _repair_reply),
+    ]
+
+
+class FakeProvider(LLMProvider):
+    """
+    Offline provider with configurable latency and faults (LLM_PROVIDER=fake).
+
+    Keyword overrides replace the ASAD_FAKE_* settings of the same name, so
+    subclasses registered under other names can behave differently.
+    """
+
+    model = "fake-model"
+
+    def __init__(self, script: Optional[Script] = None, **overrides: Any):
+        super().__init__()
+        config = {**get_fake_provider_config(), **overrides}
+        self.latency = config["latency"]
+        self.jitter = config["jitter"]
+        self.slow_rate = config["slow_rate"]
+        self.slow_latency = config["slow_latency"]
+        self.failure_rate = config["failure_rate"]
+        self.token_latency = config["token_latency"]
+        self.script = script if script is not None else default_script(config["fixes"])
+        self._random = random.Random(config["seed"])
+        self._random_lock = threading.Lock()
+        self.recording = None
+        if config["recording"]:
+            from .registry import get_provider_class
+
+            recorded = config["recorded_provider"]
+            self.recording = ResponseCache(config["recording"])
+            self._recorded_key = lambda prompt: ResponseCache.make_key(
+                recorded, get_provider_class(recorded).model, prompt
+            )
+
+    def respond(self, prompt: str) -> str:
+        """Return the recorded or scripted response for a prompt."""
+        if self.recording is not None:
+            recorded = self.recording.get(self._recorded_key(prompt))
+            if recorded is not None:
+                return recorded
+        for marker, reply in self.script:
+            if marker in prompt:
+                return reply(prompt)
+        return "{}"
+
+    def delay(self, prompt: str = "") -> float:
+        """Draw the simulated latency of one response to prompt."""
+        prefill = self.token_latency * len(prompt) / CHARS_PER_TOKEN / 1000
+        if not self.jitter and not self.slow_rate:
+            return self.latency + prefill
+        with self._random_lock:
+            if self.slow_rate and self._random.random() < self.slow_rate:
+                return self.slow_latency + prefill
+            offset = self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, self.latency + offset) + prefill
+
+    def _fails(self) -> bool:
+        if not self.failure_rate:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.failure_rate
+
+    def _answer(self, prompt: str) -> str:
+        if self._fails():
+            raise ConnectionError(f"Injected failure from {type(self).__name__}")
+        response = self.respond(prompt)
+        record_usage(
+            math.ceil(len(prompt) / CHARS_PER_TOKEN),
+            math.ceil(len(response) / CHARS_PER_TOKEN),
+        )
+        return response
+
+    def generate(self, prompt: str) -> str:
+        time.sleep(self.delay(prompt))
+        return self._answer(prompt)
+
+    async def generate_async(self, prompt: str) -> str:
+        await asyncio.sleep(self.delay(prompt))
+        return self._answer(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        response = self._answer(prompt)
+        chunks = _chunks(response)
+        # Spread the latency evenly over the chunks
+        pause = self.delay(prompt) / len(chunks)
+        for chunk in chunks:
+            time.sleep(pause)
+            yield chunk
+
+    async def stream_async(self, prompt: str) -> AsyncIterator[str]:
+        response = self._answer(prompt)
+        chunks = _chunks(response)
+        pause = self.delay(prompt) / len(chunks)
+        for chunk in chunks:
+            await asyncio.sleep(pause)
+            yield chunk
+
+
+def _chunks(text: str) -> List[str]:
+    return [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
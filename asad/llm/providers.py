@@ -1,71 +1,415 @@
 """
 Provider-specific LLM client implementations.
+
+SDKs (and httpx) are imported when a provider is first instantiated, so
+importing asad only pays for the provider actually used.
 """
 
+import asyncio
 import os
+import threading
+import weakref
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, Tuple
+
+from .batching import MicroBatcher
+from ..config import get_api_key, get_http_config, get_selfhosted_config
+from ..metrics import record_usage
+
+if TYPE_CHECKING:
+    import httpx
+    from groq import AsyncGroq
+    from openai import AsyncOpenAI
+    from together import AsyncTogether
+
+
+def _http_limits(config: Dict[str, Any]) -> "httpx.Limits":
+    import httpx
+
+    return httpx.Limits(
+        max_connections=config["max_connections"],
+        max_keepalive_connections=config["max_keepalive_connections"],
+        keepalive_expiry=config["keepalive_expiry"],
+    )
+
+
+def build_http_client() -> "httpx.Client":
+    """Create a pooled keep-alive HTTP client using the configured limits."""
+    import httpx
+
+    config = get_http_config()
+    return httpx.Client(limits=_http_limits(config), timeout=config["timeout"])
+
+
+def _report_usage(usage: Any) -> None:
+    """Forward token counts from a chat completions or Responses API usage object."""
+    if usage is None:
+        return
+    record_usage(
+        getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", None),
+        getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", None),
+    )
+
+
+def _chunk_usage(chunk: Any) -> Any:
+    # Groq reports streamed usage under x_groq on the final chunk
+    return getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None)
+
 
-from together import Together
-from groq import Groq
-from openai import OpenAI
+def _chat_deltas(stream: Any) -> Iterator[str]:
+    """Yield content deltas from a chat completions stream, closing it when done."""
+    try:
+        for chunk in stream:
+            _report_usage(_chunk_usage(chunk))
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        stream.close()
 
-from ..config import get_api_key
+
+def build_async_http_client() -> "httpx.AsyncClient":
+    """Create a pooled keep-alive async HTTP client using the configured limits."""
+    import httpx
+
+    config = get_http_config()
+    return httpx.AsyncClient(limits=_http_limits(config), timeout=config["timeout"])
 
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
-    
+
+    model: str = ""
+
+    # Routing providers send each request to other providers, which pace and retry it
+    routes: bool = False
+
+    def __init__(self):
+        # Async SDK clients are bound to the event loop that created them
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._async_lock = threading.Lock()
+
     @abstractmethod
     def generate(self, prompt: str) -> str:
         """Generate text from the given prompt."""
         pass
 
+    async def generate_async(self, prompt: str) -> str:
+        """
+        Generate text without blocking the event loop.
+
+        Providers without a native async client run generate() in a thread.
+        """
+        return await asyncio.to_thread(self.generate, prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Yield the response text in chunks as it is generated.
+
+        Closing the generator early cancels the request. Providers without
+        native streaming yield the whole response as one chunk.
+        """
+        yield self.generate(prompt)
+
+    async def stream_async(self, prompt: str) -> AsyncIterator[str]:
+        """Async variant of stream()."""
+        yield await self.generate_async(prompt)
+
+    def create_async_client(self) -> Any:
+        """Build the provider's async SDK client for the running event loop."""
+        raise NotImplementedError
+
+    def async_client(self) -> Any:
+        """Return the async SDK client owned by the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self.create_async_client()
+                self._async_clients[loop] = client
+            return client
+
+    def close(self) -> None:
+        """Release the provider's HTTP connections."""
+        client = getattr(self, "client", None)
+        if client is not None and hasattr(client, "close"):
+            client.close()
+
 
 class TogetherProvider(LLMProvider):
     """Together.ai API client."""
-    
+
+    model = "meta-llama/Llama-3.3-70B-Instruct-Turbo"
+
     def __init__(self):
-        api_key = get_api_key("together")
-        self.client = Together(api_key=api_key)
-        self.model = "meta-llama/Llama-3.3-70B-Instruct-Turbo"
-    
+        from together import Together
+
+        super().__init__()
+        self.api_key = get_api_key("together")
+        self.client = Together(api_key=self.api_key, max_retries=0, http_client=build_http_client())
+
+    def create_async_client(self) -> "AsyncTogether":
+        from together import AsyncTogether
+
+        return AsyncTogether(api_key=self.api_key, max_retries=0, http_client=build_async_http_client())
+
     def generate(self, prompt: str) -> str:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}]
         )
+        _report_usage(response.usage)
         return response.choices[0].message.content
 
+    async def generate_async(self, prompt: str) -> str:
+        response = await self.async_client().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        _report_usage(response.usage)
+        return response.choices[0].message.content
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        yield from _chat_deltas(self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        ))
+
+    async def stream_async(self, prompt: str) -> AsyncIterator[str]:
+        stream = await self.async_client().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        )
+        try:
+            async for chunk in stream:
+                _report_usage(_chunk_usage(chunk))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
 
 class GroqProvider(LLMProvider):
     """Groq API client."""
-    
+
+    model = "groq/compound-mini"
+
     def __init__(self):
-        api_key = get_api_key("groq")
-        self.client = Groq(api_key=api_key)
-        self.model = "groq/compound-mini"  
-    
+        from groq import Groq
+
+        super().__init__()
+        self.api_key = get_api_key("groq")
+        self.client = Groq(api_key=self.api_key, max_retries=0, http_client=build_http_client())
+
+    def create_async_client(self) -> "AsyncGroq":
+        from groq import AsyncGroq
+
+        return AsyncGroq(api_key=self.api_key, max_retries=0, http_client=build_async_http_client())
+
     def generate(self, prompt: str) -> str:
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[{"role": "user", "content": prompt}]
         )
+        _report_usage(response.usage)
         return response.choices[0].message.content
 
+    async def generate_async(self, prompt: str) -> str:
+        response = await self.async_client().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        _report_usage(response.usage)
+        return response.choices[0].message.content
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        yield from _chat_deltas(self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        ))
+
+    async def stream_async(self, prompt: str) -> AsyncIterator[str]:
+        stream = await self.async_client().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        )
+        try:
+            async for chunk in stream:
+                _report_usage(_chunk_usage(chunk))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI API client."""
-    
+
+    model = "gpt-4o"
+
     def __init__(self):
-        api_key = get_api_key("openai")
-        self.client = OpenAI(api_key=api_key)
-        self.model = "gpt-4o"  
-    
+        from openai import OpenAI
+
+        super().__init__()
+        self.api_key = get_api_key("openai")
+        self.client = OpenAI(api_key=self.api_key, max_retries=0, http_client=build_http_client())
+
+    def create_async_client(self) -> "AsyncOpenAI":
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(api_key=self.api_key, max_retries=0, http_client=build_async_http_client())
+
     def generate(self, prompt: str) -> str:
-        response = self.client.chat.responses.create(
+        response = self.client.responses.create(
             model=self.model,
             input=prompt,
             reasoning={ "effort": "low" },
             text={ "verbosity": "low" },
         )
+        _report_usage(response.usage)
         return response.output_text
+
+    async def generate_async(self, prompt: str) -> str:
+        response = await self.async_client().responses.create(
+            model=self.model,
+            input=prompt,
+            reasoning={ "effort": "low" },
+            text={ "verbosity": "low" },
+        )
+        _report_usage(response.usage)
+        return response.output_text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        stream = self.client.responses.create(
+            model=self.model,
+            input=prompt,
+            reasoning={ "effort": "low" },
+            text={ "verbosity": "low" },
+            stream=True,
+        )
+        try:
+            for event in stream:
+                if event.type == "response.output_text.delta":
+                    yield event.delta
+                elif event.type == "response.completed":
+                    _report_usage(event.response.usage)
+        finally:
+            stream.close()
+
+    async def stream_async(self, prompt: str) -> AsyncIterator[str]:
+        stream = await self.async_client().responses.create(
+            model=self.model,
+            input=prompt,
+            reasoning={ "effort": "low" },
+            text={ "verbosity": "low" },
+            stream=True,
+        )
+        try:
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    yield event.delta
+                elif event.type == "response.completed":
+                    _report_usage(event.response.usage)
+        finally:
+            await stream.close()
+
+
+class _ConfiguredModel:
+    """Class attribute resolving to ASAD_SELFHOSTED_MODEL when read."""
+
+    def __get__(self, instance: Any, owner: type) -> str:
+        return get_selfhosted_config()["model"]
+
+
+def _apportion(total: int, weights: List[int]) -> List[int]:
+    """Split a batch-wide token count across prompts in proportion to weights."""
+    if not sum(weights):
+        weights = [1] * len(weights)
+    shares = [total * weight // sum(weights) for weight in weights]
+    shares[-1] += total - sum(shares)
+    return shares
+
+
+class SelfHostedProvider(LLMProvider):
+    """
+    OpenAI-compatible self-hosted server (vLLM, llama.cpp server, ...).
+
+    Requests go through a MicroBatcher that caps the number in flight. They
+    go to /chat/completions unless ASAD_SELFHOSTED_API=completions selects raw
+    /completions, which skips the chat template. With
+    ASAD_SELFHOSTED_BATCH_SIZE above 1 (completions only), prompts submitted
+    concurrently are sent together as one request with a list of prompts,
+    which keeps the server's batch full.
+    """
+
+    model = _ConfiguredModel()
+
+    def __init__(self):
+        super().__init__()
+        config = get_selfhosted_config()
+        if not config["base_url"] or not config["model"]:
+            raise ValueError(
+                "ASAD_SELFHOSTED_BASE_URL and ASAD_SELFHOSTED_MODEL must be set "
+                "to use the selfhosted provider"
+            )
+        from openai import OpenAI
+
+        self.config = config
+        self.client = OpenAI(
+            base_url=config["base_url"],
+            api_key=config["api_key"],
+            timeout=config["timeout"],
+            max_retries=0,
+            http_client=build_http_client(),
+        )
+        self.batcher = MicroBatcher(
+            self._send_batch,
+            max_batch_size=config["batch_size"],
+            max_wait=config["batch_wait"] if config["batch_size"] > 1 else 0.0,
+            max_in_flight=config["concurrency"],
+        )
+
+    def _send_batch(self, prompts: List[str]) -> List[Tuple[str, int, int]]:
+        """Send prompts in one request; return (text, prompt_tokens, completion_tokens) per prompt."""
+        if self.config["api"] == "chat":
+            response = self.client.chat.completions.create(
+                model=self.config["model"],
+                messages=[{"role": "user", "content": prompts[0]}],
+                max_tokens=self.config["max_tokens"],
+            )
+            usage = response.usage
+            return [(
+                response.choices[0].message.content or "",
+                getattr(usage, "prompt_tokens", 0) or 0,
+                getattr(usage, "completion_tokens", 0) or 0,
+            )]
+
+        response = self.client.completions.create(
+            model=self.config["model"],
+            prompt=prompts,
+            max_tokens=self.config["max_tokens"],
+        )
+        texts = [""] * len(prompts)
+        for choice in response.choices:
+            texts[choice.index] = choice.text or ""
+        usage = response.usage
+        prompt_tokens = _apportion(getattr(usage, "prompt_tokens", 0) or 0, [len(p) for p in prompts])
+        completion_tokens = _apportion(getattr(usage, "completion_tokens", 0) or 0, [len(t) for t in texts])
+        return list(zip(texts, prompt_tokens, completion_tokens))
+
+    def generate(self, prompt: str) -> str:
+        text, prompt_tokens, completion_tokens = self.batcher.submit(prompt).result()
+        record_usage(prompt_tokens, completion_tokens)
+        return text
+
+    async def generate_async(self, prompt: str) -> str:
+        text, prompt_tokens, completion_tokens = await asyncio.wrap_future(self.batcher.submit(prompt))
+        record_usage(prompt_tokens, completion_tokens)
+        return text
+
+    def close(self) -> None:
+        self.batcher.close()
+        super().close()
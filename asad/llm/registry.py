@@ -0,0 +1,107 @@
+"""
+Thread-safe registry of long-lived provider instances.
+
+Creating a provider reads the API key and builds an SDK client with its own
+HTTP connection pool, so providers are created once per process and reused
+by every call instead of being rebuilt per request.
+"""
+
+import os
+import threading
+from typing import Dict, Type
+
+from .failover import MultiProvider
+from .fake import FakeProvider
+from .providers import (
+    LLMProvider,
+    TogetherProvider,
+    GroqProvider,
+    OpenAIProvider,
+    SelfHostedProvider,
+)
+
+
+PROVIDER_CLASSES: Dict[str, Type[LLMProvider]] = {
+    "together": TogetherProvider,
+    "groq": GroqProvider,
+    "openai": OpenAIProvider,
+    "selfhosted": SelfHostedProvider,
+    "multi": MultiProvider,
+    "fake": FakeProvider,
+}
+
+_instances: Dict[str, LLMProvider] = {}
+_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # Pooled sockets inherited from the parent must not be reused by a child
+    global _lock
+    _instances.clear()
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_provider_class(name: str) -> Type[LLMProvider]:
+    """
+    Look up the provider class registered under a name.
+
+    Args:
+        name: Provider name (together/groq/openai/selfhosted/multi/fake)
+
+    Returns:
+        Provider class
+    """
+    if name not in PROVIDER_CLASSES:
+        raise ValueError(f"Unsupported provider: {name}")
+    return PROVIDER_CLASSES[name]
+
+
+def get_provider(name: str) -> LLMProvider:
+    """
+    Return the shared provider instance for a name, creating it on first use.
+
+    Args:
+        name: Provider name (together/groq/openai/selfhosted/multi/fake)
+
+    Returns:
+        Long-lived provider instance
+    """
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+
+    provider_cls = get_provider_class(name)
+    with _lock:
+        instance = _instances.get(name)
+        if instance is None:
+            instance = provider_cls()
+            _instances[name] = instance
+        return instance
+
+
+def register_provider(name: str, provider_cls: Type[LLMProvider]) -> None:
+    """
+    Register an additional provider class, replacing any previous instance.
+
+    Args:
+        name: Provider name used in LLM_PROVIDER / call_llm(provider=...)
+        provider_cls: LLMProvider subclass
+    """
+    with _lock:
+        PROVIDER_CLASSES[name] = provider_cls
+        previous = _instances.pop(name, None)
+    if previous is not None:
+        previous.close()
+
+
+def reset_providers() -> None:
+    """Close and forget every shared provider instance."""
+    with _lock:
+        instances = list(_instances.values())
+        _instances.clear()
+    for instance in instances:
+        instance.close()
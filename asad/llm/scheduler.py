@@ -0,0 +1,406 @@
+"""
+Rate-limit-aware request scheduling shared by all LLM calls.
+
+Each provider with ASAD_<PROVIDER>_RPM or _TPM set gets a RateLimiter:
+request and token buckets, plus a priority queue, so requests go out at the
+provider's quota instead of bursting into 429s, and validation and review
+calls are admitted ahead of agent calls. Rate-limited and transient
+failures are retried with exponential backoff and full jitter, honouring
+Retry-After; a 429 pauses the whole provider, so queued requests do not
+turn into a retry storm.
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
+import email.utils
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from ..config import get_rate_limit_config
+from ..metrics import record_queue_wait, record_retry
+
+T = TypeVar("T")
+
+# Lower is admitted first; unlisted stages (agent execution, simple fixes) use DEFAULT_PRIORITY
+STAGE_PRIORITY = {
+    "validation": 0,
+    "review": 0,
+    "analysis": 1,
+    "fused": 1,
+    "reanalysis": 1,
+    "management": 1,
+}
+DEFAULT_PRIORITY = 2
+
+# Seconds of waiting that raise a queued request by one priority level
+AGING_SECONDS = 10.0
+
+# Rough characters-per-token ratio used to estimate prompt tokens
+CHARS_PER_TOKEN = 4
+
+_RETRYABLE_STATUS = {408, 409, 429}
+
+# Stage of the request being sent, for routing providers that schedule their members' calls
+_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("asad_llm_stage", default=None)
+
+
+def current_stage() -> Optional[str]:
+    """Pipeline stage of the request the calling provider is sending."""
+    return _stage.get()
+
+
+@contextlib.contextmanager
+def _sending(stage: Optional[str]) -> Iterator[None]:
+    token = _stage.set(stage)
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+
+
+class TokenBucket:
+    """Continuously refilling bucket; spending more than the level goes into debt."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount (capped at the capacity) is available."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def drain(self, now: float) -> None:
+        self._refill(now)
+        self.level = min(self.level, 0.0)
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "enqueued", "tokens", "future")
+
+    def __init__(self, priority: int, seq: int, tokens: int):
+        self.priority = priority
+        self.seq = seq
+        self.enqueued = time.monotonic()
+        self.tokens = tokens
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+
+
+class RateLimiter:
+    """Admit requests for one provider by priority within its request and token quotas."""
+
+    def __init__(self, rpm: Optional[float], tpm: Optional[float], burst: float = 5.0):
+        self.requests = TokenBucket(rpm / 60, max(1.0, rpm / 60 * burst)) if rpm else None
+        self.tokens = TokenBucket(tpm / 60, max(1.0, tpm / 60 * burst)) if tpm else None
+        self._waiters: List[_Waiter] = []
+        self._seq = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, priority: int, tokens: int) -> concurrent.futures.Future:
+        """
+        Queue a request.
+
+        Returns:
+            Future resolved when the request may be sent; await it from
+            asyncio with asyncio.wrap_future()
+        """
+        with self._cond:
+            self._seq += 1
+            waiter = _Waiter(priority, self._seq, tokens)
+            self._waiters.append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="asad-rate-limiter", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return waiter.future
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for seconds (after a 429) and drop the saved-up burst."""
+        with self._cond:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            for bucket in (self.requests, self.tokens):
+                if bucket is not None:
+                    bucket.drain(now)
+            self._cond.notify()
+
+    def queued(self) -> int:
+        with self._cond:
+            return len(self._waiters)
+
+    def _run(self) -> None:
+        with self._cond:
+            while True:
+                self._waiters = [w for w in self._waiters if not w.future.cancelled()]
+                if not self._waiters:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                waiter = min(
+                    self._waiters,
+                    key=lambda w: (w.priority - (now - w.enqueued) / AGING_SECONDS, w.seq),
+                )
+                wait = self._paused_until - now
+                if self.requests is not None:
+                    wait = max(wait, self.requests.wait_time(1, now))
+                if self.tokens is not None:
+                    wait = max(wait, self.tokens.wait_time(waiter.tokens, now))
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                self._waiters.remove(waiter)
+                if not waiter.future.set_running_or_notify_cancel():
+                    continue
+                if self.requests is not None:
+                    self.requests.take(1, now)
+                if self.tokens is not None:
+                    self.tokens.take(waiter.tokens, now)
+                waiter.future.set_result(now - waiter.enqueued)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    global _lock
+    _limiters.clear()
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_rate_limiter(provider: str) -> Optional[RateLimiter]:
+    """Return the shared RateLimiter for a provider, or None if it has no quota configured."""
+    limiter = _limiters.get(provider)
+    if limiter is not None:
+        return limiter
+    config = get_rate_limit_config(provider)
+    if not config["rpm"] and not config["tpm"]:
+        return None
+    with _lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = RateLimiter(config["rpm"], config["tpm"], config["burst"])
+            _limiters[provider] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forget every provider's limiter (e.g. after changing quotas)."""
+    with _lock:
+        _limiters.clear()
+
+
+def _status(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds requested by the Retry-After (or retry-after-ms) header of an error response."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            when = email.utils.parsedate_to_datetime(value)
+            return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Rate limits, timeouts, conflicts, server errors and dropped connections are retried."""
+    status = _status(exc)
+    if status is not None:
+        return status in _RETRYABLE_STATUS or status >= 500
+    return isinstance(exc, (ConnectionError, TimeoutError)) or type(exc).__name__ in (
+        "APIConnectionError",
+        "APITimeoutError",
+    )
+
+
+def backoff_delay(exc: BaseException, attempt: int, config: Dict[str, Any]) -> float:
+    """Retry-After if the provider sent one, else exponential backoff with full jitter."""
+    retry_after = _retry_after(exc)
+    if retry_after is not None:
+        return min(retry_after, config["backoff_max"])
+    return random.uniform(0, min(config["backoff_max"], config["backoff"] * 2 ** attempt))
+
+
+class _Attempts:
+    """Shared bookkeeping of the sync and async retry loops."""
+
+    def __init__(self, provider: str, prompt: str, stage: Optional[str]):
+        from .registry import get_provider_class
+
+        self.provider = provider
+        self.stage = stage
+        self.config = get_rate_limit_config(provider)
+        if get_provider_class(provider).routes:
+            # Each member call is scheduled and retried under its own provider's quota
+            self.config["max_retries"] = 0
+        self.limiter = get_rate_limiter(provider)
+        self.priority = STAGE_PRIORITY.get((stage or "").lower(), DEFAULT_PRIORITY)
+        self.tokens = math.ceil(len(prompt) / CHARS_PER_TOKEN) + self.config["completion_tokens"]
+
+    def admitted(self, waited: float) -> None:
+        record_queue_wait(self.provider, self.stage, waited)
+
+    def failed(self, exc: BaseException, attempt: int) -> Optional[float]:
+        """Seconds to sleep before retrying, or None to re-raise."""
+        if attempt >= self.config["max_retries"] or not is_retryable(exc):
+            return None
+        delay = backoff_delay(exc, attempt, self.config)
+        rate_limited = _status(exc) == 429
+        record_retry(self.stage or "none", "rate_limit" if rate_limited else "transient")
+        if rate_limited and self.limiter is not None:
+            # The limiter holds every queued request back; no extra sleep needed
+            self.limiter.pause(delay)
+            return 0.0
+        return delay
+
+
+def scheduled(provider: str, prompt: str, stage: Optional[str], call: Callable[[], T]) -> T:
+    """
+    Run call() once the provider's limiter admits it, retrying retryable errors.
+
+    Args:
+        provider: Provider name (selects quota and limiter)
+        prompt: Prompt being sent (for the token estimate)
+        stage: Pipeline stage (selects the priority lane)
+        call: Sends the request
+
+    Returns:
+        call()'s result
+    """
+    attempts = _Attempts(provider, prompt, stage)
+    attempt = 0
+    while True:
+        if attempts.limiter is not None:
+            attempts.admitted(attempts.limiter.submit(attempts.priority, attempts.tokens).result())
+        try:
+            with _sending(stage):
+                return call()
+        except Exception as exc:
+            delay = attempts.failed(exc, attempt)
+            if delay is None:
+                raise
+        attempt += 1
+        time.sleep(delay)
+
+
+async def scheduled_async(
+    provider: str,
+    prompt: str,
+    stage: Optional[str],
+    call: Callable[[], Awaitable[T]],
+) -> T:
+    """Async variant of scheduled()."""
+    attempts = _Attempts(provider, prompt, stage)
+    attempt = 0
+    while True:
+        if attempts.limiter is not None:
+            future = attempts.limiter.submit(attempts.priority, attempts.tokens)
+            attempts.admitted(await asyncio.wrap_future(future))
+        try:
+            with _sending(stage):
+                return await call()
+        except Exception as exc:
+            delay = attempts.failed(exc, attempt)
+            if delay is None:
+                raise
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def scheduled_stream(
+    provider: str,
+    prompt: str,
+    stage: Optional[str],
+    open_stream: Callable[[], Iterator[str]],
+) -> Iterator[str]:
+    """Stream variant of scheduled(); errors are retried only before the first chunk."""
+    attempts = _Attempts(provider, prompt, stage)
+    attempt = 0
+    while True:
+        if attempts.limiter is not None:
+            attempts.admitted(attempts.limiter.submit(attempts.priority, attempts.tokens).result())
+        received = False
+        with _sending(stage):
+            stream = open_stream()
+        try:
+            for chunk in stream:
+                received = True
+                yield chunk
+            return
+        except Exception as exc:
+            delay = None if received else attempts.failed(exc, attempt)
+            if delay is None:
+                raise
+        finally:
+            stream.close()
+        attempt += 1
+        time.sleep(delay)
+
+
+async def scheduled_stream_async(
+    provider: str,
+    prompt: str,
+    stage: Optional[str],
+    open_stream: Callable[[], AsyncIterator[str]],
+) -> AsyncIterator[str]:
+    """Async variant of scheduled_stream()."""
+    attempts = _Attempts(provider, prompt, stage)
+    attempt = 0
+    while True:
+        if attempts.limiter is not None:
+            future = attempts.limiter.submit(attempts.priority, attempts.tokens)
+            attempts.admitted(await asyncio.wrap_future(future))
+        received = False
+        with _sending(stage):
+            stream = open_stream()
+        try:
+            async for chunk in stream:
+                received = True
+                yield chunk
+            return
+        except Exception as exc:
+            delay = None if received else attempts.failed(exc, attempt)
+            if delay is None:
+                raise
+        finally:
+            await stream.aclose()
+        attempt += 1
+        await asyncio.sleep(delay)
@@ -0,0 +1,362 @@
+"""
+Per-stage and per-call metrics with Prometheus text export.
+
+Every LLM call and pipeline stage reports here. Nothing is recorded unless
+metrics are enabled with ASAD_METRICS or a collect_metrics() block is
+active, so the disabled path costs one environment lookup per event.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .config import get_metrics_config
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_HELP = {
+    "asad_llm_requests_total": ("counter", "LLM requests by cache outcome"),
+    "asad_llm_errors_total": ("counter", "LLM requests that raised"),
+    "asad_llm_request_duration_seconds": ("histogram", "Wall time of LLM requests"),
+    "asad_llm_prompt_tokens_total": ("counter", "Prompt tokens reported by the provider"),
+    "asad_llm_completion_tokens_total": ("counter", "Completion tokens reported by the provider"),
+    "asad_stage_duration_seconds": ("histogram", "Wall time of pipeline stages"),
+    "asad_retries_total": ("counter", "Retries and fallbacks by stage and reason"),
+    "asad_parse_failures_total": ("counter", "Responses that could not be parsed"),
+    "asad_rate_limit_wait_seconds": ("histogram", "Time LLM requests waited for the rate limiter"),
+    "asad_service_queue_depth": ("gauge", "Debugging jobs waiting for a service worker"),
+    "asad_service_jobs_running": ("gauge", "Debugging jobs being processed by service workers"),
+    "asad_service_jobs_total": ("counter", "Service jobs by outcome"),
+    "asad_service_queue_wait_seconds": ("histogram", "Time service jobs waited in the queue"),
+    "asad_service_job_duration_seconds": ("histogram", "Processing time of service jobs"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled counters and histograms."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1.0) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, labels: Dict[str, str], value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, labels: Dict[str, str], value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return all metrics as plain Python data.
+
+        Returns:
+            {"counters": {name: [{"labels", "value"}]},
+             "gauges": {name: [{"labels", "value"}]},
+             "histograms": {name: [{"labels", "count", "sum", "buckets"}]}}
+            where buckets maps each upper bound to its cumulative count
+        """
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            gauges = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._gauges.items()
+            }
+            histograms = {}
+            for name, series in self._histograms.items():
+                histograms[name] = []
+                for key, histogram in series.items():
+                    cumulative, running = {}, 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        running += count
+                        cumulative[bound] = running
+                    histograms[name].append({
+                        "labels": dict(key),
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "buckets": cumulative,
+                    })
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        for name, series in sorted(snapshot["counters"].items()):
+            _header(lines, name, "counter")
+            for sample in series:
+                lines.append(f"{name}{_format_labels(sample['labels'])} {_format_value(sample['value'])}")
+        for name, series in sorted(snapshot["gauges"].items()):
+            _header(lines, name, "gauge")
+            for sample in series:
+                lines.append(f"{name}{_format_labels(sample['labels'])} {_format_value(sample['value'])}")
+        for name, series in sorted(snapshot["histograms"].items()):
+            _header(lines, name, "histogram")
+            for sample in series:
+                labels = sample["labels"]
+                for bound, count in sample["buckets"].items():
+                    bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                lines.append(f"{name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {sample['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(sample['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write the Prometheus text file (for node_exporter's textfile collector)."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".asad-metrics-")
+        with os.fdopen(fd, "w") as handle:
+            handle.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _header(lines: List[str], name: str, default_type: str) -> None:
+    kind, description = _HELP.get(name, (default_type, name))
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in sorted(labels.items())) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+_registry = MetricsRegistry()
+_collector: contextvars.ContextVar[Optional[MetricsRegistry]] = contextvars.ContextVar(
+    "asad_metrics_collector", default=None
+)
+_call_usage: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "asad_call_usage", default=None
+)
+_stage_listener: contextvars.ContextVar[Optional[Callable[[str, str, float], None]]] = contextvars.ContextVar(
+    "asad_stage_listener", default=None
+)
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _registry
+
+
+def _sinks() -> List[MetricsRegistry]:
+    sinks = []
+    collector = _collector.get()
+    if collector is not None:
+        sinks.append(collector)
+    if get_metrics_config()["enabled"]:
+        sinks.append(_registry)
+    return sinks
+
+
+@contextlib.contextmanager
+def collect_metrics() -> Iterator[MetricsRegistry]:
+    """
+    Collect metrics for the current context (thread or task) into a fresh registry.
+
+    Works whether or not ASAD_METRICS is enabled.
+
+    Yields:
+        Registry receiving this context's metrics
+    """
+    collector = MetricsRegistry()
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+
+
+def _provider_labels(provider: Optional[str] = None) -> Dict[str, str]:
+    from .config import get_llm_provider
+    from .llm.registry import get_provider_class
+
+    try:
+        provider = provider or get_llm_provider()
+        return {"provider": provider, "model": get_provider_class(provider).model}
+    except (ValueError, AttributeError):
+        return {"provider": "unknown", "model": "unknown"}
+
+
+@contextlib.contextmanager
+def llm_call_metrics(provider: str, model: str, stage: Optional[str]) -> Iterator[None]:
+    """
+    Time one provider request and record its token usage and errors.
+
+    Providers report usage with record_usage() while the block is active.
+    """
+    sinks = _sinks()
+    if not sinks:
+        yield
+        return
+    labels = {"provider": provider, "model": model, "stage": stage or "none"}
+    usage = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _call_usage.set(usage)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        # GeneratorExit (a stream closed early on purpose) and cancellation are not errors
+        for sink in sinks:
+            sink.inc("asad_llm_errors_total", labels)
+        raise
+    finally:
+        _call_usage.reset(token)
+        elapsed = time.perf_counter() - start
+        for sink in sinks:
+            sink.inc("asad_llm_requests_total", {**labels, "cache": "miss"})
+            sink.observe("asad_llm_request_duration_seconds", labels, elapsed)
+            if usage["prompt_tokens"]:
+                sink.inc("asad_llm_prompt_tokens_total", labels, usage["prompt_tokens"])
+            if usage["completion_tokens"]:
+                sink.inc("asad_llm_completion_tokens_total", labels, usage["completion_tokens"])
+
+
+def record_usage(prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """Attach provider-reported token counts to the active LLM call, if any."""
+    usage = _call_usage.get()
+    if usage is not None:
+        usage["prompt_tokens"] += prompt_tokens or 0
+        usage["completion_tokens"] += completion_tokens or 0
+
+
+def record_cache_hit(provider: str, model: str, stage: Optional[str]) -> None:
+    """Count an LLM call answered from the response cache."""
+    for sink in _sinks():
+        sink.inc(
+            "asad_llm_requests_total",
+            {"provider": provider, "model": model, "stage": stage or "none", "cache": "hit"},
+        )
+
+
+@contextlib.contextmanager
+def watch_stages(listener: Callable[[str, str, float], None]) -> Iterator[None]:
+    """
+    Report pipeline stages run in the current context (thread or task) to listener.
+
+    listener(stage, event, elapsed) is called with event "started" (elapsed 0)
+    when a stage begins and "finished" or "failed" with its wall time when it
+    ends. Works whether or not metrics are enabled.
+    """
+    token = _stage_listener.set(listener)
+    try:
+        yield
+    finally:
+        _stage_listener.reset(token)
+
+
+@contextlib.contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Record the wall time of a pipeline stage (analysis, review, validation, ...)."""
+    sinks = _sinks()
+    listener = _stage_listener.get()
+    if not sinks and listener is None:
+        yield
+        return
+    if listener is not None:
+        listener(stage, "started", 0.0)
+    event = "failed"
+    start = time.perf_counter()
+    try:
+        yield
+        event = "finished"
+    finally:
+        elapsed = time.perf_counter() - start
+        if listener is not None:
+            listener(stage, event, elapsed)
+        if sinks:
+            labels = {"stage": stage, **_provider_labels()}
+            for sink in sinks:
+                sink.observe("asad_stage_duration_seconds", labels, elapsed)
+
+
+def record_retry(stage: str, reason: str) -> None:
+    """Count a retry or fallback (refinement, patch fallback, merge conflict, ...)."""
+    for sink in _sinks():
+        sink.inc("asad_retries_total", {"stage": stage, "reason": reason})
+
+
+def record_queue_wait(provider: str, stage: Optional[str], seconds: float) -> None:
+    """Record how long a request waited in its provider's rate-limit queue."""
+    for sink in _sinks():
+        sink.observe("asad_rate_limit_wait_seconds", {"provider": provider, "stage": stage or "none"}, seconds)
+
+
+def record_parse_failure(stage: Optional[str]) -> None:
+    """Count a response that could not be parsed into the expected structure."""
+    for sink in _sinks():
+        sink.inc("asad_parse_failures_total", {"stage": stage or "none"})
+
+
+def export_prometheus(path: Optional[str] = None) -> str:
+    """
+    Render the process-wide metrics as Prometheus text, optionally writing them.
+
+    Args:
+        path: File to write (defaults to ASAD_METRICS_FILE if set)
+
+    Returns:
+        The Prometheus text
+    """
+    path = path or get_metrics_config()["file"]
+    if path:
+        _registry.write_prometheus(path)
+    return _registry.to_prometheus()
@@ -1,5 +1,11 @@
 """Utilities for cleaning and parsing LLM outputs."""
 
 from .utils import clean_code, clean_json, safe_json_parse
+from .merge import MergeConflict, merge3
+from .patch import PatchError, apply_patch
+from .slicing import CodeSlice, SliceError, slice_code
+from .chunking import CodeChunk, chunk_module
 
-__all__ = ["clean_code", "clean_json", "safe_json_parse"]
+__all__ = ["clean_code", "clean_json", "safe_json_parse", "PatchError", "apply_patch",
+           "CodeSlice", "SliceError", "slice_code", "MergeConflict", "merge3",
+           "CodeChunk", "chunk_module"]
@@ -0,0 +1,148 @@
+"""
+AST-aware chunking of large modules for map-reduce analysis.
+
+A module is split at top-level statement boundaries into contiguous chunks
+of roughly equal length; a class too long for one chunk is split between
+its methods. Each chunk is analyzed on its own with a shared read-only
+header of the module's imports and globals, and bug locations reported
+against the chunk are shifted back to module line numbers.
+"""
+
+import ast
+import re
+from typing import List, Optional, Tuple
+
+from .slicing import MAX_GLOBAL_LINES, _FUNCTIONS, _LINE_RANGE
+
+_GLOBALS = (ast.Import, ast.ImportFrom, ast.Assign, ast.AnnAssign)
+
+
+class CodeChunk:
+    """
+    A contiguous range of a module's lines, analyzed as one unit.
+
+    Attributes:
+        code: Source lines start..end of the module
+        start: First module line of the chunk (1-based)
+        end: Last module line of the chunk
+        names: Top-level definitions (or Class.method) the chunk contains
+        context: Read-only imports, globals and enclosing class header
+    """
+
+    def __init__(self, lines: List[str], start: int, end: int, names: List[str], context: str):
+        self.code = "\n".join(lines[start - 1:end])
+        self.start = start
+        self.end = end
+        self.names = names
+        self.context = context
+
+    def prompt_input(self) -> str:
+        """Format the chunk and its context for embedding in an analysis prompt."""
+        return (
+            f"excerpt of a larger module (lines {self.start}-{self.end}; "
+            f"line numbers below count from the first line of the excerpt):\n{self.code}\n\n"
+            "    Read-only context from the rest of the module:\n"
+            f"{self.context or '(none)'}"
+        )
+
+    def shift_location(self, location: str) -> str:
+        """Rewrite line numbers in a location reported against the chunk to module lines."""
+        offset = self.start - 1
+        if not offset:
+            return location
+
+        def shift(match: "re.Match") -> str:
+            text, base = match.group(0), match.start()
+            # Replace the later number first so the earlier span stays valid
+            for group in (2, 1):
+                if match.group(group) is not None:
+                    first, last = match.span(group)
+                    number = str(int(match.group(group)) + offset)
+                    text = text[:first - base] + number + text[last - base:]
+            return text
+
+        return _LINE_RANGE.sub(shift, location)
+
+
+def module_header(code: str, tree: ast.Module) -> str:
+    """Imports and module-level assignments, long ones truncated."""
+    lines = code.splitlines()
+    parts = []
+    for node in tree.body:
+        if isinstance(node, _GLOBALS):
+            segment = lines[node.lineno - 1:node.end_lineno]
+            if len(segment) > MAX_GLOBAL_LINES:
+                segment = segment[:MAX_GLOBAL_LINES - 1] + ["    ..."]
+            parts.append("\n".join(segment))
+    return "\n".join(parts)
+
+
+def _units(tree: ast.Module, chunk_lines: int) -> List[Tuple[int, int, str, str]]:
+    """(first_line, last_line, name, class header) of each top-level statement or oversized-class piece."""
+    units = []
+    for node in tree.body:
+        decorators = getattr(node, "decorator_list", [])
+        start = min([node.lineno] + [d.lineno for d in decorators])
+        name = getattr(node, "name", f"line {node.lineno}")
+        methods = [child for child in getattr(node, "body", []) if isinstance(child, _FUNCTIONS)]
+        if not isinstance(node, ast.ClassDef) or node.end_lineno - start + 1 <= chunk_lines or not methods:
+            units.append((start, node.end_lineno, name, ""))
+            continue
+        # Split an oversized class between its methods; later pieces carry its header
+        header = f"class {name}:  # lines {start}-{node.end_lineno}, continued"
+        first = min([methods[0].lineno] + [d.lineno for d in methods[0].decorator_list])
+        if first > start:
+            units.append((start, first - 1, name, ""))
+        for index, method in enumerate(methods):
+            method_start = min([method.lineno] + [d.lineno for d in method.decorator_list])
+            if index + 1 < len(methods):
+                following = methods[index + 1]
+                end = min([following.lineno] + [d.lineno for d in following.decorator_list]) - 1
+            else:
+                end = node.end_lineno
+            units.append((method_start, end, f"{name}.{method.name}", header))
+    return units
+
+
+def chunk_module(code: str, chunk_lines: int) -> Optional[List[CodeChunk]]:
+    """
+    Split a module into contiguous chunks of about chunk_lines lines.
+
+    Chunks cover the whole module: blank lines and comments between
+    statements go with the statement that follows them.
+
+    Args:
+        code: Full module source
+        chunk_lines: Target chunk length; a single statement longer than
+            this becomes a chunk of its own
+
+    Returns:
+        Chunks in module order, or None if the module does not parse or
+        fits in one chunk
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    lines = code.splitlines()
+    units = _units(tree, chunk_lines)
+    if len(lines) <= chunk_lines or len(units) < 2:
+        return None
+
+    header = module_header(code, tree)
+    groups: List[List[Tuple[int, int, str, str]]] = [[]]
+    for unit in units:
+        group = groups[-1]
+        if group and unit[1] - group[0][0] + 1 > chunk_lines:
+            groups.append([unit])
+        else:
+            group.append(unit)
+
+    chunks = []
+    for index, group in enumerate(groups):
+        start = 1 if index == 0 else groups[index - 1][-1][1] + 1
+        end = len(lines) if index == len(groups) - 1 else group[-1][1]
+        class_headers = list(dict.fromkeys(unit[3] for unit in group if unit[3]))
+        context = "\n\n".join(filter(None, [header] + class_headers))
+        chunks.append(CodeChunk(lines, start, end, [unit[2] for unit in group], context))
+    return chunks
@@ -0,0 +1,70 @@
+"""
+Line-based three-way merge for combining concurrent agent edits.
+"""
+
+import difflib
+from typing import List, Tuple
+
+Change = Tuple[int, int, List[str]]
+
+
+class MergeConflict(ValueError):
+    """Raised when two edits change the same or adjacent lines differently."""
+
+
+def _changes(base: List[str], other: List[str]) -> List[Change]:
+    """Describe other as (base_start, base_end, replacement_lines) edits of base."""
+    matcher = difflib.SequenceMatcher(None, base, other, autojunk=False)
+    return [
+        (i1, i2, other[j1:j2])
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _overlaps(a: Change, b: Change) -> bool:
+    # Touching ranges (including two insertions at one point) count as overlap
+    return a[0] <= b[1] and b[0] <= a[1]
+
+
+def merge3(base: str, ours: str, theirs: str) -> str:
+    """
+    Merge two versions of base that were edited independently.
+
+    Args:
+        base: Common ancestor
+        ours: First edited version
+        theirs: Second edited version
+
+    Returns:
+        base with both sets of edits applied
+
+    Raises:
+        MergeConflict: If the edits touch overlapping lines with different results
+    """
+    if ours == theirs or theirs == base:
+        return ours
+    if ours == base:
+        return theirs
+
+    base_lines = base.splitlines()
+    ours_changes = _changes(base_lines, ours.splitlines())
+    theirs_changes = _changes(base_lines, theirs.splitlines())
+
+    merged: List[Change] = list(ours_changes)
+    for change in theirs_changes:
+        clashes = [other for other in ours_changes if _overlaps(change, other)]
+        if not clashes:
+            merged.append(change)
+        elif clashes != [change]:
+            raise MergeConflict(
+                f"Conflicting edits around base lines {change[0] + 1}-{max(change[1], change[0] + 1)}"
+            )
+
+    lines = list(base_lines)
+    for start, end, replacement in sorted(merged, key=lambda c: (c[0], c[1]), reverse=True):
+        lines[start:end] = replacement
+    result = "\n".join(lines)
+    if ours.endswith("\n"):
+        result += "\n"
+    return result
@@ -0,0 +1,234 @@
+"""
+Local patch engine for diff-based repairs.
+
+Agents in patch mode return search/replace blocks (or unified diff hunks)
+instead of the whole file. Hunks are located with exact, then
+whitespace-insensitive, then fuzzy context matching (for hunks with at
+least FUZZY_MIN_LINES lines of context); a hunk that cannot be placed
+unambiguously is rejected so the caller can fall back to full-file
+output.
+"""
+
+import difflib
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+PATCH_OUTPUT_FORMAT = """Output:
+First write one line starting with "EXPLANATION:" that explains the fix.
+Then write one or more search/replace blocks. Each SEARCH section must copy
+a few lines of the input code exactly (enough to be unique); the REPLACE
+section contains those lines after the fix:
+
+<<<<<<< SEARCH
+original lines
+=======
+fixed lines
+>>>>>>> REPLACE
+
+Only include the lines that change plus minimal surrounding context.
+Do not return the whole file and do not wrap the blocks in JSON or markdown.
+"""
+
+# Minimum similarity for a fuzzy context match
+FUZZY_THRESHOLD = 0.85
+
+# Hunks with fewer non-blank context lines must match exactly (up to whitespace):
+# a line or two of near-identical code matches the wrong statement too easily
+FUZZY_MIN_LINES = 3
+
+# Fuzzy matches elsewhere in the file within this similarity of the best are ambiguous
+FUZZY_MARGIN = 0.05
+
+_BLOCK_PATTERN = re.compile(
+    r"^<{5,9} ?SEARCH[^\n]*\n(.*?)^={5,9}[^\n]*\n(.*?)^>{5,9} ?REPLACE[^\n]*$",
+    re.MULTILINE | re.DOTALL,
+)
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchError(ValueError):
+    """Raised when a patch is malformed or a hunk does not apply cleanly."""
+
+
+Hunk = Tuple[List[str], List[str], Optional[int]]
+
+
+def parse_search_replace(text: str) -> List[Hunk]:
+    """Parse SEARCH/REPLACE blocks into (old_lines, new_lines, None) hunks."""
+    return [
+        (search.splitlines(), replace.splitlines(), None)
+        for search, replace in _BLOCK_PATTERN.findall(text)
+    ]
+
+
+def parse_unified_diff(text: str) -> List[Hunk]:
+    """Parse unified diff hunks into (old_lines, new_lines, old_start) hunks."""
+    hunks: List[Hunk] = []
+    current: Optional[Hunk] = None
+    for line in text.splitlines():
+        header = _HUNK_HEADER.match(line)
+        if header:
+            current = ([], [], int(header.group(1)) - 1)
+            hunks.append(current)
+        elif current is None or line.startswith(("---", "+++")):
+            continue
+        elif line.startswith("-"):
+            current[0].append(line[1:])
+        elif line.startswith("+"):
+            current[1].append(line[1:])
+        elif line.startswith(" ") or line == "":
+            current[0].append(line[1:])
+            current[1].append(line[1:])
+        elif line.startswith("\\"):
+            continue  # "\ No newline at end of file"
+    return hunks
+
+
+def _nearest(candidates: List[int], hint: Optional[int], what: str) -> int:
+    if len(candidates) == 1:
+        return candidates[0]
+    if hint is None:
+        raise PatchError(f"Ambiguous {what}: context matches {len(candidates)} locations")
+    return min(candidates, key=lambda start: abs(start - hint))
+
+
+def _locate(lines: List[str], old: List[str], hint: Optional[int]) -> int:
+    """Find where a hunk's old lines start, trying progressively looser matching."""
+    size = len(old)
+    windows = range(len(lines) - size + 1)
+
+    exact = [i for i in windows if lines[i:i + size] == old]
+    if exact:
+        return _nearest(exact, hint, "hunk")
+
+    stripped = [line.strip() for line in old]
+    loose = [i for i in windows if [line.strip() for line in lines[i:i + size]] == stripped]
+    if loose:
+        return _nearest(loose, hint, "hunk")
+
+    preview = old[0].strip() if old else ""
+    if sum(1 for line in stripped if line) < FUZZY_MIN_LINES:
+        raise PatchError(f"Hunk does not apply: no exact context match for {preview!r}")
+
+    target = "\n".join(stripped)
+    ratios = [
+        difflib.SequenceMatcher(
+            None, "\n".join(line.strip() for line in lines[i:i + size]), target, autojunk=False
+        ).ratio()
+        for i in windows
+    ]
+    best_ratio = max(ratios, default=0.0)
+    if best_ratio < FUZZY_THRESHOLD:
+        raise PatchError(f"Hunk does not apply: no context matches {preview!r}")
+    # Windows overlapping a better one are the same location shifted; any other
+    # window nearly as similar makes the match ambiguous
+    candidates: List[int] = []
+    for i in sorted(windows, key=lambda i: -ratios[i]):
+        if ratios[i] < best_ratio - FUZZY_MARGIN:
+            break
+        if all(abs(i - start) >= size for start in candidates):
+            candidates.append(i)
+    return _nearest(candidates, hint, "fuzzy hunk")
+
+
+def _indent(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _reindent(old: List[str], matched: List[str], new: List[str]) -> List[str]:
+    """Map replacement indentation onto the file's when context matched loosely."""
+    mapping = {}
+    for o, m in zip(old, matched):
+        if o.strip():
+            mapping.setdefault(_indent(o), _indent(m))
+    if all(have == want for have, want in mapping.items()):
+        return new
+    # Longest prefixes first so nested indentation levels map correctly
+    levels = sorted(mapping, key=len, reverse=True)
+    result = []
+    for line in new:
+        if line.strip():
+            for have in levels:
+                if line.startswith(have):
+                    line = mapping[have] + line[len(have):]
+                    break
+        result.append(line)
+    return result
+
+
+def apply_hunks(code: str, hunks: List[Hunk]) -> str:
+    """
+    Apply hunks to code in order.
+
+    Args:
+        code: Original source code
+        hunks: (old_lines, new_lines, line_hint) tuples
+
+    Returns:
+        Patched source code
+
+    Raises:
+        PatchError: If there are no hunks or any hunk fails to apply
+    """
+    if not hunks:
+        raise PatchError("Patch contains no hunks")
+
+    lines = code.splitlines()
+    offset = 0
+    for old, new, hint in hunks:
+        if not any(line.strip() for line in old):
+            if hint is None:
+                raise PatchError("Hunk has no context to locate it")
+            start = min(max(hint + offset, 0), len(lines))
+            lines[start:start] = new
+            offset += len(new)
+            continue
+        start = _locate(lines, old, None if hint is None else hint + offset)
+        matched = lines[start:start + len(old)]
+        lines[start:start + len(old)] = _reindent(old, matched, new)
+        offset += len(new) - len(old)
+
+    patched = "\n".join(lines)
+    if code.endswith("\n"):
+        patched += "\n"
+    return patched
+
+
+def apply_patch(code: str, patch: str) -> str:
+    """
+    Apply search/replace blocks or a unified diff to code.
+
+    Args:
+        code: Original source code
+        patch: Patch text in either format
+
+    Returns:
+        Patched source code
+
+    Raises:
+        PatchError: If the patch is malformed or does not apply cleanly
+    """
+    hunks = parse_search_replace(patch)
+    if not hunks:
+        hunks = parse_unified_diff(patch)
+    return apply_hunks(code, hunks)
+
+
+def parse_patch_response(response: str, code: str) -> Optional[Dict[str, Any]]:
+    """
+    Turn a patch-mode LLM response into the usual repair result.
+
+    Args:
+        response: Raw LLM response in PATCH_OUTPUT_FORMAT
+        code: Code the patch was generated against
+
+    Returns:
+        {"fixed_code", "fix_explanation"} or None if the patch does not apply
+    """
+    match = re.search(r"EXPLANATION:\s*(.*)", response)
+    explanation = match.group(1).strip() if match else "Patch applied"
+    try:
+        fixed_code = apply_patch(code, response)
+    except PatchError:
+        return None
+    return {"fixed_code": fixed_code, "fix_explanation": explanation}
@@ -0,0 +1,398 @@
+"""
+AST-aware context slicing for agent prompts.
+
+Bug locations from the analysis agent ("process_data, lines 3-5",
+"TaskManager._execute") are resolved to the functions, methods or top-level
+statements they name: explicit line numbers first, then names that look
+like code, so prose such as "when the workers run" selects nothing. The
+prompt then carries only those regions plus a read-only context of the
+imports, globals and signatures they reference, and the agent's edit is
+spliced back into the full module.
+"""
+
+import ast
+import copy
+import re
+import textwrap
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Slicing is skipped when the targets cover more than this share of the module
+MAX_SLICE_FRACTION = 0.6
+
+# Globals longer than this are shown truncated in the context
+MAX_GLOBAL_LINES = 10
+
+_IDENTIFIER = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*")
+_BACKTICKED = re.compile(r"`([^`\n]+)`")
+_CALLED = re.compile(r"([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)\s*\(")
+_DOTTED = re.compile(r"\b[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)+")
+_LINE_RANGE = re.compile(r"lines?\s*:?\s*(\d+)(?:\s*(?:-|–|to)\s*(\d+))?", re.IGNORECASE)
+_REGION_MARKER = re.compile(r"^[ \t]*# ---- region (\d+)\b[^\n]*(?:\n|$)", re.MULTILINE)
+
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+class SliceError(ValueError):
+    """Raised when an edited slice cannot be spliced back into its module."""
+
+
+class _Unit:
+    """A sliceable region: a top-level statement or a method of a top-level class."""
+
+    def __init__(self, node: ast.stmt, name: str, parent: Optional["_Unit"] = None):
+        self.node = node
+        self.name = name
+        self.parent = parent
+        decorators = getattr(node, "decorator_list", [])
+        self.start = min([node.lineno] + [d.lineno for d in decorators])
+        self.end = node.end_lineno
+
+    def contains(self, lineno: int) -> bool:
+        return self.start <= lineno <= self.end
+
+
+def _statement_name(node: ast.stmt) -> str:
+    if isinstance(node, _DEFINITIONS):
+        return node.name
+    if isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        names = [t.id for t in targets if isinstance(t, ast.Name)]
+        if names:
+            return names[0]
+    return f"line {node.lineno}"
+
+
+def _index_units(tree: ast.Module) -> List[_Unit]:
+    units = []
+    for node in tree.body:
+        unit = _Unit(node, _statement_name(node))
+        units.append(unit)
+        if isinstance(node, ast.ClassDef):
+            units.extend(
+                _Unit(child, f"{node.name}.{child.name}", unit)
+                for child in node.body if isinstance(child, _FUNCTIONS)
+            )
+    return units
+
+
+def _code_names(location: str) -> List[str]:
+    """
+    Identifiers in a location string that refer to code rather than prose.
+
+    That is the whole location when it is one identifier, backticked,
+    dotted or called names, and snake_case or camelCase words.
+    """
+    if _IDENTIFIER.fullmatch(location.strip()):
+        return [location.strip()]
+    names = [name for quoted in _BACKTICKED.findall(location) for name in _IDENTIFIER.findall(quoted)]
+    names += _CALLED.findall(location) + _DOTTED.findall(location)
+    names += [
+        word for word in _IDENTIFIER.findall(location)
+        if "_" in word.strip("_") or re.search(r"[a-z][A-Z]", word)
+    ]
+    return names
+
+
+def _resolve(units: List[_Unit], locations: List[str]) -> List[_Unit]:
+    """Map location strings to units by line number, then by code-like names."""
+    by_name: Dict[str, List[_Unit]] = {}
+    for unit in units:
+        if isinstance(unit.node, _DEFINITIONS):
+            by_name.setdefault(unit.name, []).append(unit)
+            if unit.parent is not None:
+                by_name.setdefault(unit.node.name, []).append(unit)
+
+    selected: List[_Unit] = []
+    for location in locations:
+        found = []
+        for match in _LINE_RANGE.finditer(location):
+            first = int(match.group(1))
+            last = int(match.group(2) or first)
+            for lineno in {first, last}:
+                inner = [u for u in units if u.contains(lineno)]
+                if inner:
+                    found.append(max(inner, key=lambda u: u.parent is not None))
+        if not found:
+            # Fall back to names only when no line number points into the module
+            for identifier in _code_names(location):
+                found.extend(by_name.get(identifier, []))
+                if "." in identifier:
+                    found.extend(by_name.get(identifier.rsplit(".", 1)[-1], []))
+        selected.extend(u for u in found if u not in selected)
+
+    # A selected class already covers its methods
+    chosen = {id(u) for u in selected}
+    return sorted(
+        (u for u in selected if u.parent is None or id(u.parent) not in chosen),
+        key=lambda u: u.start,
+    )
+
+
+def _referenced_names(nodes: List[ast.AST]) -> Set[str]:
+    names = set()
+    for node in nodes:
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name):
+                names.add(child.id)
+    return names
+
+
+def _bound_names(node: ast.stmt) -> Set[str]:
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return {(alias.asname or alias.name).split(".")[0] for alias in node.names}
+    if isinstance(node, _DEFINITIONS):
+        return {node.name}
+    names = set()
+    targets = node.targets if isinstance(node, ast.Assign) else [getattr(node, "target", None)]
+    for target in targets:
+        if target is not None:
+            names.update(n.id for n in ast.walk(target) if isinstance(n, ast.Name))
+    return names
+
+
+def _stub_body(node: ast.AST, keep: List[ast.stmt]) -> List[ast.stmt]:
+    docstring = ast.get_docstring(node, clean=True)
+    body = [ast.Expr(ast.Constant(docstring.splitlines()[0]))] if docstring else []
+    return body + keep + ([] if keep else [ast.Expr(ast.Constant(...))])
+
+
+def _signature(node: ast.AST) -> str:
+    stub = copy.copy(node)
+    stub.body = _stub_body(node, [])
+    return ast.unparse(stub)
+
+
+def _class_skeleton(node: ast.ClassDef, skip: Set[str]) -> str:
+    """Class header, class attributes, __init__ attribute setup and method signatures."""
+    body: List[ast.stmt] = []
+    for child in node.body:
+        if isinstance(child, (ast.Assign, ast.AnnAssign)):
+            body.append(child)
+        elif isinstance(child, _FUNCTIONS) and child.name not in skip:
+            stub = copy.copy(child)
+            keep = []
+            if child.name == "__init__":
+                keep = [
+                    stmt for stmt in child.body
+                    if isinstance(stmt, (ast.Assign, ast.AnnAssign))
+                    and any(
+                        isinstance(t, ast.Attribute)
+                        for t in (stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target])
+                    )
+                ]
+            stub.body = _stub_body(child, keep)
+            body.append(stub)
+    skeleton = copy.copy(node)
+    skeleton.body = _stub_body(node, body)
+    return ast.unparse(skeleton)
+
+
+class CodeSlice:
+    """
+    Editable regions of a module plus the read-only context they depend on.
+
+    Attributes:
+        code: The target regions, each introduced by a "# ---- region N" marker
+        context: Imports, globals and signatures referenced by the regions
+        targets: Names of the sliced regions
+    """
+
+    def __init__(self, source: str, tree: ast.Module, units: List[_Unit], index: List[_Unit]):
+        self.source = source
+        self.lines = source.splitlines()
+        self.units = units
+        self._index = index
+        self.targets = [u.name for u in units]
+        self.code = "\n\n".join(
+            f"# ---- region {i}: {u.name} (lines {u.start}-{u.end}) ----\n"
+            + "\n".join(self.lines[u.start - 1:u.end])
+            for i, u in enumerate(units, 1)
+        )
+        self.context = self._build_context(tree)
+
+    def _segment(self, node: ast.stmt) -> str:
+        lines = self.lines[node.lineno - 1:node.end_lineno]
+        if len(lines) > MAX_GLOBAL_LINES:
+            lines = lines[:MAX_GLOBAL_LINES - 1] + ["    ..."]
+        return "\n".join(lines)
+
+    def _build_context(self, tree: ast.Module) -> str:
+        referenced = _referenced_names([u.node for u in self.units])
+        target_ids = {id(u.node) for u in self.units}
+        method_owners: Dict[int, Set[str]] = {}
+        for unit in self.units:
+            if unit.parent is not None:
+                method_owners.setdefault(id(unit.parent.node), set()).add(unit.node.name)
+
+        parts = []
+        for node in tree.body:
+            if id(node) in target_ids:
+                continue
+            if id(node) in method_owners:
+                parts.append(_class_skeleton(node, method_owners[id(node)]))
+                continue
+            bound = _bound_names(node)
+            if isinstance(node, ast.ImportFrom) and any(a.name == "*" for a in node.names):
+                parts.append(self._segment(node))
+            elif not bound & referenced:
+                continue
+            elif isinstance(node, ast.ClassDef):
+                parts.append(_class_skeleton(node, set()))
+            elif isinstance(node, _FUNCTIONS):
+                parts.append(_signature(node))
+            else:
+                parts.append(self._segment(node))
+        return "\n\n".join(parts)
+
+    def prompt_input(self, editable: bool = True) -> str:
+        """
+        Format the regions and their context for embedding in an agent prompt.
+
+        Args:
+            editable: Tell the agent to return only the edited regions
+        """
+        note = "excerpt of a larger module"
+        if editable:
+            note += (
+                ". Only edit the regions below and return just those regions, "
+                "each with its \"# ---- region N\" marker line"
+            )
+        return (
+            f"{note}:\n{self.code}\n\n"
+            "    Read-only context from the rest of the module:\n"
+            f"{self.context or '(none)'}"
+        )
+
+    def splice(self, edited: str) -> str:
+        """
+        Replace the sliced regions of the module with their edited versions.
+
+        Args:
+            edited: The agent's version of CodeSlice.code
+
+        Returns:
+            Full module source with the edits applied
+
+        Raises:
+            SliceError: If the regions cannot be matched or the result does not parse
+        """
+        pieces = _REGION_MARKER.split(edited)
+        preamble = pieces[0]
+        numbers = [int(number) for number in pieces[1::2]]
+        regions = dict(zip(numbers, pieces[2::2]))
+        if not regions:
+            if len(self.units) > 1:
+                raise SliceError("Edited slice lost its region markers")
+            self._reject_whole_module(edited)
+            preamble, regions = "", {1: edited}
+        if sorted(numbers or regions) != list(range(1, len(self.units) + 1)):
+            raise SliceError("Edited slice does not contain every region exactly once")
+
+        lines = list(self.lines)
+        for number in sorted(regions, reverse=True):
+            unit = self.units[number - 1]
+            lines[unit.start - 1:unit.end] = self._reindent(regions[number], unit)
+        if preamble.strip():
+            anchor = (self.units[0].parent or self.units[0]).start
+            lines[anchor - 1:anchor - 1] = textwrap.dedent(preamble).strip("\n").splitlines() + [""]
+
+        spliced = "\n".join(lines)
+        if self.source.endswith("\n"):
+            spliced += "\n"
+        try:
+            ast.parse(spliced)
+        except SyntaxError as exc:
+            raise SliceError(f"Spliced module does not parse: {exc.msg} (line {exc.lineno})")
+        return spliced
+
+    def _reject_whole_module(self, edited: str) -> None:
+        try:
+            tree = ast.parse(textwrap.dedent(edited))
+        except SyntaxError:
+            return
+        others = {
+            u.name for u in self._index
+            if u.parent is None and isinstance(u.node, _DEFINITIONS) and u not in self.units
+        }
+        returned = {node.name for node in tree.body if isinstance(node, _DEFINITIONS)}
+        if returned & others:
+            raise SliceError("Agent returned the whole module instead of the slice")
+
+    def _reindent(self, body: str, unit: _Unit) -> List[str]:
+        new = body.strip("\n").splitlines()
+        while new and not new[-1].strip():
+            new.pop()
+        original = self.lines[unit.start - 1]
+        want = original[:len(original) - len(original.lstrip())]
+        first = next((line for line in new if line.strip()), "")
+        have = first[:len(first) - len(first.lstrip())]
+        if have == want:
+            return new
+        return [
+            line if not line.strip()
+            else want + line[len(have):] if line.startswith(have)
+            else want + line.lstrip()
+            for line in new
+        ]
+
+
+def slice_code(code: str, locations: List[str], min_lines: int = 0) -> Optional[CodeSlice]:
+    """
+    Slice a module down to the regions named by bug locations.
+
+    Args:
+        code: Full module source
+        locations: Free-text locations, e.g. "TaskManager._execute, lines 32-38"
+        min_lines: Modules shorter than this are not sliced
+
+    Returns:
+        A CodeSlice, or None if the module does not parse, no location
+        resolves, or the slice would not be meaningfully smaller
+    """
+    total = len(code.splitlines())
+    if total < min_lines or not any(locations):
+        return None
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+
+    index = _index_units(tree)
+    units = _resolve(index, [location for location in locations if location])
+    if not units or sum(u.end - u.start + 1 for u in units) > total * MAX_SLICE_FRACTION:
+        return None
+    return CodeSlice(code, tree, units, index)
+
+
+def target_spans(code: str, locations: List[str]) -> Optional[List[Tuple[int, int]]]:
+    """
+    Resolve locations to the (first_line, last_line) spans they would slice.
+
+    Returns:
+        Sorted spans, or None if the code does not parse or nothing resolves
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    units = _resolve(_index_units(tree), [location for location in locations if location])
+    return [(u.start, u.end) for u in units] or None
+
+
+def bug_locations(bugs: List[Any]) -> List[str]:
+    """Collect the location strings from an analysis report's bug list."""
+    return [
+        str(bug.get("location", "")) for bug in bugs
+        if isinstance(bug, dict) and bug.get("location")
+    ]
+
+
+def agent_locations(agent: Dict[str, Any]) -> List[str]:
+    """Locations an agent is responsible for: its targets, else its task description."""
+    targets = agent.get("targets")
+    if isinstance(targets, str):
+        targets = [targets]
+    if targets:
+        return [str(target) for target in targets]
+    return [str(agent.get("task_description", ""))]
@@ -0,0 +1,136 @@
+"""
+Incremental parsing of streamed JSON responses.
+
+The parser consumes response chunks as they arrive and reports each
+top-level field of the outermost JSON object as soon as its value is
+complete, so callers can act on e.g. "decision" before the rest of the
+response has been generated.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .utils import fix_invalid_escapes
+
+# Non-JSON text tolerated before the opening brace (e.g. "```json" or a short preamble)
+MAX_PREFIX_CHARS = 200
+
+
+class IncrementalJSONParser:
+    """
+    Streaming parser for a single JSON object.
+
+    Attributes:
+        fields: Top-level fields completed so far
+        done: The closing brace of the object has been seen
+        malformed: The stream can no longer produce a valid object
+        text: Everything fed so far
+    """
+
+    def __init__(self, max_prefix: int = MAX_PREFIX_CHARS):
+        self.max_prefix = max_prefix
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self.malformed = False
+        self._chunks: List[str] = []
+        self._prefix = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member: List[str] = []
+        self._colon: Optional[int] = None
+        self._emitted = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next chunk of the response.
+
+        Args:
+            chunk: Response text in arrival order
+
+        Returns:
+            (key, value) pairs for fields completed by this chunk
+        """
+        self._chunks.append(chunk)
+        completed: List[Tuple[str, Any]] = []
+        for char in chunk:
+            if self.done or self.malformed:
+                break
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                else:
+                    self._prefix += 1
+                    self.malformed = self._prefix > self.max_prefix
+                continue
+
+            if self._in_string:
+                self._member.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._colon is not None:
+                        self._complete(completed)  # string value closed
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end_member(completed)
+                    self.done = not self.malformed
+                    continue
+                if self._depth == 1 and self._colon is not None:
+                    self._member.append(char)
+                    self._complete(completed)  # object or array value closed
+                    continue
+            elif self._depth == 1 and char == ",":
+                self._end_member(completed)
+                continue
+            elif self._depth == 1 and char == ":" and self._colon is None:
+                self._colon = len(self._member)
+            self._member.append(char)
+        return completed
+
+    def _complete(self, completed: List[Tuple[str, Any]]) -> None:
+        if self._emitted:
+            return
+        member = "".join(self._member)
+        key_text, value_text = member[:self._colon], member[self._colon + 1:]
+        try:
+            key = json.loads(key_text)
+            value = _loads(value_text)
+        except json.JSONDecodeError:
+            self.malformed = True
+            return
+        if not isinstance(key, str):
+            self.malformed = True
+            return
+        self.fields[key] = value
+        completed.append((key, value))
+        self._emitted = True
+
+    def _end_member(self, completed: List[Tuple[str, Any]]) -> None:
+        if "".join(self._member).strip():
+            if self._colon is None:
+                self.malformed = True
+            else:
+                self._complete(completed)  # numbers, booleans and null end here
+        self._member, self._colon, self._emitted = [], None, False
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text, strict=False)
+    except json.JSONDecodeError:
+        return json.loads(fix_invalid_escapes(text), strict=False)
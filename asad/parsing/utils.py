@@ -4,8 +4,9 @@ Utilities for cleaning LLM outputs and parsing structured responses.
 
 import json
 import re
-import regex
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..metrics import record_parse_failure
 
 
 def clean_code(text: str) -> str:
@@ -38,45 +39,147 @@ def clean_code(text: str) -> str:
     return text.strip()
 
 
+_DECODER = json.JSONDecoder()
+
+# Runs of characters the scanner can copy without inspecting one by one
+_STRING_RUN = re.compile(r'[^"\\\x00-\x1f]+')
+_CODE_RUN = re.compile(r'[^{}"]+')
+_HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def _scan_object(text: str, start: int) -> Tuple[str, List[Tuple[int, int, int]], int]:
+    """
+    Copy the object opening at text[start], repairing string literals on the way.
+
+    Invalid escapes get their backslash doubled (an escaped single quote
+    becomes a plain quote) and raw control characters are escaped.
+
+    Returns:
+        (repaired text, (start, end, depth) of every closed object in repaired
+        coordinates, index in text after the closing brace or -1 if it never closes)
+    """
+    out: List[str] = []
+    size = 0
+    opened: List[int] = []
+    closed: List[Tuple[int, int, int]] = []
+    in_string = False
+    i, n = start, len(text)
+    while i < n:
+        run = (_STRING_RUN if in_string else _CODE_RUN).match(text, i)
+        if run:
+            piece, i = run.group(), run.end()
+        elif in_string:
+            char = text[i]
+            if char == '"':
+                piece, in_string = char, False
+                i += 1
+            elif char == "\\":
+                escape = text[i + 1:i + 2]
+                if escape and escape in '"\\/bfnrt':
+                    piece, i = text[i:i + 2], i + 2
+                elif escape == "u" and _HEX4.match(text, i + 2):
+                    piece, i = text[i:i + 6], i + 6
+                elif escape == "'":
+                    piece, i = "'", i + 2
+                else:
+                    piece, i = "\\\\", i + 1
+            else:
+                piece = _CONTROL_ESCAPES.get(char, f"\\u{ord(char):04x}")
+                i += 1
+        else:
+            piece = text[i]
+            i += 1
+            if piece == '"':
+                in_string = True
+            elif piece == "{":
+                opened.append(size)
+            elif piece == "}" and opened:
+                closed.append((opened.pop(), size + 1, len(opened) + 1))
+                if not opened:
+                    out.append(piece)
+                    return "".join(out), closed, i
+        out.append(piece)
+        size += len(piece)
+    return "".join(out), closed, -1
+
+
+def _first_object(text: str) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Find and decode the first complete JSON object in text in one forward pass."""
+    start = text.find("{")
+    while start != -1:
+        try:
+            # Fast path: well-formed JSON decodes directly from the brace
+            obj, end = _DECODER.raw_decode(text, start)
+            return obj, text[start:end]
+        except json.JSONDecodeError:
+            pass
+
+        repaired, closed, end = _scan_object(text, start)
+        if end != -1:
+            candidates = [(0, len(repaired))]
+        else:
+            # Unbalanced (e.g. a stray brace in prose): try the objects it contains
+            candidates = [(s, e) for s, e, depth in closed if depth == 2]
+        for s, e in candidates:
+            try:
+                obj, stop = _DECODER.raw_decode(repaired, s)
+            except json.JSONDecodeError:
+                continue
+            if stop == e:
+                return obj, repaired[s:e]
+        if end == -1:
+            break
+        start = text.find("{", end)
+    return None, ""
+
+
 def clean_json(text: str) -> str:
     """
-    Extract the first valid JSON object from text using recursive regex.
+    Extract the first valid JSON object from text.
+    
+    A single forward pass that understands JSON strings, so braces inside
+    string values (dicts, f-strings, sets in escaped code) do not confuse it.
+    Invalid escapes and raw control characters inside strings are repaired.
     
     Args:
         text: Raw LLM response possibly containing JSON
     
     Returns:
-        JSON substring or empty string if none found
+        JSON substring (repaired if needed) or empty string if none found
     """
-    match = regex.search(r'\{(?:[^{}]|(?R))*\}', text)
-    return match.group() if match else ""
+    return _first_object(text)[1]
+
+
+def fix_invalid_escapes(text: str) -> str:
+    """Double backslashes that do not start a valid JSON escape sequence."""
+    return re.sub(r"\\(?!['\"\\/bfnrtu])", r"\\\\", text)
 
 
-def safe_json_parse(response: str, fallback: Optional[Any] = None) -> Any:
+def safe_json_parse(
+    response: str,
+    fallback: Optional[Any] = None,
+    stage: Optional[str] = None
+) -> Any:
     """
     Safely parse JSON from LLM response with error recovery.
     
     Attempts:
-    1. Direct parsing of extracted JSON
-    2. Fixing invalid escape sequences
+    1. Direct decoding of the first JSON object in the response
+    2. Repairing invalid escapes and raw control characters in strings
     3. Returning fallback value
     
     Args:
         response: Raw LLM response
         fallback: Value to return on persistent parse failure
+        stage: Pipeline stage to charge a parse failure to in the metrics
     
     Returns:
         Parsed JSON object or fallback value
     """
-    try:
-        clean_response = clean_json(response)
-        if not clean_response:
-            return fallback
-        return json.loads(clean_response)
-    except json.JSONDecodeError:
-        # Fix common escape sequence issues
-        clean_response = re.sub(r"\\(?!['\"\\/bfnrtu])", r"\\\\", clean_response)
-        try:
-            return json.loads(clean_response)
-        except json.JSONDecodeError:
-            return fallback
+    obj, _ = _first_object(response)
+    if obj is None:
+        if stage is not None:
+            record_parse_failure(stage)
+        return fallback
+    return obj
@@ -2,75 +2,367 @@
 Main adaptive debugging pipeline that orchestrates the entire repair process.
 """
 
-from typing import Dict, Any
-from .agents.analysis import analyze_problem, new_iteration_analyze_problem
-from .agents.review import validate_solution
-from .strategies.simple_fix import simple_fix
-from .strategies.multi_agent import multi_agent_fix
+import hashlib
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Union
+from .agents.analysis import analyze_problem_async, new_iteration_analyze_problem_async
+from .agents.review import validate_solution_async
+from .strategies.simple_fix import simple_fix_async
+from .strategies.multi_agent import multi_agent_fix_async
+from .strategies.speculative import speculative_fix_async
+from .strategies.fused import fused_fix_async
+from .checkpoint import RunCheckpoint, activate, checkpointed, get_checkpoint_store
+from .config import (
+    get_checkpoint_config,
+    get_fused_mode,
+    get_metrics_config,
+    get_router_mode,
+    get_speculative_config,
+)
+from .metrics import collect_metrics, export_prometheus, record_retry, stage_timer
+from .routing import COMPLEX_MIN, SIMPLE_MAX, route_complexity
+from .runtime import run_sync
 
 
-def adaptive_debugger(buggy_code: str, max_iterations: int = 5) -> str:
+def _route(code: str, analysis_report: Dict[str, Any]) -> Dict[str, Any]:
+    """Overwrite the report's complexity with the configured router's decision."""
+    mode = get_router_mode()
+    if mode == "llm":
+        return analysis_report
+    llm_label = analysis_report.get("complexity") if mode == "hybrid" else None
+    decision = route_complexity(code, llm_label)
+    return {**analysis_report, "complexity": decision["complexity"]}
+
+
+def _speculate(code: str) -> bool:
+    """Whether ASAD_SPECULATIVE asks to race both strategies on this code."""
+    mode = get_speculative_config()["mode"]
+    if mode == "borderline":
+        return SIMPLE_MAX < route_complexity(code)["score"] < COMPLEX_MIN
+    return mode == "always"
+
+
+def _fuse(code: str) -> bool:
+    """Whether ASAD_FUSED asks to try a single fused repair call on this code first."""
+    mode = get_fused_mode()
+    if mode == "simple":
+        return route_complexity(code)["score"] <= SIMPLE_MAX
+    return mode == "always"
+
+
+def _digest(code: str) -> str:
+    """Content hash of a code state, ignoring trailing whitespace."""
+    normalized = "\n".join(line.rstrip() for line in code.strip().splitlines())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _next_strategy(state: Dict[str, Any]) -> Optional[str]:
+    """A strategy not yet tried from a revisited code state, or None if both were."""
+    for strategy in ("SIMPLE", "COMPLEX"):
+        if strategy not in state["tried"]:
+            return strategy
+    return None
+
+
+def adaptive_debugger(
+    buggy_code: str,
+    max_iterations: int = 5,
+    return_metrics: bool = False,
+    analysis_report: Optional[Dict[str, Any]] = None,
+    run_id: Optional[str] = None
+) -> Union[str, Tuple[str, Dict[str, Any]]]:
     """
     Execute the adaptive debugging pipeline on buggy code.
     
     The pipeline:
+    0. Optionally (ASAD_FUSED) tries one call that analyzes, fixes and
+       self-checks, accepted only if the fix runs in the sandbox
     1. Analyzes code complexity and identifies bugs
     2. Selects appropriate repair strategy (simple vs. multi-agent)
     3. Iteratively repairs and validates until fixed or max iterations reached
     
+    Every code state the loop visits is remembered by content hash, so
+    validations and analyses are never repeated for the same code. When a
+    repair returns a state already visited (no change, or a cycle), the
+    other strategy is tried from it; once both have been tried the loop
+    stops early.
+    
+    When run_id is given (or ASAD_CHECKPOINTS is on), each completed step
+    is checkpointed, so a run interrupted by a crash can be continued with
+    resume(run_id) at the cost of the steps that were in flight.
+    
+    Runs adaptive_debugger_async() on a shared background event loop.
+    
     Args:
         buggy_code: Python source code containing bugs
         max_iterations: Maximum repair attempts before giving up
+        return_metrics: Also return this run's metrics (see MetricsRegistry.snapshot())
+        analysis_report: Initial analysis already made for this code (skips
+            the fused attempt and the initial analysis call)
+        run_id: Checkpoint the run under this ID; an unfinished run with
+            this ID is continued. Without one, runs are only checkpointed
+            (under a new ID, see list_runs()) when ASAD_CHECKPOINTS is on
+    
+    Returns:
+        Fixed code if successful, otherwise best attempt at repair; with
+        return_metrics, a (code, metrics) tuple
+    """
+    return run_sync(adaptive_debugger_async(buggy_code, max_iterations, return_metrics, analysis_report, run_id))
+
+
+async def adaptive_debugger_async(
+    buggy_code: str,
+    max_iterations: int = 5,
+    return_metrics: bool = False,
+    analysis_report: Optional[Dict[str, Any]] = None,
+    run_id: Optional[str] = None
+) -> Union[str, Tuple[str, Dict[str, Any]]]:
+    """
+    Async variant of adaptive_debugger().
+    
+    Every LLM call is awaited on the caller's event loop, so one loop can
+    drive many debugging sessions concurrently (e.g. with asyncio.gather).
+    
+    Args:
+        buggy_code: Python source code containing bugs
+        max_iterations: Maximum repair attempts before giving up
+        return_metrics: Also return this run's metrics (see MetricsRegistry.snapshot())
+        analysis_report: Initial analysis already made for this code (skips
+            the fused attempt and the initial analysis call)
+        run_id: Checkpoint the run under this ID (see adaptive_debugger())
+    
+    Returns:
+        Fixed code if successful, otherwise best attempt at repair; with
+        return_metrics, a (code, metrics) tuple
+    """
+    try:
+        if not return_metrics:
+            return await _checkpointed_debug(buggy_code, max_iterations, analysis_report, run_id)
+        with collect_metrics() as run_metrics:
+            fixed_code = await _checkpointed_debug(buggy_code, max_iterations, analysis_report, run_id)
+        return fixed_code, run_metrics.snapshot()
+    finally:
+        config = get_metrics_config()
+        if config["enabled"] and config["file"]:
+            export_prometheus(config["file"])
+
+
+def resume(run_id: str, return_metrics: bool = False) -> Union[str, Tuple[str, Dict[str, Any]]]:
+    """
+    Continue a checkpointed run from its last completed step.
+    
+    Completed steps (analysis, agent configuration, approved agent code,
+    review decisions, validations, ...) are replayed from the checkpoint
+    without LLM calls; only unfinished steps are run again.
+    
+    Args:
+        run_id: ID the run was started with (see list_runs())
+        return_metrics: Also return the resumed run's metrics
     
     Returns:
-        Fixed code if successful, otherwise best attempt at repair
+        Same as adaptive_debugger(); a run that already finished returns
+        its saved result
+    
+    Raises:
+        ValueError: No run with this ID is checkpointed
     """
+    return run_sync(resume_async(run_id, return_metrics))
+
+
+async def resume_async(run_id: str, return_metrics: bool = False) -> Union[str, Tuple[str, Dict[str, Any]]]:
+    """Async variant of resume()."""
+    run = get_checkpoint_store().get_run(run_id)
+    if run is None:
+        raise ValueError(f"Unknown run: {run_id}")
+    return await adaptive_debugger_async(
+        run["code"], run["max_iterations"], return_metrics, run["analysis"], run_id=run_id
+    )
+
+
+async def _checkpointed_debug(
+    buggy_code: str,
+    max_iterations: int,
+    analysis_report: Optional[Dict[str, Any]],
+    run_id: Optional[str]
+) -> str:
+    if run_id is None and not get_checkpoint_config()["enabled"]:
+        return await _debug(buggy_code, max_iterations, analysis_report)
+    
+    store = get_checkpoint_store()
+    run_id = run_id or uuid.uuid4().hex
+    saved = store.get_run(run_id)
+    if saved is None:
+        store.create_run(run_id, buggy_code, max_iterations, analysis_report)
+    elif saved["code"] != buggy_code:
+        raise ValueError(f"Run {run_id} was started on different code")
+    elif saved["status"] == "done":
+        print(f"\n♻️  Run {run_id} already finished - returning its result")
+        return saved["result"]
+    
+    run = RunCheckpoint(store, run_id, store.load_steps(run_id))
+    if run.steps:
+        print(f"\n[Checkpoint] Resuming run {run_id} after step {saved['progress']}")
+    with activate(run):
+        fixed_code = await _debug(buggy_code, max_iterations, analysis_report)
+    if run.replayed:
+        print(f"\n♻️  Replayed {run.replayed} checkpointed steps")
+    store.finish(run_id, fixed_code)
+    return fixed_code
+
+
+async def _debug(
+    buggy_code: str,
+    max_iterations: int,
+    analysis_report: Optional[Dict[str, Any]] = None
+) -> str:
+    # A caller-supplied analysis replaces the fused attempt and the initial analysis
+    if analysis_report is not None:
+        analysis_report = _route(buggy_code, analysis_report)
+    elif _fuse(buggy_code):
+        # Fused fast path: one round trip for easy bugs
+        print("\n[Strategy] Trying fused single-call repair")
+        with stage_timer("fused"):
+            fused = await checkpointed("fused", lambda: fused_fix_async(buggy_code))
+        if fused["accepted"]:
+            print("\n🟢 Bugs fixed successfully with a single fused call\n")
+            return fused["fixed_code"]
+        print("\n🟡 Fused repair not accepted. Falling back to the full pipeline...")
+        if fused["bugs"]:
+            # The fused answer already carries an analysis; don't pay for another
+            analysis_report = _route(buggy_code, {
+                "complexity": fused["complexity"],
+                "bugs": fused["bugs"],
+                "plan": fused["plan"],
+            })
+    
     # Initial analysis
-    analysis_report = analyze_problem(buggy_code)
-    print(f"\n[Complexity]: {analysis_report["complexity"]}")
+    if analysis_report is None:
+        with stage_timer("analysis"):
+            analysis_report = _route(buggy_code, await checkpointed(
+                "analysis", lambda: analyze_problem_async(buggy_code)
+            ))
+    print(f"\n[Complexity]: {analysis_report['complexity']}")
     
     # Early exit if no bugs found
     if not analysis_report.get("bugs"):
         print("\n🟢 No errors found. Code is already fixed")
         return buggy_code
     
+    # Code states visited so far: validation, analysis and strategies tried from each
+    states: Dict[str, Dict[str, Any]] = {
+        _digest(buggy_code): {"analysis": analysis_report, "tried": set()}
+    }
+    forced = False
+
+    async def validate_state(code: str) -> Dict[str, Any]:
+        # Racing paths reuse the validation of a code state seen before
+        known = states.get(_digest(code), {}).get("validation")
+        if known is not None:
+            return known
+        with stage_timer("validation"):
+            return await validate_solution_async(code)
+
     # Iterative repair loop
     current_code = buggy_code
+    history: List[str] = []
     for iteration in range(max_iterations):
         print(f"\n-------------- ITERATION {iteration + 1} --------------")
+        if iteration:
+            record_retry("pipeline", "iteration")
+        state = states[_digest(current_code)]
+        attempt_input = current_code
+        step = f"iteration-{iteration + 1}/"
         
         # Select repair strategy based on complexity
-        if analysis_report["complexity"] == "SIMPLE":
-            print("\n[Strategy] Using simple fix path")
-            result = simple_fix(analysis_report["bugs"], current_code)
-            current_code = result["fixed_code"]
-        else:
-            print("\n[Strategy] Using multi-agent approach")
-            result = multi_agent_fix(
-                analysis_report["bugs"],
-                analysis_report["plan"],
-                current_code
-            )
-            current_code = result["fixed_code"]
+        validation = None
+        with stage_timer("strategy"):
+            if not forced and _speculate(current_code):
+                path = "speculative"
+                state["tried"].update(("SIMPLE", "COMPLEX"))
+                print("\n[Strategy] Racing simple and multi-agent paths")
+                result = await checkpointed(step + "speculative", lambda: speculative_fix_async(
+                    analysis_report["bugs"],
+                    analysis_report["plan"],
+                    current_code,
+                    analysis_report["complexity"],
+                    get_speculative_config()["max_calls"],
+                    validate_state
+                ))
+                current_code, validation = result["fixed_code"], result["validation"]
+            elif analysis_report["complexity"] == "SIMPLE":
+                path = "simple"
+                state["tried"].add("SIMPLE")
+                print("\n[Strategy] Using simple fix path")
+                result = await checkpointed(
+                    step + "simple", lambda: simple_fix_async(analysis_report["bugs"], current_code)
+                )
+                current_code = result["fixed_code"]
+            else:
+                path = "multi-agent"
+                state["tried"].add("COMPLEX")
+                print("\n[Strategy] Using multi-agent approach")
+                result = await checkpointed(step + "multi-agent", lambda: multi_agent_fix_async(
+                    analysis_report["bugs"],
+                    analysis_report["plan"],
+                    current_code
+                ))
+                current_code = result["fixed_code"]
+        
+        key = _digest(current_code)
+        revisited = key in states
+        state = states.setdefault(key, {"tried": set()})
         
-        # Validate repair attempt
-        validation = validate_solution(current_code)
+        # Validate repair attempt (speculation validates as paths finish)
+        if validation is None:
+            validation = state.get("validation")
+            if validation is not None:
+                print("\n♻️  Code state seen before - reusing its validation")
+            else:
+                with stage_timer("validation"):
+                    validation = await checkpointed(
+                        step + "validation", lambda: validate_solution_async(current_code)
+                    )
+        state["validation"] = validation
         status = validation["status"]
+        history.append(
+            f"Iteration {iteration + 1}: {path} fix of {len(analysis_report['bugs'])} bug(s) -> "
+            f"{status}, {len(validation.get('remaining_bugs') or [])} remaining: {validation.get('summary', '')}"
+        )
         
         if status == "FIXED":
             print(f"\n🟢 Bugs fixed successfully in {iteration + 1} iteration(s)\n")
             return current_code
         
-        # Prepare for next iteration
-        print("\n🟡 Validation failed. Retrying with updated analysis...")
-        print(f"Validation summary: {validation['summary']}")
+        if revisited:
+            # No change or a cycle: repeating the same step would reproduce it
+            record_retry("pipeline", "revisit")
+            strategy = _next_strategy(state)
+            if strategy is None:
+                print("\n🔴 Repair loop returned to a code state where every strategy was tried. Stopping")
+                return current_code
+            print(f"\n🟡 Repair loop returned to a previous code state. Switching to {strategy} strategy...")
+        else:
+            # Prepare for next iteration
+            print("\n🟡 Validation failed. Retrying with updated analysis...")
+            print(f"Validation summary: {validation['summary']}")
         
-        prev_analysis = analysis_report
-        analysis_report = new_iteration_analyze_problem(
-            current_code,
-            validation,
-            prev_analysis
-        )
+        if "analysis" not in state:
+            prev_analysis = analysis_report
+            with stage_timer("reanalysis"):
+                state["analysis"] = _route(current_code, await checkpointed(
+                    step + "reanalysis",
+                    lambda: new_iteration_analyze_problem_async(
+                        current_code,
+                        validation,
+                        prev_analysis,
+                        previous_code=attempt_input,
+                        history=history
+                    )
+                ))
+        analysis_report = state["analysis"]
+        forced = revisited
+        if revisited:
+            analysis_report = {**analysis_report, "complexity": strategy}
     
     print(f"\n🔴 Failed to fix bugs after {max_iterations} iterations")
     return current_code
@@ -0,0 +1,14 @@
+"""Multi-file project mode: import graph, analysis index and incremental runs."""
+
+from .graph import ModuleInfo, ProjectGraph, build_project_graph
+from .index import AnalysisIndex
+from .runner import debug_project, debug_project_async
+
+__all__ = [
+    "ModuleInfo",
+    "ProjectGraph",
+    "build_project_graph",
+    "AnalysisIndex",
+    "debug_project",
+    "debug_project_async",
+]
@@ -0,0 +1,295 @@
+"""
+Import and symbol-usage graph over a directory of Python modules.
+"""
+
+import ast
+import hashlib
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+from ..parsing.slicing import _class_skeleton, _signature
+
+# Directories never scanned for modules
+DEFAULT_EXCLUDE = (".git", ".hg", ".tox", ".nox", ".venv", "venv", "env", "build", "dist", "node_modules")
+
+# Longest read-only context of dependency signatures attached to a module
+MAX_CONTEXT_CHARS = 4000
+
+
+def file_digest(source: str) -> str:
+    """Content hash of a module's source."""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class ModuleInfo:
+    """
+    One module of the project.
+
+    Attributes:
+        name: Dotted module name (pkg/sub/__init__.py -> pkg.sub)
+        path: Path relative to the project root
+        source: File contents
+        digest: Content hash of the source
+        uses: Project modules this one imports, each mapped to the names it
+            uses from it (empty when only the module object is used)
+    """
+
+    def __init__(self, name: str, path: str, source: str):
+        self.name = name
+        self.path = path
+        self.source = source
+        self.digest = file_digest(source)
+        self.uses: Dict[str, Set[str]] = {}
+        try:
+            self.tree: Optional[ast.Module] = ast.parse(source)
+        except (SyntaxError, ValueError):
+            self.tree = None
+
+    @property
+    def is_package(self) -> bool:
+        return os.path.basename(self.path) == "__init__.py"
+
+
+class ProjectGraph:
+    """Modules of a project and the import edges between them."""
+
+    def __init__(self, root: str, modules: Dict[str, ModuleInfo]):
+        self.root = root
+        self.modules = modules
+        self._dependents: Dict[str, Set[str]] = {name: set() for name in modules}
+        for name, module in modules.items():
+            for dependency in module.uses:
+                self._dependents[dependency].add(name)
+
+    def update(self, name: str, source: str) -> None:
+        """Replace a module's source (e.g. after a repair) and relink its imports."""
+        old = self.modules[name]
+        for dependency in old.uses:
+            self._dependents[dependency].discard(name)
+        module = ModuleInfo(name, old.path, source)
+        self.modules[name] = module
+        _collect_uses(module, self.modules)
+        for dependency in module.uses:
+            self._dependents[dependency].add(name)
+
+    def dependencies(self, name: str) -> Set[str]:
+        """Project modules that name imports directly."""
+        return set(self.modules[name].uses)
+
+    def dependents(self, name: str) -> Set[str]:
+        """Project modules that import name directly."""
+        return set(self._dependents[name])
+
+    def affected(self, changed: Iterable[str]) -> Set[str]:
+        """Changed modules plus everything that transitively imports them."""
+        affected: Set[str] = set()
+        stack = list(changed)
+        while stack:
+            name = stack.pop()
+            if name not in affected:
+                affected.add(name)
+                stack.extend(self._dependents[name])
+        return affected
+
+    def layers(self) -> List[List[str]]:
+        """
+        Group modules so that each one comes after everything it imports.
+
+        Modules in the same layer are independent of each other, except
+        that the members of an import cycle are placed together in one
+        layer; modules that import a cycle come after all of its members.
+        """
+        edges = {name: set(module.uses) - {name} for name, module in self.modules.items()}
+        components = _strongly_connected(edges)
+        component_of = {name: index for index, members in enumerate(components) for name in members}
+        remaining = {
+            index: {component_of[dep] for name in members for dep in edges[name]} - {index}
+            for index, members in enumerate(components)
+        }
+        layers = []
+        while remaining:
+            ready = [index for index, deps in remaining.items() if not deps & remaining.keys()]
+            layers.append(sorted(name for index in ready for name in components[index]))
+            for index in ready:
+                del remaining[index]
+        return layers
+
+    def components(self, names: Iterable[str]) -> List[List[str]]:
+        """Split names into import cycles among them; modules outside any cycle stand alone."""
+        names = set(names)
+        return _strongly_connected({
+            name: (set(self.modules[name].uses) - {name}) & names for name in names
+        })
+
+    def context(self, name: str) -> str:
+        """
+        Read-only signatures of what name uses from other project modules.
+
+        Returns:
+            Signatures grouped by module, truncated to MAX_CONTEXT_CHARS
+        """
+        parts = []
+        for dependency, symbols in sorted(self.modules[name].uses.items()):
+            tree = self.modules[dependency].tree
+            if tree is None:
+                continue
+            signatures = []
+            for node in tree.body:
+                node_name = getattr(node, "name", None)
+                if node_name is None or (symbols and node_name not in symbols):
+                    continue
+                if isinstance(node, ast.ClassDef):
+                    signatures.append(_class_skeleton(node, set()))
+                elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    signatures.append(_signature(node))
+            if signatures:
+                parts.append(f"# from {dependency} ({self.modules[dependency].path})\n" + "\n\n".join(signatures))
+        text = "\n\n".join(parts)
+        if len(text) > MAX_CONTEXT_CHARS:
+            text = text[:MAX_CONTEXT_CHARS].rsplit("\n", 1)[0] + "\n# ... (truncated)"
+        return text
+
+
+def _strongly_connected(edges: Dict[str, Set[str]]) -> List[List[str]]:
+    """Strongly connected components of a dependency graph (iterative Tarjan)."""
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    components = []
+    for root in sorted(edges):
+        if root in index:
+            continue
+        work = [(root, iter(sorted(edges[root])))]
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            name, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = len(index)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(sorted(edges[successor]))))
+                    break
+                if successor in on_stack:
+                    lowlink[name] = min(lowlink[name], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[name])
+                if lowlink[name] == index[name]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == name:
+                            break
+                    components.append(sorted(members))
+    return components
+
+
+def _module_name(path: str) -> str:
+    parts = path[:-3].split(os.sep)
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def _resolve(name: str, modules: Dict[str, ModuleInfo]) -> Optional[str]:
+    """Longest project module that name (a dotted import path) refers to."""
+    while name:
+        if name in modules:
+            return name
+        name = name.rpartition(".")[0]
+    return None
+
+
+def _absolute(module: ModuleInfo, node: ast.ImportFrom) -> str:
+    if not node.level:
+        return node.module or ""
+    package = module.name.split(".")
+    if not module.is_package:
+        package = package[:-1]
+    if node.level > 1:
+        package = package[:len(package) - node.level + 1]
+    return ".".join(package + ([node.module] if node.module else []))
+
+
+def _collect_uses(module: ModuleInfo, modules: Dict[str, ModuleInfo]) -> None:
+    if module.tree is None:
+        return
+    aliases: Dict[str, str] = {}
+
+    def use(target: Optional[str], symbol: Optional[str] = None) -> None:
+        if target is None or target == module.name:
+            return
+        symbols = module.uses.setdefault(target, set())
+        if symbol:
+            symbols.add(symbol)
+
+    for node in ast.walk(module.tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                target = _resolve(alias.name, modules)
+                use(target)
+                if alias.asname and target is not None:
+                    aliases[alias.asname] = target
+                elif alias.name.split(".")[0] in modules:
+                    # "import pkg.mod" binds pkg
+                    aliases[alias.name.split(".")[0]] = alias.name.split(".")[0]
+        elif isinstance(node, ast.ImportFrom):
+            base = _absolute(module, node)
+            for alias in node.names:
+                submodule = f"{base}.{alias.name}" if base else alias.name
+                if submodule in modules:
+                    # from package import module
+                    use(submodule)
+                    aliases[alias.asname or alias.name] = submodule
+                elif alias.name != "*":
+                    use(_resolve(base, modules), alias.name)
+                else:
+                    use(_resolve(base, modules))
+
+    # module.attr uses narrow a plain "import module" to the names it touches
+    for node in ast.walk(module.tree):
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+            target = aliases.get(node.value.id)
+            if target is not None:
+                use(target, node.attr)
+
+
+def build_project_graph(root: str, exclude: Iterable[str] = DEFAULT_EXCLUDE) -> ProjectGraph:
+    """
+    Scan a directory for Python modules and link them by their imports.
+
+    Args:
+        root: Project directory
+        exclude: Directory names to skip (hidden directories are always skipped)
+
+    Returns:
+        ProjectGraph of every module under root
+    """
+    root = os.path.abspath(root)
+    excluded = set(exclude)
+    modules: Dict[str, ModuleInfo] = {}
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = sorted(
+            d for d in subdirectories
+            if d not in excluded and not d.startswith(".") and d != "__pycache__"
+        )
+        for filename in sorted(files):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.relpath(os.path.join(directory, filename), root)
+            with open(os.path.join(root, path), encoding="utf-8", errors="replace") as handle:
+                source = handle.read()
+            name = _module_name(path)
+            if name:
+                modules[name] = ModuleInfo(name, path, source)
+    for module in modules.values():
+        _collect_uses(module, modules)
+    return ProjectGraph(root, modules)
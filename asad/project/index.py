@@ -0,0 +1,94 @@
+"""
+Persistent per-file analysis index for project runs.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class AnalysisIndex:
+    """SQLite store of each file's last analysis and repair, keyed by path and content hash."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                analysis TEXT NOT NULL,
+                repair TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+        if "repair" not in columns:
+            self._conn.execute("ALTER TABLE files ADD COLUMN repair TEXT")
+        self._conn.commit()
+
+    def get(self, path: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Look up a file's last indexed analysis.
+
+        Returns:
+            (digest the analysis was made for, analysis report), or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, analysis FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, path: str, digest: str, analysis: Dict[str, Any]) -> None:
+        """Record the analysis of a file's content (forgetting any earlier repair)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, digest, analysis, updated_at) VALUES (?, ?, ?, ?)",
+                (path, digest, json.dumps(analysis), time.time()),
+            )
+            self._conn.commit()
+
+    def get_repair(self, path: str, digest: str) -> Optional[str]:
+        """Repaired code recorded for this exact content, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT repair FROM files WHERE path = ? AND digest = ?", (path, digest)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_repair(self, path: str, digest: str, fixed_code: str) -> None:
+        """Record the outcome of repairing a file's indexed content."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET repair = ?, updated_at = ? WHERE path = ? AND digest = ?",
+                (fixed_code, time.time(), path, digest),
+            )
+            self._conn.commit()
+
+    def prune(self, paths: Any) -> None:
+        """Forget files that no longer exist in the project."""
+        keep = set(paths)
+        with self._lock:
+            stale = [
+                (path,) for (path,) in self._conn.execute("SELECT path FROM files")
+                if path not in keep
+            ]
+            self._conn.executemany("DELETE FROM files WHERE path = ?", stale)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
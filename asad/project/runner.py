@@ -0,0 +1,171 @@
+"""
+Project-level debugging: incremental analysis and dependency-ordered repairs.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from ..agents.analysis import analyze_problem_async
+from ..config import get_project_config
+from ..llm import count_llm_calls
+from ..pipeline import adaptive_debugger_async
+from ..runtime import run_sync
+from .graph import DEFAULT_EXCLUDE, ProjectGraph, build_project_graph
+from .index import AnalysisIndex
+
+
+def debug_project(
+    root: str,
+    max_iterations: int = 5,
+    write: bool = False,
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Debug every module of a Python project directory.
+
+    The run:
+    1. Builds the import graph of the modules under root
+    2. Re-analyzes only modules whose content changed since the last run,
+       plus every module that imports them; the rest reuse their indexed
+       analysis (ASAD_PROJECT_INDEX)
+    3. Repairs modules with bugs in dependency order, so each module is
+       analyzed and repaired against its already repaired dependencies;
+       members of an import cycle are processed one after another
+    
+    The outcome of each repair is indexed too, so a module whose content
+    and dependencies did not change reuses its recorded repair instead of
+    running the repair loop again.
+
+    Each analysis sees the signatures of what the module uses from other
+    project modules, so bugs that cross module boundaries can be found.
+
+    Args:
+        root: Project directory
+        max_iterations: Maximum repair attempts per module
+        write: Write repaired modules back to their files
+        max_workers: Modules processed at once (defaults to ASAD_PROJECT_WORKERS)
+
+    Returns:
+        Per-module results in processing order under "modules", each with
+        module, path, analyzed (fresh vs. reused analysis), repair_reused,
+        bugs, changed, fixed_code and llm_calls, plus run totals
+    """
+    return run_sync(debug_project_async(root, max_iterations, write, max_workers))
+
+
+async def debug_project_async(
+    root: str,
+    max_iterations: int = 5,
+    write: bool = False,
+    max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """Async variant of debug_project()."""
+    start = time.perf_counter()
+    config = get_project_config(root)
+    graph = build_project_graph(root, [*DEFAULT_EXCLUDE, *config["exclude"]])
+    index = AnalysisIndex(config["index"])
+    try:
+        indexed = {name: index.get(module.path) for name, module in graph.modules.items()}
+        changed = {
+            name for name, module in graph.modules.items()
+            if indexed[name] is None or indexed[name][0] != module.digest
+        }
+        stale = graph.affected(changed)
+        layers = graph.layers()
+        print(
+            f"\n[Project] {len(graph.modules)} modules in {len(layers)} layers: "
+            f"{len(changed)} changed, {len(stale)} to analyze"
+        )
+
+        semaphore = asyncio.Semaphore(max_workers or config["workers"])
+        results = []
+        for layer in layers:
+            for group in await asyncio.gather(*(
+                _debug_cycle(graph, index, indexed, stale, members, max_iterations, write, semaphore)
+                for members in graph.components(layer)
+            )):
+                results.extend(group)
+        index.prune(module.path for module in graph.modules.values())
+    finally:
+        index.close()
+
+    return {
+        "modules": results,
+        "analyzed": sum(result["analyzed"] for result in results),
+        "reused": sum(not result["analyzed"] for result in results),
+        "repaired": sum(result["changed"] for result in results),
+        "llm_calls": sum(result["llm_calls"] for result in results),
+        "latency": time.perf_counter() - start,
+    }
+
+
+async def _debug_cycle(
+    graph: ProjectGraph,
+    index: AnalysisIndex,
+    indexed: Dict[str, Any],
+    stale: Set[str],
+    members: List[str],
+    max_iterations: int,
+    write: bool,
+    semaphore: asyncio.Semaphore
+) -> List[Dict[str, Any]]:
+    # One at a time, so a repaired member marks the next ones stale before they start
+    return [
+        await _debug_module(graph, index, indexed, stale, name, max_iterations, write, semaphore)
+        for name in members
+    ]
+
+
+async def _debug_module(
+    graph: ProjectGraph,
+    index: AnalysisIndex,
+    indexed: Dict[str, Any],
+    stale: Set[str],
+    name: str,
+    max_iterations: int,
+    write: bool,
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    module = graph.modules[name]
+    async with semaphore:
+        with count_llm_calls() as counter:
+            analyzed = name in stale
+            if analyzed:
+                analysis = await analyze_problem_async(module.source, context=graph.context(name))
+                index.set(module.path, module.digest, analysis)
+            else:
+                analysis = indexed[name][1]
+
+            fixed_code = module.source
+            repair = None if analyzed else index.get_repair(module.path, module.digest)
+            if repair is not None:
+                fixed_code = repair
+            elif analysis.get("bugs"):
+                print(f"\n[Project] Repairing {module.path} ({len(analysis['bugs'])} bugs)")
+                fixed_code = await adaptive_debugger_async(
+                    module.source, max_iterations, analysis_report=analysis
+                )
+                index.set_repair(module.path, module.digest, fixed_code)
+
+    changed = fixed_code != module.source
+    if changed:
+        # Modules importing this one see the repaired version and are re-analyzed
+        # (a reused repair was already seen by their indexed analyses)
+        graph.update(name, fixed_code)
+        if repair is None:
+            stale.update(graph.affected([name]) - {name})
+        if write:
+            with open(os.path.join(graph.root, module.path), "w", encoding="utf-8") as handle:
+                handle.write(fixed_code)
+    return {
+        "module": name,
+        "path": module.path,
+        "analyzed": analyzed,
+        "repair_reused": repair is not None,
+        "bugs": len(analysis.get("bugs") or []),
+        "changed": changed,
+        "fixed_code": fixed_code,
+        "llm_calls": counter["calls"],
+    }
@@ -0,0 +1,205 @@
+"""
+Deterministic static complexity router built on ast and symtable.
+
+Routing between the SIMPLE and COMPLEX repair paths is decided locally from
+structural features of the code; the LLM's own classification is only used
+to break ties when the static score falls in the ambiguous band.
+"""
+
+import ast
+import symtable
+from typing import Any, Dict, Optional, Set
+
+CONCURRENCY_MODULES = {
+    "threading",
+    "multiprocessing",
+    "asyncio",
+    "concurrent",
+    "queue",
+    "subprocess",
+}
+LOCK_NAMES = {"Lock", "RLock", "Semaphore", "BoundedSemaphore", "Condition", "Event", "Barrier"}
+NESTING_NODES = (
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+    ast.If,
+    ast.For,
+    ast.AsyncFor,
+    ast.While,
+    ast.With,
+    ast.AsyncWith,
+    ast.Try,
+)
+
+# Score bands: <= SIMPLE_MAX is SIMPLE, >= COMPLEX_MIN is COMPLEX, in between is a tie
+SIMPLE_MAX = 1
+COMPLEX_MIN = 4
+
+
+def _call_name(node: ast.Call) -> Optional[str]:
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+
+def _shared_globals(code: str, module_names: Set[str]) -> int:
+    """Count module-level names referenced by two or more functions."""
+    try:
+        table = symtable.symtable(code, "<asad>", "exec")
+    except SyntaxError:
+        return 0
+
+    users: Dict[str, int] = {}
+
+    def visit(scope: symtable.SymbolTable) -> None:
+        for child in scope.get_children():
+            if child.get_type() == "function":
+                for symbol in child.get_symbols():
+                    name = symbol.get_name()
+                    if symbol.is_global() and name in module_names:
+                        users[name] = users.get(name, 0) + 1
+            visit(child)
+
+    visit(table)
+    return sum(1 for count in users.values() if count >= 2)
+
+
+def extract_features(code: str) -> Dict[str, Any]:
+    """
+    Compute structural features that indicate debugging complexity.
+
+    Args:
+        code: Python source code
+
+    Returns:
+        Feature dictionary (syntax validity, function/class counts, coupling,
+        concurrency use, shared globals, mutable defaults, nesting depth)
+    """
+    features = {
+        "syntax_valid": True,
+        "lines": len(code.splitlines()),
+        "function_count": 0,
+        "class_count": 0,
+        "coupling": 0,
+        "uses_concurrency": False,
+        "uses_locks": False,
+        "shared_globals": 0,
+        "mutable_defaults": 0,
+        "max_nesting_depth": 0,
+    }
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        features["syntax_valid"] = False
+        return features
+
+    # Single iterative pass: (node, enclosing function name, nesting depth)
+    defined = set()
+    calls = []
+    stack = [(tree, None, 0)]
+    while stack:
+        node, owner, depth = stack.pop()
+        features["max_nesting_depth"] = max(features["max_nesting_depth"], depth)
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            features["function_count"] += 1
+            defaults = node.args.defaults + [d for d in node.args.kw_defaults if d is not None]
+            features["mutable_defaults"] += sum(
+                isinstance(d, (ast.List, ast.Dict, ast.Set)) for d in defaults
+            )
+            defined.add(node.name)
+            owner = node.name
+        elif isinstance(node, ast.ClassDef):
+            features["class_count"] += 1
+            defined.add(node.name)
+        elif isinstance(node, ast.Call):
+            name = _call_name(node)
+            if name in LOCK_NAMES:
+                features["uses_locks"] = True
+            if owner and name and name != owner:
+                calls.append((owner, name))
+        elif isinstance(node, ast.Import):
+            if any(alias.name.split(".")[0] in CONCURRENCY_MODULES for alias in node.names):
+                features["uses_concurrency"] = True
+        elif isinstance(node, ast.ImportFrom):
+            if (node.module or "").split(".")[0] in CONCURRENCY_MODULES:
+                features["uses_concurrency"] = True
+
+        for child in ast.iter_child_nodes(node):
+            child_depth = depth + 1 if isinstance(child, NESTING_NODES) else depth
+            stack.append((child, owner, child_depth))
+
+    # Coupling: distinct caller -> callee edges between locally defined callables
+    edges = {(owner, name) for owner, name in calls if name in defined}
+    features["coupling"] = len(edges)
+
+    module_names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            module_names.update(t.id for t in targets if isinstance(t, ast.Name))
+    features["shared_globals"] = _shared_globals(code, module_names)
+    return features
+
+
+def complexity_score(features: Dict[str, Any]) -> int:
+    """
+    Turn structural features into an integer complexity score.
+
+    Syntax errors score 0: they are isolated and fixed in a single pass.
+
+    Args:
+        features: Output of extract_features()
+
+    Returns:
+        Non-negative score; higher means more coordination is needed
+    """
+    if not features["syntax_valid"]:
+        return 0
+    score = 0
+    if features["uses_concurrency"] or features["uses_locks"]:
+        score += 3
+    if features["coupling"] >= 3:
+        score += 2
+    elif features["coupling"] >= 1:
+        score += 1
+    if features["shared_globals"]:
+        score += 2
+    if features["function_count"] + features["class_count"] >= 5:
+        score += 1
+    if features["mutable_defaults"]:
+        score += 1
+    if features["max_nesting_depth"] >= 5:
+        score += 1
+    return score
+
+
+def route_complexity(code: str, llm_label: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Classify a debugging task as SIMPLE or COMPLEX without calling an LLM.
+
+    Args:
+        code: Python source code to route
+        llm_label: Optional LLM classification used only as a tie-breaker
+
+    Returns:
+        Routing decision with complexity, score, source ("static"/"llm")
+        and the extracted features
+    """
+    features = extract_features(code)
+    score = complexity_score(features)
+
+    if score <= SIMPLE_MAX:
+        complexity, source = "SIMPLE", "static"
+    elif score >= COMPLEX_MIN:
+        complexity, source = "COMPLEX", "static"
+    elif llm_label in ("SIMPLE", "COMPLEX"):
+        complexity, source = llm_label, "llm"
+    else:
+        complexity, source = ("COMPLEX" if score >= 3 else "SIMPLE"), "static"
+
+    return {"complexity": complexity, "score": score, "source": source, "features": features}
+
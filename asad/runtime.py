@@ -0,0 +1,84 @@
+"""
+Background event loop used to run the async pipeline from synchronous code.
+
+Synchronous entry points submit their coroutine to one long-lived loop, so
+async SDK clients and their connection pools survive between calls and the
+sync API also works from threads that already run an event loop.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # The loop thread does not survive fork(); children start their own
+    global _loop, _lock
+    _loop = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it on first use."""
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_loop.run_forever, name="asad-event-loop", daemon=True
+            )
+            thread.start()
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine on the background loop and block until it finishes.
+
+    The caller's context variables are copied into the task, so per-call
+    state (counters, metrics labels) set by the caller is visible inside.
+
+    Args:
+        coro: Coroutine to execute
+
+    Returns:
+        The coroutine's result (exceptions are re-raised in the caller)
+    """
+    loop = get_loop()
+    context = contextvars.copy_context()
+    result: concurrent.futures.Future = concurrent.futures.Future()
+    task_ref = []
+
+    def _transfer(task: asyncio.Task) -> None:
+        if task.cancelled():
+            result.cancel()
+        elif task.exception() is not None:
+            result.set_exception(task.exception())
+        else:
+            result.set_result(task.result())
+
+    def _start() -> None:
+        if not result.set_running_or_notify_cancel():
+            coro.close()
+            return
+        task = context.run(loop.create_task, coro)
+        task_ref.append(task)
+        task.add_done_callback(_transfer)
+
+    loop.call_soon_threadsafe(_start)
+    try:
+        return result.result()
+    except BaseException:
+        if task_ref and not task_ref[0].done():
+            loop.call_soon_threadsafe(task_ref[0].cancel)
+        raise
@@ -0,0 +1,246 @@
+"""
+Execution sandbox backed by a pool of warm interpreter processes.
+
+Each worker is a long-lived Python process running asad/_sandbox_worker.py.
+A check costs one fork inside an already-started interpreter instead of a
+fresh interpreter start-up or an LLM round trip.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+from .config import get_validation_config
+
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_sandbox_worker.py")
+
+# Extra time the parent waits beyond the worker's own wall-time limit
+RESPONSE_GRACE = 2.0
+
+
+class SandboxWorker:
+    """One warm interpreter process speaking JSON lines over stdin/stdout."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, WORKER_PATH],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(target=self._read_lines, daemon=True).start()
+        self._receive(timeout=30)  # wait for the ready handshake
+
+    def _read_lines(self) -> None:
+        for line in self.process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _receive(self, timeout: float) -> Dict[str, Any]:
+        line = self._lines.get(timeout=timeout)
+        if line is None:
+            raise RuntimeError("Sandbox worker exited unexpectedly")
+        return json.loads(line)
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one execution request and wait for its result."""
+        self.process.stdin.write(json.dumps(request) + "\n")
+        self.process.stdin.flush()
+        return self._receive(timeout=request["timeout"] + RESPONSE_GRACE)
+
+    def kill(self) -> None:
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+
+
+class SandboxPool:
+    """Fixed-size pool of pre-started sandbox workers."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        timeout: float = 5.0,
+        cpu_seconds: int = 5,
+        memory_bytes: int = 2048 * 1024 * 1024,
+        file_bytes: int = 16 * 1024 * 1024,
+    ):
+        self.limits = {
+            "timeout": timeout,
+            "cpu_seconds": cpu_seconds,
+            "memory_bytes": memory_bytes,
+            "file_bytes": file_bytes,
+        }
+        self._idle: "queue.Queue[SandboxWorker]" = queue.Queue()
+        for _ in range(size):
+            self._idle.put(SandboxWorker())
+
+    def run(self, code: str) -> Dict[str, Any]:
+        """
+        Execute code in a warm worker under the pool's resource limits.
+
+        Args:
+            code: Python source to execute as __main__
+
+        Returns:
+            {"ok": bool, "error": None or {type, message, lineno, function,
+            traceback}, "timed_out": bool}
+        """
+        worker = self._idle.get()
+        try:
+            if not worker.alive():
+                worker = SandboxWorker()
+            result = worker.run({"code": code, **self.limits})
+        except (queue.Empty, RuntimeError, OSError, ValueError) as exc:
+            # Hung or dead worker: replace it and report the failure
+            worker.kill()
+            worker = SandboxWorker()
+            timed_out = isinstance(exc, queue.Empty)
+            result = {"ok": False, "timed_out": timed_out, "error": {
+                "type": "TimeoutError" if timed_out else "SandboxError",
+                "message": (
+                    f"Execution exceeded {self.limits['timeout']:g}s wall-time limit"
+                    if timed_out else str(exc)
+                ),
+                "lineno": None, "function": None, "traceback": "",
+            }}
+        finally:
+            self._idle.put(worker)
+        result.setdefault("timed_out", False)
+        return result
+
+    async def run_async(self, code: str) -> Dict[str, Any]:
+        """Async variant of run() that waits in a thread."""
+        return await asyncio.to_thread(self.run, code)
+
+    def close(self) -> None:
+        """Terminate all idle workers."""
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                return
+
+
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # Worker pipes belong to the parent process
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """Return the process-wide sandbox pool, starting its workers on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            config = get_validation_config()
+            _pool = SandboxPool(
+                size=config["workers"],
+                timeout=config["timeout"],
+                cpu_seconds=config["cpu_seconds"],
+                memory_bytes=config["memory_bytes"],
+            )
+        return _pool
+
+
+def check_syntax(code: str) -> Optional[Dict[str, Any]]:
+    """
+    Compile code locally without executing it.
+
+    Returns:
+        None if the code compiles, otherwise an error description
+    """
+    try:
+        compile(code, "<candidate>", "exec")
+    except SyntaxError as exc:
+        return {
+            "type": type(exc).__name__,
+            "message": exc.msg,
+            "lineno": exc.lineno,
+            "function": None,
+            "traceback": "",
+        }
+    except ValueError as exc:  # e.g. null bytes in source
+        return {"type": "ValueError", "message": str(exc), "lineno": None, "function": None, "traceback": ""}
+    return None
+
+
+def execute_code(code: str) -> Dict[str, Any]:
+    """
+    Compile code, then run it in the shared sandbox pool.
+
+    Args:
+        code: Python source to check
+
+    Returns:
+        Execution result as returned by SandboxPool.run()
+    """
+    error = check_syntax(code)
+    if error is not None:
+        return {"ok": False, "error": error, "timed_out": False}
+    return get_sandbox_pool().run(code)
+
+
+async def execute_code_async(code: str) -> Dict[str, Any]:
+    """Async variant of execute_code()."""
+    error = check_syntax(code)
+    if error is not None:
+        return {"ok": False, "error": error, "timed_out": False}
+    return await get_sandbox_pool().run_async(code)
+
+
+def execution_to_validation(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map an execution result to the validator's {status, summary, remaining_bugs} shape.
+
+    Args:
+        result: Output of execute_code()
+
+    Returns:
+        Validation dictionary matching validate_solution()
+    """
+    if result["ok"]:
+        return {
+            "status": "FIXED",
+            "summary": "Code compiled and executed without errors",
+            "remaining_bugs": [],
+        }
+
+    error = result["error"]
+    location = error.get("function")
+    if location in (None, "<module>"):
+        location = "module level"
+    if error.get("lineno"):
+        location = f"{location}, line {error['lineno']}"
+    explanation = error["message"]
+    if error.get("traceback"):
+        explanation = f"{explanation}\n{error['traceback'].strip()}"
+    return {
+        "status": "NOT FIXED",
+        "summary": f"Execution failed with {error['type']}: {error['message']}",
+        "remaining_bugs": [{
+            "type": error["type"],
+            "location": location,
+            "explanation": explanation,
+        }],
+    }
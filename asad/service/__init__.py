@@ -0,0 +1,13 @@
+"""HTTP debugging service: bounded job queue, asyncio worker pool and progress streaming."""
+
+from .jobs import Job, JobQueue, QueueFull
+from .http import DebugService, run_service, serve
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "QueueFull",
+    "DebugService",
+    "run_service",
+    "serve",
+]
@@ -0,0 +1,25 @@
+"""
+Run the debugging service locally:
+
+    python -m asad.service --port 8080 --workers 4 --queue-size 64
+"""
+
+import argparse
+
+from ..config import load_env
+from .http import run_service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ASAD debugging service")
+    parser.add_argument("--host", help="interface to listen on (ASAD_SERVICE_HOST)")
+    parser.add_argument("--port", type=int, help="port to listen on (ASAD_SERVICE_PORT)")
+    parser.add_argument("--workers", type=int, help="jobs processed at once (ASAD_SERVICE_WORKERS)")
+    parser.add_argument("--queue-size", type=int, help="waiting jobs before 429 (ASAD_SERVICE_QUEUE_SIZE)")
+    args = parser.parse_args()
+    load_env()
+    run_service(args.host, args.port, args.workers, args.queue_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+HTTP front end of the debugging service, built on asyncio streams.
+
+Endpoints:
+    POST   /jobs              Submit {"code": ..., "max_iterations": ...}; 202 with the job,
+                              or 429 with Retry-After when the queue is full
+    GET    /jobs/{id}         Job status; ?after=N&wait=S long-polls up to S seconds
+                              for events with seq >= N
+    GET    /jobs/{id}/events  Server-sent events of the job's progress until it finishes;
+                              ?after=N starts at seq N, a Last-Event-ID header after it
+    DELETE /jobs/{id}         Cancel a queued or running job
+    GET    /metrics           Prometheus text: service queue metrics and pipeline metrics
+    GET    /health            Liveness check
+"""
+
+import asyncio
+import json
+import math
+from http import HTTPStatus
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from ..config import get_service_config
+from ..metrics import get_metrics
+from .jobs import Job, JobQueue, QueueFull
+
+# Seconds a client gets to send its request line, headers and body
+READ_TIMEOUT = 30.0
+
+# Longest long-poll wait a client may ask for, and the SSE keep-alive interval
+MAX_WAIT = 60.0
+HEARTBEAT = 15.0
+
+
+class HTTPError(ValueError):
+    """An error answered with an HTTP status and a JSON {"error": message} body."""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class Request:
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path.rstrip("/") or "/"
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Dict[str, Any]:
+        try:
+            payload = json.loads(self.body or b"{}")
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise HTTPError(400, f"Invalid JSON body: {exc}") from None
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return payload
+
+    def number(self, name: str, default: float) -> float:
+        try:
+            value = float(self.query.get(name, default))
+        except ValueError:
+            value = math.nan
+        if not math.isfinite(value):
+            raise HTTPError(400, f"Query parameter {name} must be a number")
+        return value
+
+    def after(self) -> int:
+        """First event seq the client wants (?after=N, default 0)."""
+        return _seq(self.query.get("after", "0"), "Query parameter after")
+
+
+def _seq(value: str, what: str) -> int:
+    try:
+        seq = int(value)
+    except ValueError:
+        seq = -1
+    if seq < 0:
+        raise HTTPError(400, f"{what} must be a non-negative integer")
+    return seq
+
+
+class DebugService:
+    """
+    Serves a JobQueue over HTTP.
+
+    Each connection carries one request and is closed after the response,
+    except event streams, which stay open until their job finishes.
+    """
+
+    def __init__(self, jobs: JobQueue, max_body: int = 1024 * 1024):
+        self.jobs = jobs
+        self.max_body = max_body
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Start the workers and listen on host:port."""
+        await self.jobs.start()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def stop(self) -> None:
+        """Stop accepting connections and cancel unfinished jobs."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.jobs.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = await asyncio.wait_for(self._read_request(reader), READ_TIMEOUT)
+                await self._dispatch(request, writer)
+            except HTTPError as exc:
+                await _send_json(writer, exc.status, {"error": str(exc)}, exc.headers)
+            except asyncio.TimeoutError:
+                await _send_json(writer, 408, {"error": "Request not received in time"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Request:
+        line = (await reader.readline()).decode("latin-1").split()
+        if len(line) != 3:
+            raise HTTPError(400, "Malformed request line")
+        method, target, _ = line
+        headers = {}
+        while True:
+            header = (await reader.readline()).decode("latin-1")
+            if header in ("\r\n", "\n", ""):
+                break
+            name, _, value = header.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length") from None
+        if length > self.max_body:
+            raise HTTPError(413, f"Request body larger than {self.max_body} bytes")
+        body = await reader.readexactly(length) if length > 0 else b""
+        return Request(method.upper(), target, headers, body)
+
+    async def _dispatch(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        parts = request.path.strip("/").split("/")
+        route = (request.method, parts[0], len(parts))
+        if route == ("GET", "health", 1):
+            await _send_json(writer, 200, {"status": "ok", "queued": self.jobs.depth, "running": self.jobs.running})
+        elif route == ("GET", "metrics", 1):
+            text = self.jobs.metrics.to_prometheus() + get_metrics().to_prometheus()
+            await _send(writer, 200, text.encode("utf-8"), "text/plain; version=0.0.4")
+        elif route == ("POST", "jobs", 1):
+            await self._submit(request, writer)
+        elif route == ("GET", "jobs", 2):
+            job = self._job(parts[1])
+            after = request.after()
+            await job.wait(after, min(request.number("wait", 0), MAX_WAIT))
+            await _send_json(writer, 200, job.to_dict(after))
+        elif route == ("DELETE", "jobs", 2):
+            job = self._job(parts[1])
+            if job.done:
+                raise HTTPError(409, f"Job already {job.status}")
+            self.jobs.cancel(job.id)
+            await _send_json(writer, 202, job.to_dict())
+        elif route == ("GET", "jobs", 3) and parts[2] == "events":
+            await self._stream(self._job(parts[1]), request, writer)
+        elif parts[0] in ("health", "metrics", "jobs") and len(parts) <= 3:
+            raise HTTPError(405, f"{request.method} not allowed on {request.path}")
+        else:
+            raise HTTPError(404, f"No route for {request.path}")
+
+    async def _submit(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        payload = request.json()
+        code = payload.get("code")
+        if not isinstance(code, str) or not code.strip():
+            raise HTTPError(400, "Field 'code' must be a non-empty string")
+        max_iterations = payload.get("max_iterations")
+        if max_iterations is not None and (not isinstance(max_iterations, int) or max_iterations < 1):
+            raise HTTPError(400, "Field 'max_iterations' must be a positive integer")
+        try:
+            job = self.jobs.submit(code, max_iterations)
+        except QueueFull as exc:
+            raise HTTPError(429, str(exc), {"Retry-After": str(exc.retry_after)}) from None
+        await _send_json(writer, 202, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+    async def _stream(self, job: Job, request: Request, writer: asyncio.StreamWriter) -> None:
+        after = request.after()
+        if "last-event-id" in request.headers:
+            # A reconnecting client resumes after the last event it saw
+            after = _seq(request.headers["last-event-id"], "Last-Event-ID header") + 1
+        writer.write(_head(200, "text/event-stream", {"Cache-Control": "no-cache"}))
+        while True:
+            events = await job.wait(after, HEARTBEAT)
+            if not events:
+                writer.write(b": keep-alive\n\n")
+            for event in events:
+                writer.write(
+                    f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8")
+                )
+            after += len(events)
+            await writer.drain()
+            if job.done and after >= len(job.events):
+                return
+
+    def _job(self, job_id: str) -> Job:
+        job = self.jobs.jobs.get(job_id)
+        if job is None:
+            raise HTTPError(404, f"Unknown job: {job_id}")
+        return job
+
+
+def _head(status: int, content_type: str, headers: Optional[Dict[str, str]] = None, length: Optional[int] = None) -> bytes:
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", f"Content-Type: {content_type}", "Connection: close"]
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _send(
+    writer: asyncio.StreamWriter,
+    status: int,
+    body: bytes,
+    content_type: str,
+    headers: Optional[Dict[str, str]] = None
+) -> None:
+    writer.write(_head(status, content_type, headers, len(body)) + body)
+    await writer.drain()
+
+
+async def _send_json(
+    writer: asyncio.StreamWriter,
+    status: int,
+    payload: Any,
+    headers: Optional[Dict[str, str]] = None
+) -> None:
+    await _send(writer, status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+
+async def serve(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None
+) -> None:
+    """
+    Run the debugging service until cancelled.
+
+    Arguments default to the ASAD_SERVICE_* settings (see get_service_config()).
+    """
+    config = get_service_config()
+    service = DebugService(
+        JobQueue(
+            workers=workers or config["workers"],
+            queue_size=queue_size or config["queue_size"],
+            max_iterations=config["max_iterations"],
+            job_ttl=config["job_ttl"],
+        ),
+        max_body=config["max_body"],
+    )
+    server = await service.start(host or config["host"], port or config["port"])
+    address = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"\n[Service] Listening on {address} with {service.jobs.workers} workers")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+
+def run_service(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None
+) -> None:
+    """Blocking entry point of serve(); stops on Ctrl+C."""
+    try:
+        asyncio.run(serve(host, port, workers, queue_size))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,257 @@
+"""
+Bounded job queue and asyncio worker pool for the debugging service.
+"""
+
+import asyncio
+import math
+import time
+import traceback
+import uuid
+from typing import Any, Dict, List, Optional
+
+from ..llm import count_llm_calls
+from ..metrics import MetricsRegistry, watch_stages
+from ..pipeline import adaptive_debugger_async
+
+# Job states; the last three are final
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+
+
+class QueueFull(ValueError):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Job:
+    """
+    One debugging request and the progress events it has produced.
+
+    Events are dicts with seq (0-based position), type (queued, running,
+    stage, or the final state) and time, plus stage, event and elapsed for
+    stage events.
+    """
+
+    def __init__(self, code: str, max_iterations: int):
+        self.id = uuid.uuid4().hex
+        self.code = code
+        self.max_iterations = max_iterations
+        self.status = QUEUED
+        self.events: List[Dict[str, Any]] = []
+        self.fixed_code: Optional[str] = None
+        self.error: Optional[str] = None
+        self.llm_calls = 0
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._updated = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINAL_STATES
+
+    def publish(self, kind: str, **fields: Any) -> None:
+        """Append an event and wake everyone waiting for one."""
+        self.events.append({"seq": len(self.events), "type": kind, "time": time.time(), **fields})
+        updated, self._updated = self._updated, asyncio.Event()
+        updated.set()
+
+    async def wait(self, after: int, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Events from seq after onwards, waiting up to timeout seconds for one.
+
+        Returns at once if such events exist or the job has finished.
+        """
+        if len(self.events) <= after and not self.done:
+            try:
+                await asyncio.wait_for(self._updated.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.events[after:]
+
+    def to_dict(self, after: int = 0) -> Dict[str, Any]:
+        """JSON-ready view of the job with its events from seq after onwards."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "created": self.created,
+            "queue_wait": (self.started or self.finished or time.time()) - self.created,
+            "duration": (self.finished or time.time()) - self.started if self.started else None,
+            "llm_calls": self.llm_calls,
+            "fixed_code": self.fixed_code,
+            "error": self.error,
+            "events": self.events[after:],
+        }
+
+
+class JobQueue:
+    """
+    Debugging jobs drained from a bounded queue by a pool of asyncio workers.
+
+    Every pipeline runs as a task on the service's event loop, so a worker
+    holds no thread while it waits on LLM calls. Submissions beyond
+    queue_size waiting jobs are rejected with QueueFull.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        queue_size: int = 64,
+        max_iterations: int = 5,
+        job_ttl: float = 3600.0
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.max_iterations = max_iterations
+        self.job_ttl = job_ttl
+        self.jobs: Dict[str, Job] = {}
+        self.metrics = MetricsRegistry()
+        self.running = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Start the workers on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._update_gauges()
+
+    async def stop(self) -> None:
+        """Cancel the workers; running jobs end as cancelled."""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job in self.jobs.values():
+            if not job.done:
+                self._finish(job, CANCELLED)
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, code: str, max_iterations: Optional[int] = None) -> Job:
+        """
+        Queue a debugging job.
+
+        Args:
+            code: Buggy Python source
+            max_iterations: Repair attempts (defaults to the queue's setting)
+
+        Returns:
+            The queued Job
+
+        Raises:
+            QueueFull: queue_size jobs are already waiting
+        """
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() has not been called")
+        self._prune()
+        job = Job(code, max_iterations or self.max_iterations)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.metrics.inc("asad_service_jobs_total", {"status": "rejected"})
+            raise QueueFull(
+                f"Job queue is full ({self.queue_size} jobs waiting)", self.retry_after()
+            ) from None
+        self.jobs[job.id] = job
+        job.publish(QUEUED, position=self.depth)
+        self._update_gauges()
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; returns None for unknown IDs."""
+        job = self.jobs.get(job_id)
+        if job is None or job.done:
+            return job
+        if job._task is not None:
+            job._task.cancel()
+        else:
+            # Still queued: the worker that dequeues it skips it
+            self._finish(job, CANCELLED)
+        return job
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait: mean job time times queue turns ahead."""
+        histogram = self.metrics.snapshot()["histograms"].get("asad_service_job_duration_seconds")
+        mean = histogram[0]["sum"] / histogram[0]["count"] if histogram else 1.0
+        return max(1, math.ceil(mean * self.depth / self.workers))
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status == QUEUED:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+                self._update_gauges()
+
+    async def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        job.started = time.time()
+        self.running += 1
+        self._update_gauges()
+        self.metrics.observe("asad_service_queue_wait_seconds", {}, job.started - job.created)
+        job.publish(RUNNING)
+
+        loop = asyncio.get_running_loop()
+
+        def on_stage(stage: str, event: str, elapsed: float) -> None:
+            loop.call_soon_threadsafe(
+                lambda: job.publish("stage", stage=stage, event=event, elapsed=round(elapsed, 3))
+            )
+
+        async def debug() -> str:
+            with count_llm_calls() as counter, watch_stages(on_stage):
+                try:
+                    return await adaptive_debugger_async(job.code, job.max_iterations)
+                finally:
+                    job.llm_calls = counter["calls"]
+
+        job._task = asyncio.create_task(debug())
+        try:
+            job.fixed_code = await job._task
+            status = DONE
+        except asyncio.CancelledError:
+            job._task.cancel()
+            self._finish(job, CANCELLED)
+            if self._stopping:
+                raise
+            return
+        except Exception:
+            job.error = traceback.format_exc()
+            status = FAILED
+        finally:
+            self.running -= 1
+        self._finish(job, status)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished = time.time()
+        if job.started is not None:
+            self.metrics.observe("asad_service_job_duration_seconds", {}, job.finished - job.started)
+        self.metrics.inc("asad_service_jobs_total", {"status": status})
+        job.publish(status)
+        self._update_gauges()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.job_ttl
+        for job_id in [
+            job_id for job_id, job in self.jobs.items()
+            if job.done and job.finished < cutoff
+        ]:
+            del self.jobs[job_id]
+
+    def _update_gauges(self) -> None:
+        self.metrics.set("asad_service_queue_depth", {}, self.depth)
+        self.metrics.set("asad_service_jobs_running", {}, self.running)
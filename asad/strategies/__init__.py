@@ -1,6 +1,17 @@
 """Repair strategies for different bug complexity levels."""
 
-from .simple_fix import simple_fix
-from .multi_agent import multi_agent_fix
+from .simple_fix import simple_fix, simple_fix_async
+from .multi_agent import multi_agent_fix, multi_agent_fix_async
+from .speculative import speculative_fix, speculative_fix_async
+from .fused import fused_fix, fused_fix_async
 
-__all__ = ["simple_fix", "multi_agent_fix"]
+__all__ = [
+    "simple_fix",
+    "simple_fix_async",
+    "multi_agent_fix",
+    "multi_agent_fix_async",
+    "speculative_fix",
+    "speculative_fix_async",
+    "fused_fix",
+    "fused_fix_async",
+]
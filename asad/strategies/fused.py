@@ -0,0 +1,106 @@
+"""
+Fused strategy that analyzes, fixes and self-checks simple bugs in one call.
+"""
+
+from typing import Dict, Any
+
+from ..llm import call_llm_json, call_llm_json_async
+from ..sandbox import execute_code, execute_code_async, execution_to_validation
+
+FUSED_FALLBACK = {
+    "complexity": "SIMPLE",
+    "bugs": [],
+    "plan": "No plan generated",
+    "fixed_code": "",
+    "fix_explanation": "Fused repair failed",
+    "self_check": "NOT FIXED",
+}
+
+
+def fused_fix(code: str) -> Dict[str, Any]:
+    """
+    Analyze, repair and self-check code with a single LLM call.
+
+    The repair is accepted only if the model classifies the task as SIMPLE,
+    its self-check reports FIXED, and the fixed code compiles and runs in
+    the sandbox. Otherwise the caller falls back to the full pipeline and
+    can reuse the returned analysis fields in place of a separate analysis.
+
+    Args:
+        code: Buggy source code
+
+    Returns:
+        Analysis fields (complexity, bugs, plan), fixed code and explanation,
+        the local validation result and whether the repair was accepted
+    """
+    result = _complete(call_llm_json(_fused_prompt(code), stage="fused", fallback=dict(FUSED_FALLBACK)))
+    if not _candidate(code, result):
+        return {**result, "validation": None, "accepted": False}
+    validation = execution_to_validation(execute_code(result["fixed_code"]))
+    return {**result, "validation": validation, "accepted": validation["status"] == "FIXED"}
+
+
+async def fused_fix_async(code: str) -> Dict[str, Any]:
+    """Async variant of fused_fix()."""
+    result = _complete(await call_llm_json_async(
+        _fused_prompt(code), stage="fused", fallback=dict(FUSED_FALLBACK)
+    ))
+    if not _candidate(code, result):
+        return {**result, "validation": None, "accepted": False}
+    validation = execution_to_validation(await execute_code_async(result["fixed_code"]))
+    return {**result, "validation": validation, "accepted": validation["status"] == "FIXED"}
+
+
+def _complete(result: Any) -> Dict[str, Any]:
+    if not isinstance(result, dict):
+        return dict(FUSED_FALLBACK)
+    return {**FUSED_FALLBACK, **result}
+
+
+def _candidate(code: str, result: Dict[str, Any]) -> bool:
+    """Whether the fused answer is worth checking locally."""
+    fixed_code = result["fixed_code"]
+    return (
+        result["complexity"] == "SIMPLE"
+        and result["self_check"] == "FIXED"
+        and isinstance(fixed_code, str)
+        and fixed_code.strip() != ""
+        and fixed_code.strip() != code.strip()
+    )
+
+
+def _fused_prompt(code: str) -> str:
+    return f"""
+Role:
+    You are the Single-Pass Repair Agent. Your task is to analyze the given code, fix every
+    execution-blocking bug and check your own fix, all in one answer.
+
+Input:
+    Buggy code: {code}
+
+Instructions:
+1. Classify the debugging task as SIMPLE (few, isolated bugs such as a syntax error or a
+   one-line logic flaw) or COMPLEX (coupled bugs, concurrency or resource management issues).
+2. Locate each bug with its type, location and a brief explanation.
+3. If the task is SIMPLE, produce the fully corrected code. If it is COMPLEX, leave
+   "fixed_code" empty and write a step-by-step repair plan instead.
+4. Re-read your corrected code and report whether it now runs correctly.
+
+Your output in JSON format:
+{{
+  "complexity": "SIMPLE" or "COMPLEX",
+  "bugs": [
+    {{
+      "type": "string",
+      "location": "string",
+      "explanation": "string"
+    }}
+  ],
+  "plan": "string",
+  "fixed_code": "string",
+  "fix_explanation": "string",
+  "self_check": "FIXED" or "NOT FIXED"
+}}
+
+Do not write any text besides the JSON.
+"""
@@ -2,23 +2,37 @@
 Multi-agent strategy for complex bugs requiring coordinated repairs.
 """
 
-from typing import Dict, Any, List
-from ..agents import generate_agents, execute_agent, retry_execute_agent, task_review
+import asyncio
+import hashlib
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from ..agents import (
+    generate_agents_async,
+    execute_agent_async,
+    retry_execute_agent_async,
+    task_review_async,
+)
+from ..checkpoint import checkpointed, persist, restore
+from ..metrics import record_retry, stage_timer
+from ..parsing.merge import MergeConflict, merge3
+from ..parsing.slicing import agent_locations, target_spans
+from ..runtime import run_sync
 
 
 def multi_agent_fix(
     bugs: List[Any],
     plan: str,
     code: str,
-    max_review_attempts: int = 3
+    max_review_attempts: int = 3,
+    max_merge_retries: int = 2
 ) -> Dict[str, Any]:
     """
     Orchestrate multiple specialized agents to fix complex bugs.
     
     Process:
     1. Generate specialized agents based on bug types
-    2. Execute agents in dependency-aware order
-    3. Review each agent's output before proceeding
+    2. Execute independent agents concurrently along their dependency DAG
+    3. Review each agent's output before merging it
     4. Allow refinement attempts for failed repairs
     
     Args:
@@ -26,48 +40,180 @@ def multi_agent_fix(
         plan: Step-by-step repair instructions
         code: Buggy source code
         max_review_attempts: Maximum refinement attempts per agent
+        max_merge_retries: Re-runs allowed for an agent whose edit conflicts
+    
+    Returns:
+        Final fixed code after all agents complete successfully
+    """
+    return run_sync(multi_agent_fix_async(bugs, plan, code, max_review_attempts, max_merge_retries))
+
+
+async def multi_agent_fix_async(
+    bugs: List[Any],
+    plan: str,
+    code: str,
+    max_review_attempts: int = 3,
+    max_merge_retries: int = 2
+) -> Dict[str, Any]:
+    """
+    Async variant of multi_agent_fix().
+    
+    Agents form a dependency DAG: an agent waits for the agents it declares
+    in depends_on and for earlier agents whose target regions overlap its
+    own. Ready agents run concurrently on a snapshot of the current code and
+    each result is three-way merged into the shared code when it finishes;
+    an agent whose edit conflicts is re-run on the merged code.
+    
+    In a checkpointed run, the agent configuration, every execute and
+    review call and the merged code after each agent lands are saved, so
+    a resumed run continues after the agents that already landed.
+    
+    Args:
+        bugs: List of identified bugs
+        plan: Step-by-step repair instructions
+        code: Buggy source code
+        max_review_attempts: Maximum refinement attempts per agent
+        max_merge_retries: Re-runs allowed for an agent whose edit conflicts
     
     Returns:
         Final fixed code after all agents complete successfully
     """
     # Create specialized agents
-    agent_config = generate_agents(bugs, plan)
+    with stage_timer("management"):
+        agent_config = await checkpointed("management", lambda: generate_agents_async(bugs, plan))
     agent_profiles = {a["name"]: a for a in agent_config["agents"]}
-    execution_order = agent_config["execution_order"]
+    execution_order = []
+    for agent_name in agent_config["execution_order"]:
+        if agent_name not in agent_profiles:
+            print(f"	⚠️  Agent {agent_name} not found - skipping")
+        elif agent_name not in execution_order:
+            execution_order.append(agent_name)
     
     print(f"\n	Created {len(agent_profiles)} specialized agents")
     print(f"	Execution order: {' → '.join(execution_order)}")
     
+    dependencies = agent_dependencies(agent_profiles, execution_order, code)
     current_code = code
+    done, retries, running = set(), {}, {}
+    pending = list(execution_order)
     
-    # Execute agents in prioritized order
-    for agent_name in execution_order:
-        agent = agent_profiles.get(agent_name)
-        if not agent:
-            print(f"	⚠️  Agent {agent_name} not found - skipping")
-            continue
-        
-        print(f"\n	🔧 Executing agent: {agent_name} ({agent['role']})")
-        
-        # Review loop with refinement capability
-        for attempt in range(max_review_attempts):
-            if attempt == 0:
-                result = execute_agent(agent, current_code)
-            else:
-                print(f"	⟳ Refinement attempt {attempt + 1}/{max_review_attempts}")
-                result = retry_execute_agent(agent, current_code, review["feedback"])
-            
-            # Review agent's output
-            review = task_review(agent, result)
-            print(f"	✓ Review decision: {review['decision']}")
-            
-            if review["decision"] == "APPROVE":
-                current_code = result["fixed_code"]
-                print(f"	✅ Agent {agent_name} approved")
-                break
+    # Resumed run: continue after the agents whose edits already landed
+    progress = restore("agents")
+    if progress is not None:
+        current_code, done, retries = progress["code"], set(progress["done"]), progress["retries"]
+        pending = [name for name in execution_order if name not in done]
+        print(f"	♻️  Resuming after {len(done)} completed agents")
+    
+    try:
+        while pending or running:
+            # Launch every agent whose dependencies have landed
+            for agent_name in [n for n in pending if dependencies[n] <= done]:
+                pending.remove(agent_name)
+                task = asyncio.ensure_future(
+                    _run_agent(agent_profiles[agent_name], current_code, max_review_attempts)
+                )
+                running[task] = (agent_name, current_code)
             
-            if attempt == max_review_attempts - 1:
-                print(f"	⚠️  Max refinement attempts reached for {agent_name}")
-                current_code = result["fixed_code"]  # Use best attempt
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                agent_name, base = running.pop(task)
+                try:
+                    current_code = merge3(base, current_code, task.result())
+                except MergeConflict as exc:
+                    retries[agent_name] = retries.get(agent_name, 0) + 1
+                    record_retry("merge", "conflict")
+                    if retries[agent_name] > max_merge_retries:
+                        print(f"	⚠️  Dropping edit from {agent_name}: {exc}")
+                    else:
+                        print(f"	⟳ {agent_name} conflicts with a concurrent edit - re-running on merged code")
+                        # Re-run once the agents it may have raced with have landed
+                        dependencies[agent_name] |= {name for name, _ in running.values()}
+                        pending.append(agent_name)
+                        continue
+                done.add(agent_name)
+                persist("agents", {"code": current_code, "done": sorted(done), "retries": retries})
+    finally:
+        # Cancelled or failed: stop agents that are still running
+        for task in running:
+            task.cancel()
     
     return {"fixed_code": current_code, "fix_explanation": "Multi-agent repair completed"}
+
+
+def agent_dependencies(
+    agent_profiles: Dict[str, Dict[str, Any]],
+    execution_order: List[str],
+    code: str
+) -> Dict[str, Set[str]]:
+    """
+    Build the agent dependency DAG.
+    
+    An agent depends on the earlier agents (in execution_order) that it lists
+    in depends_on, and on earlier agents whose target regions overlap its own.
+    Agents whose targets cannot be resolved (e.g. the code does not parse)
+    depend on every earlier agent, which preserves the sequential order.
+    
+    Args:
+        agent_profiles: Agent profiles by name
+        execution_order: Prioritized agent names
+        code: Code the agents will repair
+    
+    Returns:
+        Mapping of agent name to the names it must wait for
+    """
+    spans = {
+        name: target_spans(code, agent_locations(agent_profiles[name]))
+        for name in execution_order
+    }
+    dependencies = {}
+    for position, name in enumerate(execution_order):
+        earlier = execution_order[:position]
+        declared = agent_profiles[name].get("depends_on") or []
+        if isinstance(declared, str):
+            declared = [declared]
+        dependencies[name] = {
+            other for other in earlier
+            if other in declared or _spans_overlap(spans[name], spans[other])
+        }
+    return dependencies
+
+
+def _spans_overlap(a: Optional[List[Tuple[int, int]]], b: Optional[List[Tuple[int, int]]]) -> bool:
+    if a is None or b is None:
+        return True
+    return any(start <= other_end and other_start <= end for start, end in a for other_start, other_end in b)
+
+
+async def _run_agent(agent: Dict[str, Any], code: str, max_review_attempts: int) -> str:
+    """Run one agent's execute/review loop on code and return its best attempt."""
+    agent_name = agent["name"]
+    print(f"\n	🔧 Executing agent: {agent_name} ({agent['role']})")
+    # Checkpoint keys include the code the agent starts from, so a re-run on merged code starts fresh
+    step = f"agent/{agent_name}/{hashlib.sha256(code.encode('utf-8')).hexdigest()[:12]}"
+    
+    # Review loop with refinement capability
+    for attempt in range(max_review_attempts):
+        with stage_timer("execute"):
+            if attempt == 0:
+                result = await checkpointed(f"{step}/execute-0", lambda: execute_agent_async(agent, code))
+            else:
+                print(f"	⟳ Refinement attempt {attempt + 1}/{max_review_attempts} ({agent_name})")
+                record_retry("execution", "refine")
+                result = await checkpointed(
+                    f"{step}/execute-{attempt}",
+                    lambda: retry_execute_agent_async(agent, code, review["feedback"])
+                )
+        
+        # Review agent's output
+        with stage_timer("review"):
+            review = await checkpointed(f"{step}/review-{attempt}", lambda: task_review_async(agent, result))
+        print(f"	✓ Review decision for {agent_name}: {review['decision']}")
+        
+        if review["decision"] == "APPROVE":
+            print(f"	✅ Agent {agent_name} approved")
+            break
+        
+        if attempt == max_review_attempts - 1:
+            print(f"	⚠️  Max refinement attempts reached for {agent_name}")
+    
+    return result["fixed_code"]  # Approved or best attempt
@@ -4,8 +4,8 @@ Fast-path strategy for fixing simple bugs with a single repair pass.
 
 from typing import Dict, Any, List
 
-from ..llm import call_llm
-from ..parsing import safe_json_parse
+from ..agents.execution import repair_output_format, repair_with_llm, repair_with_llm_async
+from ..parsing.slicing import bug_locations
 
 
 def simple_fix(bugs: List[Any], code: str) -> Dict[str, Any]:
@@ -21,7 +21,22 @@ def simple_fix(bugs: List[Any], code: str) -> Dict[str, Any]:
     Returns:
         Fixed code and explanation of repairs applied
     """
-    prompt = f"""
+    return repair_with_llm(
+        lambda source, patch: _simple_fix_prompt(bugs, source, patch),
+        code, "simple_fix", "Simple fix failed", bug_locations(bugs)
+    )
+
+
+async def simple_fix_async(bugs: List[Any], code: str) -> Dict[str, Any]:
+    """Async variant of simple_fix()."""
+    return await repair_with_llm_async(
+        lambda source, patch: _simple_fix_prompt(bugs, source, patch),
+        code, "simple_fix", "Simple fix failed", bug_locations(bugs)
+    )
+
+
+def _simple_fix_prompt(bugs: List[Any], code: str, patch: bool = False) -> str:
+    return f"""
 Role:
     You are a Code Repair Expert. Your task is to fix all identified bugs in the given code
     and produce a fully corrected version.
@@ -34,18 +49,4 @@ Instructions:
 1. Fix the code to eliminate all execution-blocking bugs.
 2. Provide a clear explanation of each fix applied.
 
-Output:
-Return a JSON object with all newlines and quotes escaped (e.g., \\n, \\"):
-
-{{
-  "fixed_code": "string",
-  "fix_explanation": "string"
-}}
-
-Do not write any text besides the JSON.
-"""
-    result = call_llm(prompt)
-    return safe_json_parse(
-        result,
-        fallback={"fixed_code": code, "fix_explanation": "Simple fix failed"}
-    )
+{repair_output_format(patch)}"""
@@ -0,0 +1,110 @@
+"""
+Speculative strategy that races the simple and multi-agent paths.
+
+Each path runs as a "speculative-simple" or "speculative-complex" stage, so
+stage listeners (see watch_stages()) and the stage metrics see when a path
+starts and whether it finished or was abandoned or cancelled.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..agents.review import validate_solution_async
+from ..llm import limit_llm_calls
+from ..metrics import record_retry, stage_timer
+from ..runtime import run_sync
+from .multi_agent import multi_agent_fix_async
+from .simple_fix import simple_fix_async
+
+
+def speculative_fix(
+    bugs: List[Any],
+    plan: str,
+    code: str,
+    primary: str,
+    max_calls: int = 12,
+    validate: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None
+) -> Dict[str, Any]:
+    """
+    Run the simple and multi-agent strategies concurrently and keep the first FIXED result.
+
+    Each result is validated as soon as its path finishes. The first result
+    validated as FIXED wins and the other path is cancelled. The path the
+    analysis did not choose runs under a cap on LLM requests and is
+    abandoned when it reaches the cap.
+
+    Args:
+        bugs: List of identified bugs
+        plan: Step-by-step repair instructions
+        code: Buggy source code
+        primary: Complexity chosen by analysis (SIMPLE or COMPLEX)
+        max_calls: LLM requests allowed for the other path
+        validate: Validates a path's fixed code (defaults to
+            validate_solution_async() as a "validation" stage); the pipeline
+            passes one that reuses validations of code states it has seen
+
+    Returns:
+        Fixed code, explanation, validation result and the winning strategy;
+        if neither result is FIXED, the primary path's
+    """
+    return run_sync(speculative_fix_async(bugs, plan, code, primary, max_calls, validate))
+
+
+async def speculative_fix_async(
+    bugs: List[Any],
+    plan: str,
+    code: str,
+    primary: str,
+    max_calls: int = 12,
+    validate: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None
+) -> Dict[str, Any]:
+    """Async variant of speculative_fix()."""
+    validate = validate or _validate
+    secondary = "COMPLEX" if primary == "SIMPLE" else "SIMPLE"
+    paths = {
+        "SIMPLE": lambda: simple_fix_async(bugs, code),
+        "COMPLEX": lambda: multi_agent_fix_async(bugs, plan, code),
+    }
+    tasks = {
+        asyncio.ensure_future(_path(primary, paths[primary]())): primary,
+        asyncio.ensure_future(_path(secondary, _capped(paths[secondary](), max_calls))): secondary,
+    }
+    results = {}
+    try:
+        while tasks:
+            finished, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                label = tasks.pop(task)
+                try:
+                    result = task.result()
+                except Exception:
+                    if label == primary:
+                        raise
+                    record_retry("speculative", "abandoned")
+                    continue
+
+                validation = await validate(result["fixed_code"])
+                results[label] = {**result, "validation": validation, "strategy": label}
+                if validation["status"] == "FIXED":
+                    return results[label]
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return results[primary]
+
+
+async def _validate(code: str) -> Dict[str, Any]:
+    with stage_timer("validation"):
+        return await validate_solution_async(code)
+
+
+async def _path(label: str, strategy: Any) -> Dict[str, Any]:
+    with stage_timer(f"speculative-{label.lower()}"):
+        return await strategy
+
+
+async def _capped(strategy: Any, max_calls: int) -> Dict[str, Any]:
+    with limit_llm_calls(max_calls):
+        return await strategy
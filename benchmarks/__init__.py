@@ -0,0 +1 @@
+"""Benchmarks for measuring ASAD performance without live provider APIs."""
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Compare whole-module and map-reduce (chunked) analysis as modules grow.
+
+Uses the offline fake provider with a latency that grows with prompt size
+(ASAD_FAKE_TOKEN_LATENCY), so no API key or network access is needed:
+
+    python -m benchmarks.bench_chunked_analysis --lines 500 2000 8000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.bench_slicing import build_module
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per response")
+    parser.add_argument("--token-latency", type=float, default=0.05, help="extra seconds per 1000 prompt tokens")
+    parser.add_argument("--chunk-lines", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "ASAD_CACHE": "0",
+        "ASAD_FAKE_LATENCY": str(args.latency),
+        "ASAD_FAKE_TOKEN_LATENCY": str(args.token_latency),
+        "ASAD_CHUNK_LINES": str(args.chunk_lines),
+        "ASAD_CHUNK_MIN_LINES": "0",
+    })
+    from asad.agents.analysis import analyze_problem_async
+    from asad.llm import count_llm_calls
+
+    print(f"{'lines':>7} {'mode':<8} {'calls':>6} {'wall s':>7} {'bugs':>5} {'complexity':>11}")
+    for lines in args.lines:
+        code = build_module(lines)
+        for mode, enabled in [("whole", "0"), ("chunked", "1")]:
+            os.environ["ASAD_CHUNKED_ANALYSIS"] = enabled
+            with count_llm_calls() as calls:
+                start = time.perf_counter()
+                report = asyncio.run(analyze_problem_async(code))
+                elapsed = time.perf_counter() - start
+            print(
+                f"{lines:>7} {mode:<8} {calls['calls']:>6} {elapsed:>7.2f} "
+                f"{len(report['bugs']):>5} {report['complexity']:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark JSON extraction on synthetic LLM responses from 1 KB to 1 MB.
+
+Compares clean_json() with the recursive-regex extractor it replaced (run
+only if the optional `regex` package is installed). Each size is measured
+for a well-formed response and for a truncated one with unbalanced braces:
+
+    python -m benchmarks.bench_clean_json --sizes 1000 10000 100000 1000000
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+
+from asad.parsing.utils import clean_json
+
+LEGACY_PATTERN = r"\{(?:[^{}]|(?R))*\}"
+
+SNIPPET = (
+    "def handler_{i}(payload, cache={{}}):\n"
+    "    key = f\"{{payload['id']}}:{{payload.get('v', {{}})}}\"\n"
+    "    seen = {{1, 2, 3}}\n"
+    "    cache[key] = {{\"value\": payload[\"value\"] * {i}}}\n"
+    "    return cache[key]\n\n"
+)
+
+
+def build_response(size: int, truncated: bool = False) -> str:
+    """Build a repair response whose escaped fixed_code is about size bytes."""
+    code, i = [], 0
+    while sum(map(len, code)) < size:
+        code.append(SNIPPET.format(i=i))
+        i += 1
+    response = "Here is the fix:\n" + json.dumps({
+        "fixed_code": "".join(code),
+        "fix_explanation": "Replaced the mutable default argument",
+    })
+    if truncated:
+        # Cut inside the code string so braces no longer balance
+        response = response[:len(response) * 3 // 4]
+    return response
+
+
+def _legacy_worker(text: str, queue) -> None:
+    import regex
+
+    pattern = regex.compile(LEGACY_PATTERN)
+    start = time.perf_counter()
+    pattern.search(text)
+    queue.put(time.perf_counter() - start)
+
+
+def time_legacy(text: str, timeout: float) -> float:
+    """Time the regex extractor in a child process so stalls can be cut off."""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_legacy_worker, args=(text, queue))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.kill()
+        process.join()
+        return float("inf")
+    return queue.get()
+
+
+def time_new(text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        clean_json(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=10.0, help="cut-off for the regex extractor")
+    args = parser.parse_args()
+
+    try:
+        import regex  # noqa: F401
+        have_regex = True
+    except ImportError:
+        have_regex = False
+        print("`regex` not installed - skipping the legacy extractor\n")
+
+    print(f"{'size':>9} {'shape':<10} {'clean_json ms':>14} {'regex ms':>10} {'found':>6}")
+    for size in args.sizes:
+        for truncated in (False, True):
+            text = build_response(size, truncated)
+            new_ms = time_new(text, args.repeat) * 1000
+            found = bool(clean_json(text))
+            legacy = "-"
+            if have_regex:
+                seconds = time_legacy(text, args.timeout)
+                legacy = f">{args.timeout:g}s" if seconds == float("inf") else f"{seconds * 1000:.2f}"
+            shape = "truncated" if truncated else "complete"
+            print(f"{len(text):>9} {shape:<10} {new_ms:>14.3f} {legacy:>10} {str(found):>6}")
+
+
+if __name__ == "__main__":
+    main()
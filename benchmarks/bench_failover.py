@@ -0,0 +1,97 @@
+"""
+Measure tail latency and errors with and without multi-provider routing.
+
+Registers fake providers with injected tail latency and failures, so no API
+key or network access is needed. "primary" is fast but occasionally very
+slow or failing; "backup" is a little slower but steady:
+
+    python -m benchmarks.bench_failover --requests 400 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+from asad.llm import call_llm_async, provider_health, register_provider, reset_providers
+from asad.llm.fake import FakeProvider
+from asad.metrics import collect_metrics
+
+
+def _fake(name: str, **overrides: Any) -> None:
+    def __init__(self):
+        FakeProvider.__init__(self, **overrides)
+
+    register_provider(name, type(f"Fake_{name}", (FakeProvider,), {"model": name, "__init__": __init__}))
+
+
+async def _run(provider: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call_llm_async(f"request {i}", provider=provider, use_cache=False)
+                latencies.append(time.perf_counter() - start)
+            except ConnectionError:
+                errors += 1
+
+    with collect_metrics() as metrics:
+        await asyncio.gather(*(one(i) for i in range(requests)))
+    retries = {
+        sample["labels"]["reason"]: int(sample["value"])
+        for sample in metrics.snapshot()["counters"].get("asad_retries_total", [])
+    }
+    latencies.sort()
+
+    def pct(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))] * 1000 if latencies else float("nan")
+
+    return {"p50": pct(50), "p95": pct(95), "p99": pct(99), "errors": errors, **retries}
+
+
+def _report(label: str, result: Dict[str, Any]) -> None:
+    print(
+        f"{label:<26} {result['p50']:>8.0f} {result['p95']:>8.0f} {result['p99']:>8.0f} "
+        f"{result['errors']:>7} {result.get('hedge', 0):>7} {result.get('failover', 0):>9}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.update({
+        "ASAD_CACHE": "0",
+        "ASAD_PROVIDER_CHAIN": "primary,backup",
+        "ASAD_HEDGE_PERCENTILE": "90",
+        "ASAD_HEDGE_DELAY": "0.2",
+        "ASAD_BREAKER_COOLDOWN": "0.5",
+        # Measure routing alone; the scheduler would otherwise retry failed requests
+        "ASAD_RATE_RETRIES": "0",
+    })
+    _fake("primary", latency=0.05, jitter=0.01, slow_rate=0.08, slow_latency=1.5, failure_rate=0.05, seed=1)
+    _fake("backup", latency=0.08, jitter=0.01, seed=2)
+
+    print(f"{'mode':<26} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'hedges':>7} {'failovers':>9}")
+    _report("primary only", asyncio.run(_run("primary", args.requests, args.concurrency)))
+    _report("multi (failover + hedge)", asyncio.run(_run("multi", args.requests, args.concurrency)))
+
+    # Primary outage: its breaker should open and traffic move to backup
+    _fake("primary", latency=0.05, failure_rate=1.0, seed=1)
+    reset_providers()
+    _report("multi, primary down", asyncio.run(_run("multi", args.requests, args.concurrency)))
+    for name, health in provider_health().items():
+        print(f"  {name:<8} state={health['state']:<9} requests={health['requests']:<5} errors={health['errors']}")
+    reset_providers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Measure the cold-start cost of importing asad and enforce a budget.
+
+Each run imports asad in a fresh interpreter under `python -X importtime`,
+reports the median cumulative import time and the slowest modules, and
+checks that no provider SDK was loaded. Exits non-zero when the median
+exceeds the budget or an SDK was imported, so CI can run it as a gate:
+
+    python -m benchmarks.bench_import --runs 5 --budget-ms 300
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modules that must only be imported once a provider is instantiated
+LAZY_MODULES = ["together", "groq", "openai", "httpx", "dotenv"]
+
+_PROBE = (
+    "import sys, asad; "
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+)
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def _import_once() -> Tuple[Dict[str, int], List[str]]:
+    """Return cumulative microseconds per top-level-or-asad module and loaded SDKs."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True, text=True, check=True, env=env,
+    )
+    cumulative: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            _, total, indent, module = match.groups()
+            # Keep direct imports of the probe and asad's own modules
+            if len(indent) <= 1 or module.startswith("asad"):
+                cumulative[module] = int(total)
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return cumulative, loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [_import_once() for _ in range(args.runs)]
+    totals = [timings["asad"] / 1000 for timings, _ in runs]
+    median = statistics.median(totals)
+    loaded = sorted({name for _, names in runs for name in names})
+
+    last = runs[-1][0]
+    print(f"{'module':<40} {'cumulative ms':>14}")
+    for module, micros in sorted(last.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{module:<40} {micros / 1000:>14.1f}")
+    print(f"\nimport asad: median {median:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: eagerly imported {', '.join(loaded)}")
+        failed = True
+    if median > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure the per-event overhead of the metrics hooks.
+
+Times one simulated LLM call (llm_call_metrics + record_usage inside a
+stage_timer) with metrics disabled, enabled, and collected per run, then
+prints a sample of the Prometheus output:
+
+    python -m benchmarks.bench_metrics --events 100000
+"""
+
+import argparse
+import os
+import time
+
+from asad.metrics import (
+    collect_metrics,
+    get_metrics,
+    llm_call_metrics,
+    record_usage,
+    stage_timer,
+)
+
+
+def _event() -> None:
+    with stage_timer("review"):
+        with llm_call_metrics("groq", "stub-model", "review"):
+            record_usage(120, 40)
+
+
+def _time(events: int) -> float:
+    start = time.perf_counter()
+    for _ in range(events):
+        _event()
+    return (time.perf_counter() - start) / events * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100000)
+    args = parser.parse_args()
+    os.environ.setdefault("LLM_PROVIDER", "groq")
+
+    os.environ["ASAD_METRICS"] = "0"
+    disabled = _time(args.events)
+    os.environ["ASAD_METRICS"] = "1"
+    enabled = _time(args.events)
+    os.environ["ASAD_METRICS"] = "0"
+    with collect_metrics() as run_metrics:
+        collected = _time(args.events)
+
+    print(f"disabled:            {disabled:>8.2f} us/call")
+    print(f"ASAD_METRICS=1:      {enabled:>8.2f} us/call")
+    print(f"collect_metrics():   {collected:>8.2f} us/call")
+    print(f"calls recorded:      {get_metrics().snapshot()['histograms']['asad_llm_request_duration_seconds'][0]['count']}")
+    print()
+    print("\n".join(run_metrics.to_prometheus().splitlines()[:12]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare generated output size of full-file and patch-mode repairs.
+
+Builds a synthetic module with a one-line bug and measures the response a
+model would have to generate in each format, plus local patch apply time:
+
+    python -m benchmarks.bench_patch --lines 2000
+"""
+
+import argparse
+import json
+import time
+
+from asad.parsing.patch import apply_patch
+
+# Rough characters-per-token ratio for code with BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def build_module(lines: int) -> str:
+    """Generate a module of roughly the requested length made of small functions."""
+    parts = []
+    for i in range(max(lines // 5, 1)):
+        parts.append(
+            f"def handler_{i}(payload, scale={i}):\n"
+            f"    data = {{\"id\": {i}, \"value\": payload[\"value\"] * scale}}\n"
+            f"    return f\"{{data['id']}}:{{data['value']}}\"\n"
+        )
+    return "\n\n".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=2000)
+    args = parser.parse_args()
+
+    fixed = build_module(args.lines)
+    target = len(fixed.splitlines()) // 2
+    fixed_lines = fixed.splitlines()
+    while "return" not in fixed_lines[target]:
+        target += 1
+    good_line = fixed_lines[target]
+    buggy_line = good_line.replace("data['value']", "data['valeu']")
+    buggy = "\n".join(fixed_lines[:target] + [buggy_line] + fixed_lines[target + 1:]) + "\n"
+
+    full_response = json.dumps({"fixed_code": fixed, "fix_explanation": "Fix key typo"})
+    context = fixed_lines[target - 2:target]
+    patch_response = "\n".join([
+        "EXPLANATION: Fix key typo",
+        "<<<<<<< SEARCH",
+        *context,
+        buggy_line,
+        "=======",
+        *context,
+        good_line,
+        ">>>>>>> REPLACE",
+    ])
+
+    start = time.perf_counter()
+    patched = apply_patch(buggy, patch_response)
+    apply_ms = (time.perf_counter() - start) * 1000
+    assert patched == fixed, "patch did not reproduce the fixed module"
+
+    full_tokens = len(full_response) / CHARS_PER_TOKEN
+    patch_tokens = len(patch_response) / CHARS_PER_TOKEN
+    print(f"module lines:       {len(fixed_lines)}")
+    print(f"full-file output:   {len(full_response):>8} chars  ~{full_tokens:>8.0f} tokens")
+    print(f"patch output:       {len(patch_response):>8} chars  ~{patch_tokens:>8.0f} tokens")
+    print(f"reduction:          {full_tokens / patch_tokens:.0f}x")
+    print(f"local apply time:   {apply_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
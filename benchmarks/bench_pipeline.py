@@ -0,0 +1,118 @@
+"""
+Offline end-to-end benchmark of the debugging pipeline.
+
+Runs adaptive_debugger over the bundled examples with the fake provider
+(LLM_PROVIDER=fake), so no API key or network access is needed. Reports LLM
+calls, wall time, tokens and iterations per repair, then throughput with N
+concurrent sessions on one event loop:
+
+    python -m benchmarks.bench_pipeline --latency 0.2 --jitter 0.05 --concurrency 1 4 16
+
+Replay a live run instead of the script by pointing --recording at the
+response cache it wrote (ASAD_CACHE_DIR/responses.sqlite3).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import time
+from typing import Any, Dict, List
+
+from examples import buggy_code
+
+EXAMPLES = ["simple_buggy_code", "medium_buggy_code", "complex_buggy_code"]
+
+
+def _counter(metrics: Dict[str, Any], name: str) -> float:
+    return sum(sample["value"] for sample in metrics["counters"].get(name, []))
+
+
+def _stage_count(metrics: Dict[str, Any], stage: str) -> int:
+    return sum(
+        sample["count"]
+        for sample in metrics["histograms"].get("asad_stage_duration_seconds", [])
+        if sample["labels"]["stage"] == stage
+    )
+
+
+async def _session(code: str, max_iterations: int) -> Dict[str, Any]:
+    from asad import adaptive_debugger_async
+    from asad.llm import count_llm_calls
+
+    start = time.perf_counter()
+    with count_llm_calls() as calls:
+        _, metrics = await adaptive_debugger_async(code, max_iterations, return_metrics=True)
+    return {
+        "wall": time.perf_counter() - start,
+        "calls": calls["calls"],
+        "tokens": _counter(metrics, "asad_llm_prompt_tokens_total")
+        + _counter(metrics, "asad_llm_completion_tokens_total"),
+        "iterations": _stage_count(metrics, "validation"),
+    }
+
+
+async def _throughput(sessions: int, max_iterations: int) -> Dict[str, float]:
+    codes = [getattr(buggy_code, EXAMPLES[i % len(EXAMPLES)]) for i in range(sessions)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(_session(code, max_iterations) for code in codes))
+    elapsed = time.perf_counter() - start
+    walls = sorted(result["wall"] for result in results)
+    return {
+        "elapsed": elapsed,
+        "rate": sessions / elapsed,
+        "p50": statistics.median(walls),
+        "p95": walls[min(len(walls) - 1, int(len(walls) * 0.95))],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.2, help="mean seconds per LLM response")
+    parser.add_argument("--jitter", type=float, default=0.05, help="uniform +/- seconds per response")
+    parser.add_argument("--fixes", type=int, default=1, help="repairs needed before validation passes")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--max-iterations", type=int, default=5)
+    parser.add_argument("--recording", help="response cache database to replay")
+    parser.add_argument("--recorded-provider", default="groq")
+    args = parser.parse_args()
+
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "ASAD_CACHE": "0",
+        "ASAD_FAKE_LATENCY": str(args.latency),
+        "ASAD_FAKE_JITTER": str(args.jitter),
+        "ASAD_FAKE_SEED": "0",
+        "ASAD_FAKE_FIXES": str(args.fixes),
+        "ASAD_FAKE_RECORDED_PROVIDER": args.recorded_provider,
+    })
+    if args.recording:
+        os.environ["ASAD_FAKE_RECORDING"] = args.recording
+
+    rows: List[str] = []
+    for name in EXAMPLES:
+        # The pipeline's progress output would drown the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = asyncio.run(_session(getattr(buggy_code, name), args.max_iterations))
+        rows.append(
+            f"{name:<20} {result['calls']:>6} {result['wall']:>9.2f} "
+            f"{result['tokens']:>8.0f} {result['iterations']:>10}"
+        )
+    print(f"latency {args.latency}s +/- {args.jitter}s per response\n")
+    print(f"{'example':<20} {'calls':>6} {'wall s':>9} {'tokens':>8} {'iterations':>10}")
+    print("\n".join(rows))
+
+    print(f"\n{'sessions':>8} {'elapsed s':>10} {'sessions/s':>11} {'p50 s':>8} {'p95 s':>8}")
+    for sessions in args.concurrency:
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = asyncio.run(_throughput(sessions, args.max_iterations))
+        print(
+            f"{sessions:>8} {stats['elapsed']:>10.2f} {stats['rate']:>11.2f} "
+            f"{stats['p50']:>8.2f} {stats['p95']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
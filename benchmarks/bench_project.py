@@ -0,0 +1,109 @@
+"""
+Measure incremental project runs: first run, re-run, and re-run after one edit.
+
+Generates a package whose modules import each other as a binary tree, with a
+few modules marked buggy, and debugs it with the offline fake provider:
+
+    python -m benchmarks.bench_project --modules 64 --buggy 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from asad.llm import register_provider
+from asad.llm.fake import FIX_MARKER, FakeProvider, _located_bugs, default_script, prompt_code
+
+BUG_MARKER = "# BUG"
+
+
+def _analysis_reply(prompt: str) -> str:
+    code = prompt_code(prompt, "Buggy code: ")
+    buggy = BUG_MARKER in code and FIX_MARKER not in code
+    return json.dumps({
+        "complexity": "SIMPLE",
+        "bugs": _located_bugs(code)[:1] if buggy else [],
+        "plan": "Fix the marked function" if buggy else "Nothing to fix",
+    })
+
+
+class ProjectFake(FakeProvider):
+    """Fake provider whose analysis only reports bugs in modules marked # BUG."""
+
+    def __init__(self):
+        script = [
+            (marker, _analysis_reply if marker == "Main Analysis Agent" else reply)
+            for marker, reply in default_script(1)
+        ]
+        super().__init__(script=script)
+
+
+def build_project(root: str, modules: int, buggy: int) -> None:
+    package = os.path.join(root, "proj")
+    os.makedirs(package)
+    open(os.path.join(package, "__init__.py"), "w").close()
+    step = max(modules // max(buggy, 1), 1)
+    for i in range(modules):
+        lines = []
+        if i:
+            parent = (i - 1) // 2
+            lines.append(f"from proj.mod_{parent} import f_{parent}\n")
+        body = f"f_{(i - 1) // 2}(x) + {i}" if i else f"x + {i}"
+        marker = f"  {BUG_MARKER}" if buggy and i % step == step - 1 and i // step < buggy else ""
+        lines.append(f"\ndef f_{i}(x):\n    return {body}{marker}\n")
+        with open(os.path.join(package, f"mod_{i}.py"), "w") as handle:
+            handle.write("".join(lines))
+
+
+def _append(path: str) -> None:
+    with open(path, "a") as handle:
+        handle.write("\n# edited\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", type=int, default=64)
+    parser.add_argument("--buggy", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per response")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "project")
+        os.environ.update({
+            "LLM_PROVIDER": "fake",
+            "ASAD_CACHE": "0",
+            "ASAD_FAKE_LATENCY": str(args.latency),
+            "ASAD_PROJECT_INDEX": os.path.join(tmp, "index.sqlite3"),
+        })
+        register_provider("fake", ProjectFake)
+        build_project(root, args.modules, args.buggy)
+        from asad.project import debug_project
+
+        package = os.path.join(root, "proj")
+        runs = [
+            ("first run", None),
+            ("re-run (repairs written)", None),
+            ("re-run (no changes)", None),
+            ("re-run after editing a leaf", os.path.join(package, f"mod_{args.modules - 1}.py")),
+            ("re-run after editing mod_1", os.path.join(package, "mod_1.py")),
+        ]
+        print(f"{'run':<28} {'analyzed':>9} {'reused':>7} {'repaired':>9} {'calls':>6} {'wall s':>7}")
+        for label, edit in runs:
+            if edit:
+                _append(edit)
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                result = debug_project(root, write=True)
+                elapsed = time.perf_counter() - start
+            print(
+                f"{label:<28} {result['analyzed']:>9} {result['reused']:>7} "
+                f"{result['repaired']:>9} {result['llm_calls']:>6} {elapsed:>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compare per-call overhead of fresh providers versus the shared registry.
+
+Runs against a local stub server, so no API key or network access is needed:
+
+    python -m benchmarks.bench_provider_reuse --calls 200
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.stub_server import StubServer
+
+
+def _time_calls(make_provider, calls: int, close_each: bool = False) -> list:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        provider = make_provider()
+        provider.generate("ping")
+        timings.append(time.perf_counter() - start)
+        if close_each:
+            provider.close()
+    return timings
+
+
+def _report(label: str, timings: list, connections: int) -> None:
+    print(
+        f"{label:<22} mean={statistics.mean(timings) * 1000:7.3f} ms  "
+        f"p50={statistics.median(timings) * 1000:7.3f} ms  "
+        f"max={max(timings) * 1000:7.3f} ms  connections={connections}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        os.environ["GROQ_BASE_URL"] = server.url
+        os.environ.setdefault("GROQ_API_KEY", "stub-key")
+
+        from asad.llm.providers import GroqProvider
+        from asad.llm.registry import get_provider, reset_providers
+
+        # Before: a new provider (API key lookup, SDK client, pool) per call
+        before_connections = server.connections
+        before = _time_calls(GroqProvider, args.calls, close_each=True)
+        _report("per-call provider", before, server.connections - before_connections)
+
+        # After: one long-lived provider with a keep-alive pool
+        reset_providers()
+        after_connections = server.connections
+        after = _time_calls(lambda: get_provider("groq"), args.calls)
+        _report("shared registry", after, server.connections - after_connections)
+        reset_providers()
+
+    speedup = statistics.mean(before) / statistics.mean(after)
+    print(f"\nPer-call overhead reduced {speedup:.1f}x over {args.calls} calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare backoff-only retries with the rate-limit-aware scheduler.
+
+Sends a burst of agent and validation requests through the groq provider to
+a local stub server that rejects anything above --quota requests per second
+with 429 and Retry-After, so no API key or network access is needed:
+
+    python -m benchmarks.bench_rate_limit --requests 120 --quota 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Any, Dict, List
+
+from benchmarks.stub_server import StubServer
+
+
+async def _run(requests: int, validation_every: int) -> Dict[str, Any]:
+    from asad.llm import call_llm_async
+
+    latencies: Dict[str, List[float]] = {"validation": [], "execution": []}
+    failures = 0
+
+    async def one(i: int) -> None:
+        nonlocal failures
+        stage = "validation" if i % validation_every == 0 else "execution"
+        start = time.perf_counter()
+        try:
+            await call_llm_async(f"request {i}", stage=stage, use_cache=False)
+            latencies[stage].append(time.perf_counter() - start)
+        except Exception:
+            failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return {
+        "elapsed": time.perf_counter() - start,
+        "failures": failures,
+        "validation": statistics.mean(latencies["validation"]) if latencies["validation"] else float("nan"),
+        "execution": statistics.mean(latencies["execution"]) if latencies["execution"] else float("nan"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=120)
+    parser.add_argument("--quota", type=float, default=20.0, help="requests per second the server accepts")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per server request")
+    parser.add_argument("--validation-every", type=int, default=5, help="every Nth request is a validation call")
+    args = parser.parse_args()
+
+    modes = [
+        ("no retries", {"ASAD_RATE_RETRIES": "0"}),
+        ("backoff only", {"ASAD_RATE_RETRIES": "8"}),
+        ("scheduler (RPM set)", {"ASAD_RATE_RETRIES": "8", "ASAD_GROQ_RPM": str(args.quota * 60)}),
+    ]
+    with StubServer(latency=args.latency, quota_rps=args.quota) as server:
+        os.environ.update({
+            "LLM_PROVIDER": "groq",
+            "GROQ_BASE_URL": server.url,
+            "GROQ_API_KEY": os.environ.get("GROQ_API_KEY", "stub-key"),
+            "ASAD_CACHE": "0",
+            "ASAD_RATE_BURST": "1",
+            "ASAD_RATE_BACKOFF": "0.25",
+            "ASAD_RATE_BACKOFF_MAX": "5",
+        })
+        from asad.llm import reset_providers, reset_rate_limiters
+
+        print(
+            f"{'mode':<22} {'elapsed s':>10} {'429s':>6} {'failed':>7} "
+            f"{'validation s':>13} {'execution s':>12}"
+        )
+        for label, env in modes:
+            os.environ.pop("ASAD_GROQ_RPM", None)
+            os.environ.update(env)
+            reset_providers()
+            reset_rate_limiters()
+            # Let the server's quota refill between modes
+            time.sleep(1.5)
+            rejected = server.rejected
+            result = asyncio.run(_run(args.requests, args.validation_every))
+            print(
+                f"{label:<22} {result['elapsed']:>10.2f} {server.rejected - rejected:>6} "
+                f"{result['failures']:>7} {result['validation']:>13.2f} {result['execution']:>12.2f}"
+            )
+        reset_providers()
+
+
+if __name__ == "__main__":
+    main()
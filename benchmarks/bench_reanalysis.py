@@ -0,0 +1,76 @@
+"""
+Compare full and delta re-analysis prompts as modules grow.
+
+Builds the re-analysis of a late iteration that edited one function and
+left one bug behind, then sends it in both ASAD_REANALYSIS modes to the
+offline fake provider with a latency that grows with prompt size
+(ASAD_FAKE_TOKEN_LATENCY):
+
+    python -m benchmarks.bench_reanalysis --lines 500 2000 8000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.bench_slicing import build_module
+
+
+def _iteration(lines: int):
+    """(current code, previous code, validation, previous analysis, history) of one retry."""
+    code = build_module(lines)
+    target = lines // 12
+    previous_code = code.replace(
+        f"payload[\"value\"] * SCALE + {target}\n",
+        f"payload[\"value\"] * SCALE - {target}\n",
+    )
+    bug = {
+        "type": "logic error",
+        "location": f"handler_{target}",
+        "explanation": "Offset is applied with the wrong sign",
+    }
+    validation = {
+        "status": "NOT_FIXED",
+        "summary": f"handler_{target} still returns the wrong value",
+        "remaining_bugs": [bug],
+    }
+    previous_plan = {"complexity": "SIMPLE", "bugs": [bug], "plan": f"Fix the offset in handler_{target}"}
+    history = [
+        f"Iteration {i}: simple fix of 1 bug(s) -> NOT_FIXED, 1 remaining: handler_{target} still wrong"
+        for i in range(1, 4)
+    ]
+    return code, previous_code, validation, previous_plan, history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per response")
+    parser.add_argument("--token-latency", type=float, default=0.05, help="extra seconds per 1000 prompt tokens")
+    args = parser.parse_args()
+
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "ASAD_CACHE": "0",
+        "ASAD_FAKE_LATENCY": str(args.latency),
+        "ASAD_FAKE_TOKEN_LATENCY": str(args.token_latency),
+    })
+    from asad.agents.analysis import _select_reanalysis_prompt, new_iteration_analyze_problem_async
+
+    print(f"{'lines':>7} {'mode':<6} {'prompt chars':>13} {'wall s':>7} {'bugs':>5}")
+    for lines in args.lines:
+        code, previous_code, validation, previous_plan, history = _iteration(lines)
+        for mode in ("full", "delta"):
+            os.environ["ASAD_REANALYSIS"] = mode
+            prompt = _select_reanalysis_prompt(code, validation, previous_plan, previous_code, history)
+            start = time.perf_counter()
+            report = asyncio.run(new_iteration_analyze_problem_async(
+                code, validation, previous_plan, previous_code=previous_code, history=history
+            ))
+            elapsed = time.perf_counter() - start
+            print(f"{lines:>7} {mode:<6} {len(prompt):>13} {elapsed:>7.2f} {len(report['bugs']):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Measure the static complexity router's latency and agreement with LLM labels.
+
+By default the router is compared with reference labels for the bundled
+examples. Pass --llm to label each example with analyze_problem() instead
+(requires a configured provider):
+
+    python -m benchmarks.bench_router
+    python -m benchmarks.bench_router --llm --repeat 1000
+"""
+
+import argparse
+import statistics
+import time
+
+from asad.routing import route_complexity
+from examples import buggy_code
+
+EXAMPLES = ["simple_buggy_code", "medium_buggy_code", "complex_buggy_code"]
+
+# Expected classification of the bundled examples; medium has several
+# bugs but they are confined to one function, so it is not coupled
+REFERENCE_LABELS = {
+    "simple_buggy_code": "SIMPLE",
+    "medium_buggy_code": "SIMPLE",
+    "complex_buggy_code": "COMPLEX",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--llm", action="store_true", help="label examples with analyze_problem()")
+    parser.add_argument("--repeat", type=int, default=200, help="router runs per example")
+    args = parser.parse_args()
+
+    if args.llm:
+        from asad.agents import analyze_problem
+
+    agree = 0
+    print(f"{'example':<20} {'label':<8} {'router':<8} {'score':>5} {'p50 us':>9} {'llm ms':>9}")
+    for name in EXAMPLES:
+        code = getattr(buggy_code, name)
+
+        llm_ms = float("nan")
+        if args.llm:
+            start = time.perf_counter()
+            label = analyze_problem(code).get("complexity", "SIMPLE")
+            llm_ms = (time.perf_counter() - start) * 1000
+        else:
+            label = REFERENCE_LABELS[name]
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            decision = route_complexity(code)
+            timings.append(time.perf_counter() - start)
+
+        agree += decision["complexity"] == label
+        print(
+            f"{name:<20} {label:<8} {decision['complexity']:<8} {decision['score']:>5} "
+            f"{statistics.median(timings) * 1e6:>9.1f} {llm_ms:>9.1f}"
+        )
+
+    source = "LLM" if args.llm else "reference"
+    print(f"\nAgreement with {source} labels: {agree}/{len(EXAMPLES)}")
+
+
+if __name__ == "__main__":
+    main()
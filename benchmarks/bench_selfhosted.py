@@ -0,0 +1,72 @@
+"""
+Compare per-prompt and micro-batched requests to a self-hosted server.
+
+Runs the selfhosted provider against a local stub server that processes only
+--capacity requests at a time, each taking --latency seconds regardless of
+how many prompts it carries, so no inference server is needed:
+
+    python -m benchmarks.bench_selfhosted --prompts 64 --batch-size 16
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.stub_server import StubServer
+
+
+def reply(payload: dict) -> str:
+    prompt = payload.get("prompt") or payload["messages"][-1]["content"]
+    return f'{{"echo": "{prompt}"}}'
+
+
+async def _run(prompts: int) -> float:
+    from asad.llm import call_llm_async
+
+    start = time.perf_counter()
+    answers = await asyncio.gather(
+        *(call_llm_async(f"prompt {i}", use_cache=False) for i in range(prompts))
+    )
+    elapsed = time.perf_counter() - start
+    assert answers == [f'{{"echo": "prompt {i}"}}' for i in range(prompts)], "answers out of order"
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--prompts", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=4, help="client requests in flight")
+    parser.add_argument("--capacity", type=int, default=2, help="requests the server runs at once")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per server request")
+    args = parser.parse_args()
+
+    with StubServer(reply=reply, latency=args.latency, capacity=args.capacity) as server:
+        os.environ.update({
+            "LLM_PROVIDER": "selfhosted",
+            "ASAD_SELFHOSTED_BASE_URL": server.url,
+            "ASAD_SELFHOSTED_MODEL": "stub-model",
+            "ASAD_SELFHOSTED_CONCURRENCY": str(args.concurrency),
+        })
+        from asad.llm import reset_providers
+
+        print(f"{'mode':<22} {'requests':>9} {'elapsed s':>10} {'prompts/s':>10}")
+        for label, api, batch_size in [
+            ("per-prompt", "chat", 1),
+            (f"batched x{args.batch_size}", "completions", args.batch_size),
+        ]:
+            os.environ["ASAD_SELFHOSTED_API"] = api
+            os.environ["ASAD_SELFHOSTED_BATCH_SIZE"] = str(batch_size)
+            reset_providers()
+            before = server.requests
+            elapsed = asyncio.run(_run(args.prompts))
+            print(
+                f"{label:<22} {server.requests - before:>9} {elapsed:>10.2f} "
+                f"{args.prompts / elapsed:>10.1f}"
+            )
+        reset_providers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Load-test the HTTP debugging service with the offline fake provider.
+
+Starts the service in-process on a free port, submits a burst of jobs,
+long-polls each one to completion and reports accepted/rejected jobs and
+end-to-end latency:
+
+    python -m benchmarks.bench_service --jobs 200 --workers 16 --queue-size 64
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import time
+
+import httpx
+
+from examples.buggy_code import simple_buggy_code
+
+
+async def _run_job(client: httpx.AsyncClient, latencies: list, rejected: list) -> None:
+    start = time.perf_counter()
+    response = await client.post("/jobs", json={"code": simple_buggy_code})
+    if response.status_code == 429:
+        rejected.append(int(response.headers["Retry-After"]))
+        return
+    job = response.json()
+    after = len(job["events"])
+    while job["status"] in ("queued", "running"):
+        job = (await client.get(f"/jobs/{job['id']}", params={"after": after, "wait": 30})).json()
+        after += len(job["events"])
+    latencies.append(time.perf_counter() - start)
+
+
+async def _bench(args: argparse.Namespace) -> list:
+    from asad.service import DebugService, JobQueue
+
+    service = DebugService(JobQueue(workers=args.workers, queue_size=args.queue_size))
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    latencies, rejected, depths = [], [], []
+
+    async def sample_depth() -> None:
+        while True:
+            depths.append(service.jobs.depth)
+            await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=args.jobs)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as client:
+            sampler = asyncio.create_task(sample_depth())
+            start = time.perf_counter()
+            await asyncio.gather(*(_run_job(client, latencies, rejected) for _ in range(args.jobs)))
+            elapsed = time.perf_counter() - start
+            sampler.cancel()
+    finally:
+        await service.stop()
+
+    latencies.sort()
+    report = [
+        f"jobs submitted   {args.jobs}",
+        f"accepted         {len(latencies)}",
+        f"rejected (429)   {len(rejected)}" + (f"  (Retry-After {min(rejected)}-{max(rejected)} s)" if rejected else ""),
+        f"peak queue depth {max(depths, default=0)}",
+        f"wall s           {elapsed:.2f}",
+    ]
+    if latencies:
+        report += [
+            f"throughput       {len(latencies) / elapsed:.1f} jobs/s",
+            f"p50 latency s    {statistics.median(latencies):.2f}",
+            f"p95 latency s    {latencies[int(0.95 * (len(latencies) - 1))]:.2f}",
+        ]
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per response")
+    args = parser.parse_args()
+
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "ASAD_CACHE": "0",
+        "ASAD_FAKE_LATENCY": str(args.latency),
+    })
+    # Pipeline progress lines would interleave across jobs
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = asyncio.run(_bench(args))
+    print("\n".join(report))
+
+
+if __name__ == "__main__":
+    main()
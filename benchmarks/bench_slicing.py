@@ -0,0 +1,69 @@
+"""
+Compare agent prompt sizes with and without AST context slicing.
+
+Builds synthetic modules of increasing length with one buggy function and
+measures the repair prompt for that function's location:
+
+    python -m benchmarks.bench_slicing --lines 200 1000 5000
+"""
+
+import argparse
+import time
+
+from asad.agents.execution import _execute_prompt
+from asad.parsing.slicing import slice_code
+
+AGENT = {
+    "name": "KeyErrorFixer",
+    "role": "Python data-handling specialist",
+    "task_description": "Your task is to fix the KeyError in handler_{target}",
+    "targets": ["handler_{target}, line {line}"],
+}
+
+
+def build_module(lines: int) -> str:
+    """Generate a module of roughly the requested length with shared helpers."""
+    parts = [
+        "import json\nimport math\n\nSCALE = 3\nLIMITS = {\"low\": 0, \"high\": 100}\n",
+        "def clamp(value, low, high):\n    return max(low, min(high, value))\n",
+    ]
+    for i in range(max(lines // 6, 1)):
+        parts.append(
+            f"def handler_{i}(payload):\n"
+            f"    value = payload[\"value\"] * SCALE + {i}\n"
+            f"    value = clamp(value, LIMITS[\"low\"], LIMITS[\"high\"])\n"
+            f"    return json.dumps({{\"id\": {i}, \"value\": math.floor(value)}})\n"
+        )
+    return "\n\n".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[200, 1000, 5000])
+    args = parser.parse_args()
+
+    print(f"{'lines':>7} {'full chars':>11} {'sliced chars':>13} {'reduction':>10} {'slice ms':>9}")
+    for lines in args.lines:
+        code = build_module(lines)
+        target = lines // 12
+        line = code.splitlines().index(f"def handler_{target}(payload):") + 2
+        agent = {
+            **AGENT,
+            "task_description": AGENT["task_description"].format(target=target),
+            "targets": [t.format(target=target, line=line) for t in AGENT["targets"]],
+        }
+
+        start = time.perf_counter()
+        code_slice = slice_code(code, agent["targets"])
+        slice_ms = (time.perf_counter() - start) * 1000
+
+        full = len(_execute_prompt(agent, code))
+        sliced = len(_execute_prompt(agent, code_slice.prompt_input()))
+        print(
+            f"{len(code.splitlines()):>7} {full:>11} {sliced:>13} "
+            f"{full / sliced:>9.0f}x {slice_ms:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measure time-to-decision for review and validation with and without streaming.
+
+Runs the real Groq provider against a local stub server that streams its
+answer a few characters at a time, so no API key or network access is needed:
+
+    python -m benchmarks.bench_streaming --token-delay 0.01 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+from benchmarks.stub_server import StubServer
+
+FEEDBACK = (
+    "The agent replaced the shared mutable default with None and initialises the "
+    "list inside the constructor, which removes the cross-instance state leak. "
+) * 4
+
+
+def reply(payload: dict) -> str:
+    """Answer review prompts with APPROVE and validation prompts with FIXED."""
+    prompt = payload["messages"][-1]["content"]
+    if "final validation" in prompt:
+        return json.dumps({"status": "FIXED", "summary": FEEDBACK, "remaining_bugs": []})
+    if "reviewing the output" in prompt:
+        return json.dumps({"decision": "APPROVE", "feedback": FEEDBACK})
+    return "I could not produce JSON for this request. " * 80
+
+
+def _time(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds per streamed chunk")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with StubServer(reply=reply, token_delay=args.token_delay) as server:
+        os.environ.update({
+            "GROQ_BASE_URL": server.url,
+            "GROQ_API_KEY": os.environ.get("GROQ_API_KEY", "stub-key"),
+            "LLM_PROVIDER": "groq",
+            "ASAD_CACHE": "0",
+            "ASAD_VALIDATION": "llm",
+            "ASAD_CONTEXT_SLICING": "0",
+        })
+        from asad.agents import task_review, validate_solution
+        from asad.llm import call_llm_json
+
+        agent = {"name": "Fixer", "role": "Python expert", "task_description": "fix the default"}
+        report = {"fixed_code": "def f(items=None):\n    return items or []\n", "fix_explanation": "x"}
+        cases = {
+            "task_review": lambda: task_review(agent, report),
+            "validate_solution": lambda: validate_solution(report["fixed_code"]),
+            "malformed response": lambda: call_llm_json("malformed", stage="bench", fallback={}),
+        }
+
+        print(f"{'call':<20} {'buffered ms':>12} {'streaming ms':>13} {'speed-up':>9}")
+        for name, fn in cases.items():
+            os.environ["ASAD_STREAMING"] = "0"
+            buffered = _time(fn, args.repeat)
+            os.environ["ASAD_STREAMING"] = "1"
+            streaming = _time(fn, args.repeat)
+            print(f"{name:<20} {buffered:>12.1f} {streaming:>13.1f} {buffered / streaming:>8.1f}x")
+        print(f"\nStreams cancelled early: {server.cancelled_streams}")
+
+
+if __name__ == "__main__":
+    main()
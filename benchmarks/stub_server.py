@@ -0,0 +1,212 @@
+"""
+Local stub of an OpenAI-compatible chat completions endpoint.
+
+The server speaks HTTP/1.1 with keep-alive and records how many TCP
+connections clients opened, which is what provider reuse is meant to reduce.
+Requests with "stream": true are answered as server-sent events, one small
+chunk every token_delay seconds, to mimic token-by-token generation. With
+capacity set, at most that many requests are processed at once, like an
+inference server whose batch slots are all busy. With quota_rps set,
+requests beyond that rate (one second of burst) are rejected with 429 and a
+Retry-After header, like a provider's rate limit.
+"""
+
+import contextlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+
+class _Server(ThreadingHTTPServer):
+    # Bursts of concurrent clients overflow the default listen backlog of 5
+    request_queue_size = 256
+
+
+def default_reply(payload: dict) -> str:
+    """Return a fixed JSON answer regardless of the prompt."""
+    return json.dumps({"status": "FIXED", "summary": "stub", "remaining_bugs": []})
+
+
+class StubServer:
+    """OpenAI-compatible HTTP server running in a background thread."""
+
+    def __init__(
+        self,
+        reply: Optional[Callable[[dict], str]] = None,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        token_delay: float = 0.0,
+        chunk_chars: int = 4,
+        capacity: Optional[int] = None,
+        quota_rps: Optional[float] = None,
+    ):
+        self.reply = reply or default_reply
+        self.latency = latency
+        self.token_delay = token_delay
+        self.chunk_chars = chunk_chars
+        self._capacity = threading.BoundedSemaphore(capacity) if capacity else contextlib.nullcontext()
+        self.quota_rps = quota_rps
+        self._allowance = quota_rps or 0.0
+        self._allowance_at = time.monotonic()
+        self.cancelled_streams = 0
+        self.rejected = 0
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with stub._lock:
+                    stub.requests += 1
+                retry_after = stub.over_quota()
+                if retry_after is not None:
+                    self._reject(retry_after)
+                    return
+                if stub.latency:
+                    with stub._capacity:
+                        time.sleep(stub.latency)
+                if payload.get("stream"):
+                    self._stream(payload)
+                    return
+                completion = stub.completion(payload)
+                if stub.token_delay:
+                    # Buffered responses arrive after the whole answer is generated
+                    generated = sum(
+                        len(c.get("text") or c.get("message", {}).get("content", ""))
+                        for c in completion["choices"]
+                    )
+                    time.sleep(stub.token_delay * -(-generated // stub.chunk_chars))
+                body = json.dumps(completion).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _reject(self, retry_after):
+                body = json.dumps({"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}})
+                body = body.encode("utf-8")
+                self.send_response(429)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Retry-After", str(max(1, round(retry_after))))
+                self.send_header("retry-after-ms", str(int(retry_after * 1000)))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, payload):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for event in stub.stream_events(payload):
+                        data = f"data: {event}\n\n".encode("utf-8")
+                        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                except ConnectionError:
+                    # The client cancelled the stream
+                    with stub._lock:
+                        stub.cancelled_streams += 1
+                    self.close_connection = True
+
+        return Handler
+
+    def over_quota(self) -> Optional[float]:
+        """Spend one request of the quota; return seconds until one is free if it is used up."""
+        if not self.quota_rps:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.quota_rps, self._allowance + (now - self._allowance_at) * self.quota_rps)
+            self._allowance_at = now
+            if self._allowance >= 1:
+                self._allowance -= 1
+                return None
+            self.rejected += 1
+            return (1 - self._allowance) / self.quota_rps
+
+    def stream_events(self, payload: dict):
+        """Yield SSE payloads of a streamed chat completion, pausing between chunks."""
+        content = self.reply(payload)
+        base = {
+            "id": f"stub-{self.requests}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+        }
+        for start in range(0, len(content), self.chunk_chars):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            delta = {"content": content[start:start + self.chunk_chars]}
+            yield json.dumps({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+        yield json.dumps({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        yield "[DONE]"
+
+    def completion(self, payload: dict) -> dict:
+        """Build a chat completion (or batched text completion) response body."""
+        prompts = payload.get("prompt")
+        if isinstance(prompts, list):
+            choices = [
+                {"index": i, "text": self.reply({"prompt": p}), "finish_reason": "stop"}
+                for i, p in enumerate(prompts)
+            ]
+            obj = "text_completion"
+        else:
+            content = self.reply(payload)
+            choices = [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }]
+            obj = "chat.completion"
+        return {
+            "id": f"stub-{self.requests}",
+            "object": obj,
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": choices,
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -4,14 +4,14 @@ Main entry point for ASAD debugger with example execution.
 """
 
 import os
-from dotenv import load_dotenv
+from asad.config import load_env
 from asad.pipeline import adaptive_debugger
 from examples.buggy_code import complex_buggy_code, medium_buggy_code, simple_buggy_code
 
 
 def main():
     # Load environment variables from .env file
-    load_dotenv()
+    load_env()
     
     print("=" * 70)
     print("ASAD: Adaptive Software Analysis and Debugging")